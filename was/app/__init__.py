@@ -10,6 +10,17 @@ login_manager = LoginManager()
 login_manager.login_view = "login"
 login_manager.login_message = "로그인이 필요합니다."
 
+# Tests read rows right after the request, so background work runs inline
+# unless a test asks for it explicitly.
+TEST_DEFAULTS = {
+    "AUDIT_LOG_ASYNC": False,
+    "STATS_RECONCILE_INTERVAL": 0,
+    "IMAGE_DERIVATIVES_ASYNC": False,
+    "REPORT_EXPORT_ASYNC": False,
+    "REPORT_EXPORT_WORKERS": 0,
+    "MYDATA_FETCH_ASYNC": False,
+}
+
 
 def create_app(config_override=None):
     app = Flask(__name__)
@@ -19,7 +30,27 @@ def create_app(config_override=None):
             "DATABASE_URL", "sqlite:///local_dev.db"
         ),
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
-        MAX_CONTENT_LENGTH=10 * 1024 * 1024,
+        MAX_CONTENT_LENGTH=int(os.environ.get("UPLOAD_MAX_REQUEST_BYTES", str(10 * 1024 * 1024))),
+        UPLOAD_MAX_FILE_BYTES=int(os.environ.get("UPLOAD_MAX_FILE_BYTES", str(5 * 1024 * 1024))),
+        UPLOAD_TEMP_DIR=os.environ.get("UPLOAD_TEMP_DIR", ""),
+        UPLOAD_CHUNK_BYTES=int(os.environ.get("UPLOAD_CHUNK_BYTES", str(4 * 1024 * 1024))),
+        UPLOAD_SESSION_MAX_BYTES=int(os.environ.get("UPLOAD_SESSION_MAX_BYTES", str(200 * 1024 * 1024))),
+        UPLOAD_SESSION_TTL_HOURS=int(os.environ.get("UPLOAD_SESSION_TTL_HOURS", "24")),
+        BLOB_RELEASE_GRACE_SECONDS=int(os.environ.get("BLOB_RELEASE_GRACE_SECONDS", "60")),
+        IMAGE_DERIVATIVES_ASYNC=os.environ.get("IMAGE_DERIVATIVES_ASYNC", "1") == "1",
+        IMAGE_DERIVATIVE_WORKERS=int(os.environ.get("IMAGE_DERIVATIVE_WORKERS", "2")),
+        REPORT_CACHE_DIR=os.environ.get(
+            "REPORT_CACHE_DIR",
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), "report_cache"),
+        ),
+        REPORT_CACHE_MAX_BYTES=int(os.environ.get("REPORT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+        REPORT_EXPORT_ASYNC=os.environ.get("REPORT_EXPORT_ASYNC", "1") == "1",
+        REPORT_EXPORT_WORKERS=int(os.environ.get("REPORT_EXPORT_WORKERS", str(os.cpu_count() or 2))),
+        REPORT_EXPORT_DIR=os.environ.get(
+            "REPORT_EXPORT_DIR",
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), "report_exports"),
+        ),
+        REPORT_EXPORT_TTL_HOURS=int(os.environ.get("REPORT_EXPORT_TTL_HOURS", "24")),
         POST_UPLOAD_DIR=os.environ.get(
             "POST_UPLOAD_DIR",
             os.path.join(os.path.dirname(__file__), "static", "uploads", "posts"),
@@ -28,10 +59,53 @@ def create_app(config_override=None):
             "PROFILE_UPLOAD_DIR",
             os.path.join(os.path.dirname(__file__), "static", "uploads", "profiles"),
         ),
+        ATTACHMENT_DELIVERY=os.environ.get("ATTACHMENT_DELIVERY", "direct"),
+        ATTACHMENT_ACCEL_PREFIX=os.environ.get("ATTACHMENT_ACCEL_PREFIX", "/_protected"),
+        ATTACHMENT_CACHE_MAX_AGE=int(os.environ.get("ATTACHMENT_CACHE_MAX_AGE", "3600")),
+        AUDIT_LOG_ASYNC=os.environ.get("AUDIT_LOG_ASYNC", "1") == "1",
+        AUDIT_QUEUE_SIZE=int(os.environ.get("AUDIT_QUEUE_SIZE", "10000")),
+        AUDIT_BATCH_SIZE=int(os.environ.get("AUDIT_BATCH_SIZE", "200")),
+        AUDIT_FLUSH_INTERVAL=float(os.environ.get("AUDIT_FLUSH_INTERVAL", "1.0")),
+        AUDIT_ENQUEUE_TIMEOUT=float(os.environ.get("AUDIT_ENQUEUE_TIMEOUT", "0")),
+        AUDIT_WEB_SAMPLE_RATE=float(os.environ.get("AUDIT_WEB_SAMPLE_RATE", "1.0")),
+        AUDIT_ENDPOINT_SAMPLE_RATES={},
+        SQL_QUERY_LIMIT=None,
+        SQL_SERVER_TIMING=os.environ.get("SQL_SERVER_TIMING", "0") == "1",
+        SQL_LOG_THRESHOLD_MS=float(os.environ.get("SQL_LOG_THRESHOLD_MS", "200")),
+        METRICS_MULTIPROC_DIR=os.environ.get("METRICS_MULTIPROC_DIR", ""),
+        METRICS_FLUSH_INTERVAL=float(os.environ.get("METRICS_FLUSH_INTERVAL", "1.0")),
+        METRICS_ALLOWED_NETWORKS=os.environ.get("METRICS_ALLOWED_NETWORKS", "127.0.0.1/32,::1/128"),
+        AUDIT_RETENTION_MONTHS=int(os.environ.get("AUDIT_RETENTION_MONTHS", "6")),
+        AUDIT_ARCHIVE_DIR=os.environ.get(
+            "AUDIT_ARCHIVE_DIR",
+            os.path.join(os.path.dirname(os.path.dirname(__file__)), "audit_archive"),
+        ),
+        AUDIT_DASHBOARD_WINDOW_DAYS=int(os.environ.get("AUDIT_DASHBOARD_WINDOW_DAYS", "7")),
+        AUDIT_REQUEST_AGGREGATION=os.environ.get("AUDIT_REQUEST_AGGREGATION", "1") == "1",
+        MYDATA_SNAPSHOT_RETENTION=int(os.environ.get("MYDATA_SNAPSHOT_RETENTION", "5")),
+        MYDATA_VIEW_CACHE_SIZE=int(os.environ.get("MYDATA_VIEW_CACHE_SIZE", "1024")),
+        MYDATA_VIEW_CACHE_DIR=os.environ.get("MYDATA_VIEW_CACHE_DIR", ""),
+        MYDATA_PROVIDER=os.environ.get("MYDATA_PROVIDER", "mock"),
+        MYDATA_PROVIDER_URL=os.environ.get("MYDATA_PROVIDER_URL", "http://127.0.0.1:8765"),
+        MYDATA_PROVIDER_TIMEOUT=float(os.environ.get("MYDATA_PROVIDER_TIMEOUT", "3.0")),
+        MYDATA_PROVIDER_RETRIES=int(os.environ.get("MYDATA_PROVIDER_RETRIES", "2")),
+        MYDATA_PROVIDER_BACKOFF=float(os.environ.get("MYDATA_PROVIDER_BACKOFF", "0.2")),
+        MYDATA_PROVIDER_POOL_SIZE=int(os.environ.get("MYDATA_PROVIDER_POOL_SIZE", "4")),
+        MYDATA_FETCH_ASYNC=os.environ.get("MYDATA_FETCH_ASYNC", "1") == "1",
+        MYDATA_FETCH_WORKERS=int(os.environ.get("MYDATA_FETCH_WORKERS", "4")),
+        PUBLIC_PAGE_CACHE=os.environ.get("PUBLIC_PAGE_CACHE", "1") == "1",
+        PUBLIC_PAGE_CACHE_MAX_AGE=int(os.environ.get("PUBLIC_PAGE_CACHE_MAX_AGE", "300")),
+        PUBLIC_PAGE_CACHE_MAX_ENTRIES=int(os.environ.get("PUBLIC_PAGE_CACHE_MAX_ENTRIES", "256")),
+        PUBLIC_PAGE_CACHE_RELEASE=os.environ.get("PUBLIC_PAGE_CACHE_RELEASE", ""),
+        STATS_RECONCILE_INTERVAL=int(os.environ.get("STATS_RECONCILE_INTERVAL", "900")),
     )
 
     if config_override:
         app.config.update(config_override)
+    if app.testing:
+        for key, value in TEST_DEFAULTS.items():
+            if key not in (config_override or {}):
+                app.config[key] = value
 
     os.makedirs(app.config["POST_UPLOAD_DIR"], exist_ok=True)
     os.makedirs(app.config["PROFILE_UPLOAD_DIR"], exist_ok=True)
@@ -40,8 +114,30 @@ def create_app(config_override=None):
     login_manager.init_app(app)
 
     from app import routes
+    from app.audit import init_audit
+    from app.db_instrumentation import init_db_instrumentation
+    from app.image_derivatives import init_image_derivatives
+    from app.metrics import init_metrics
+    from app.mydata_fetch import init_mydata_fetcher
+    from app.mydata_view import init_mydata_view_cache
+    from app.page_cache import init_page_cache
+    from app.report_exports import init_report_exports
+    from app.stats_store import init_stats_reconciler
+    from app.upload_ingest import IngestRequest
 
+    # Multipart file parts are streamed into hashed temp files as they arrive.
+    app.request_class = IngestRequest
+    init_metrics(app)
+    init_audit(app)
+    init_stats_reconciler(app)
+    init_image_derivatives(app)
+    init_report_exports(app)
+    init_mydata_view_cache(app)
+    init_mydata_fetcher(app)
+    init_page_cache(app)
     routes.init_routes(app)
+    # Registered after the routes so it runs before the audit write.
+    init_db_instrumentation(app)
 
     with app.app_context():
         from app import models
@@ -0,0 +1,259 @@
+import atexit
+import os
+import queue
+import threading
+import time
+import weakref
+
+from flask import current_app
+from sqlalchemy import insert
+
+from app import db
+from app.audit_policy import request_bucket, upsert_request_counts
+from app.models import AuditLog, utc_now
+
+
+_writers = weakref.WeakSet()
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        app,
+        max_queue=10000,
+        batch_size=200,
+        flush_interval=1.0,
+        enqueue_timeout=0.0,
+    ):
+        self.app = app
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._request_counts = {}
+        self._last_counts_flush = time.monotonic()
+        self._counters = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+        _writers.add(self)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._counters)
+        snapshot["queued"] = self.queue.qsize()
+        snapshot["capacity"] = self.max_queue
+        return snapshot
+
+    def submit(self, row):
+        self._ensure_started()
+        try:
+            if self.enqueue_timeout > 0:
+                self.queue.put(row, timeout=self.enqueue_timeout)
+            else:
+                self.queue.put_nowait(row)
+        except queue.Full:
+            self._count("dropped")
+            dropped = self._counters["dropped"]
+            if dropped == 1 or dropped % 1000 == 0:
+                self.app.logger.warning("audit queue full: dropped=%s", dropped)
+            return False
+        self._count("enqueued")
+        return True
+
+    def count_request(self, key):
+        self._ensure_started()
+        with self._lock:
+            self._request_counts[key] = self._request_counts.get(key, 0) + 1
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == pid and self._thread is not None and self._thread.is_alive():
+                return
+            if self._pid is not None and self._pid != pid:
+                # Forked worker: rows queued by the parent belong to the parent.
+                self.queue = queue.Queue(maxsize=self.max_queue)
+            self._pid = pid
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="audit-writer",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch, waiters = self._collect()
+            if batch:
+                self._write(batch)
+            if waiters or time.monotonic() - self._last_counts_flush >= self.flush_interval:
+                self._write_request_counts()
+            for done in waiters:
+                done.set()
+
+    def _collect(self):
+        batch = []
+        waiters = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                break
+            batch.append(item)
+        return batch, waiters
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+        self._write_request_counts()
+
+    def _write(self, batch):
+        with self.app.app_context():
+            try:
+                db.session.execute(insert(AuditLog), batch)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                self._count("failed", len(batch))
+                self.app.logger.exception("audit batch write failed: rows=%s", len(batch))
+                return
+        self._count("written", len(batch))
+        self._count("batches")
+
+    def _write_request_counts(self):
+        with self._lock:
+            counts, self._request_counts = self._request_counts, {}
+        self._last_counts_flush = time.monotonic()
+        if not counts:
+            return
+        with self.app.app_context():
+            try:
+                upsert_request_counts(counts)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception("request aggregate write failed: keys=%s", len(counts))
+
+    def _writer_alive(self):
+        thread = self._thread
+        return thread is not None and thread.is_alive() and self._pid == os.getpid()
+
+    def flush(self, timeout=5.0):
+        if self._writer_alive():
+            done = threading.Event()
+            try:
+                self.queue.put(done, timeout=timeout)
+            except queue.Full:
+                pass
+            else:
+                if done.wait(timeout):
+                    return
+        self._drain()
+
+    def shutdown(self, timeout=5.0):
+        if self._writer_alive():
+            self._stop.set()
+            try:
+                self.queue.put_nowait(threading.Event())
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        self._stop.set()
+        self._drain()
+
+
+def init_audit(app):
+    async_rows = app.config.get("AUDIT_LOG_ASYNC")
+    if not async_rows and not app.config.get("AUDIT_REQUEST_AGGREGATION"):
+        return None
+    writer = AuditWriter(
+        app,
+        max_queue=app.config["AUDIT_QUEUE_SIZE"],
+        batch_size=app.config["AUDIT_BATCH_SIZE"],
+        flush_interval=app.config["AUDIT_FLUSH_INTERVAL"],
+        enqueue_timeout=app.config["AUDIT_ENQUEUE_TIMEOUT"],
+    )
+    if async_rows:
+        app.extensions["audit_writer"] = writer
+    # Request counts are batched even when audit rows are written inline, so
+    # the request session never pays for the aggregate upsert.
+    app.extensions["request_counter"] = writer
+    return writer
+
+
+def get_audit_writer(app=None):
+    app = app or current_app
+    return app.extensions.get("audit_writer")
+
+
+def write_audit_entry(row):
+    writer = get_audit_writer()
+    if writer is not None:
+        return writer.submit(row)
+
+    try:
+        db.session.add(AuditLog(**row))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        return False
+    return True
+
+
+def get_request_counter(app=None):
+    app = app or current_app
+    return app.extensions.get("request_counter")
+
+
+def record_request_count(endpoint, method, status_code):
+    if not current_app.config.get("AUDIT_REQUEST_AGGREGATION"):
+        return
+    counter = get_request_counter()
+    if counter is None:
+        return
+    key = (request_bucket(utc_now()), (endpoint or "-")[:120], method[:10], status_code)
+    counter.count_request(key)
+
+
+def shutdown_audit_writers():
+    for writer in list(_writers):
+        writer.shutdown()
+
+
+atexit.register(shutdown_audit_writers)
@@ -0,0 +1,214 @@
+import gzip
+import json
+import os
+from datetime import datetime
+
+from sqlalchemy import func, select, text
+
+from app import db
+from app.models import AuditLog
+
+
+ARCHIVE_CHUNK_SIZE = 1000
+
+
+def month_start(dt):
+    return datetime(dt.year, dt.month, 1)
+
+
+def add_months(dt, months):
+    index = dt.year * 12 + (dt.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"p{month:%Y%m}"
+
+
+def uses_native_partitions():
+    return db.engine.dialect.name in {"mysql", "mariadb"}
+
+
+def _native_partitions():
+    rows = db.session.execute(
+        text(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS "
+            "FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_log' "
+            "AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION"
+        )
+    ).all()
+    partitions = []
+    for name, _, table_rows in rows:
+        if name == "pmax":
+            continue
+        start = datetime.strptime(name[1:], "%Y%m")
+        partitions.append(
+            {
+                "name": name,
+                "start": start,
+                "end": add_months(start, 1),
+                "rows": table_rows,
+            }
+        )
+    return partitions
+
+
+def _logical_partitions():
+    month_key = func.strftime("%Y%m", AuditLog.created_at)
+    rows = (
+        db.session.query(month_key, func.count(AuditLog.id))
+        .group_by(month_key)
+        .order_by(month_key)
+        .all()
+    )
+    partitions = []
+    for key, count in rows:
+        start = datetime.strptime(key, "%Y%m")
+        partitions.append(
+            {
+                "name": partition_name(start),
+                "start": start,
+                "end": add_months(start, 1),
+                "rows": count,
+            }
+        )
+    return partitions
+
+
+def list_audit_partitions():
+    if uses_native_partitions():
+        return _native_partitions()
+    return _logical_partitions()
+
+
+def _partition_clause(month):
+    bound = add_months(month, 1)
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (TO_DAYS('{bound:%Y-%m-%d}'))"
+
+
+def ensure_audit_partitions(now, months_ahead=3):
+    if not uses_native_partitions():
+        return []
+
+    current = month_start(now)
+    wanted = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    existing = {item["name"] for item in _native_partitions()}
+    if not existing:
+        oldest = db.session.query(func.min(AuditLog.created_at)).scalar()
+        first = month_start(oldest) if oldest and oldest < current else current
+        months = []
+        cursor = first
+        while cursor <= wanted[-1]:
+            months.append(cursor)
+            cursor = add_months(cursor, 1)
+
+        # InnoDB partitioned tables cannot hold foreign keys, and the
+        # partition column has to be part of every unique key.
+        foreign_keys = db.session.execute(
+            text(
+                "SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS "
+                "WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_log'"
+            )
+        ).scalars().all()
+        for constraint in foreign_keys:
+            db.session.execute(text(f"ALTER TABLE audit_log DROP FOREIGN KEY {constraint}"))
+        db.session.execute(
+            text("ALTER TABLE audit_log DROP PRIMARY KEY, ADD PRIMARY KEY (id, created_at)")
+        )
+        clauses = [_partition_clause(month) for month in months]
+        clauses.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+        db.session.execute(
+            text(f"ALTER TABLE audit_log PARTITION BY RANGE (TO_DAYS(created_at)) ({', '.join(clauses)})")
+        )
+        db.session.commit()
+        return [partition_name(month) for month in months]
+
+    created = []
+    for month in wanted:
+        name = partition_name(month)
+        if name in existing:
+            continue
+        db.session.execute(
+            text(
+                "ALTER TABLE audit_log REORGANIZE PARTITION pmax INTO "
+                f"({_partition_clause(month)}, PARTITION pmax VALUES LESS THAN MAXVALUE)"
+            )
+        )
+        created.append(name)
+    db.session.commit()
+    return created
+
+
+def _serialize(row):
+    return {
+        "id": row.id,
+        "actor_id": row.actor_id,
+        "action": row.action,
+        "target_type": row.target_type,
+        "target_id": row.target_id,
+        "meta": row.meta,
+        "created_at": row.created_at.isoformat(),
+    }
+
+
+def _partition_filter(partition, is_first):
+    end_filter = AuditLog.created_at < partition["end"]
+    if is_first:
+        # The first native partition also holds anything older than its month.
+        return end_filter
+    return end_filter & (AuditLog.created_at >= partition["start"])
+
+
+def export_partition(partition, output_dir, is_first=False):
+    os.makedirs(output_dir, exist_ok=True)
+    target = os.path.join(output_dir, f"audit_log_{partition['start']:%Y%m}.jsonl.gz")
+    temp_path = f"{target}.tmp"
+    row_filter = _partition_filter(partition, is_first)
+    written = 0
+    last_id = 0
+    with gzip.open(temp_path, "wt", encoding="utf-8") as handle:
+        while True:
+            rows = db.session.execute(
+                select(AuditLog)
+                .where(row_filter, AuditLog.id > last_id)
+                .order_by(AuditLog.id)
+                .limit(ARCHIVE_CHUNK_SIZE)
+            ).scalars().all()
+            if not rows:
+                break
+            for row in rows:
+                handle.write(json.dumps(_serialize(row), ensure_ascii=False))
+                handle.write("\n")
+            written += len(rows)
+            last_id = rows[-1].id
+            db.session.expunge_all()
+    os.replace(temp_path, target)
+    return target, written
+
+
+def drop_partition(partition, is_first=False):
+    if uses_native_partitions():
+        db.session.execute(text(f"ALTER TABLE audit_log DROP PARTITION {partition['name']}"))
+    else:
+        db.session.execute(
+            AuditLog.__table__.delete().where(_partition_filter(partition, is_first))
+        )
+    db.session.commit()
+
+
+def archive_audit_partitions(cutoff, output_dir, dry_run=False):
+    results = []
+    partitions = list_audit_partitions()
+    for index, partition in enumerate(partitions):
+        if partition["end"] > cutoff:
+            continue
+        is_first = index == 0
+        if dry_run:
+            results.append((partition["name"], None, partition["rows"]))
+            continue
+        path, written = export_partition(partition, output_dir, is_first=is_first)
+        drop_partition(partition, is_first=is_first)
+        results.append((partition["name"], path, written))
+    return results
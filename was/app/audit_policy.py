@@ -0,0 +1,72 @@
+import random
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import AuditRequestAggregate
+
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def web_request_sample_rate(config, endpoint):
+    overrides = config.get("AUDIT_ENDPOINT_SAMPLE_RATES") or {}
+    rate = overrides.get(endpoint, config.get("AUDIT_WEB_SAMPLE_RATE", 1.0))
+    return min(max(float(rate), 0.0), 1.0)
+
+
+def should_log_web_request(config, endpoint, method, status_code, rng=random.random):
+    if status_code >= 400 or method not in READ_METHODS:
+        return True, 1.0
+    rate = web_request_sample_rate(config, endpoint)
+    if rate >= 1.0:
+        return True, rate
+    if rate <= 0.0:
+        return False, rate
+    return rng() < rate, rate
+
+
+def request_bucket(dt):
+    return dt.replace(second=0, microsecond=0)
+
+
+def upsert_request_counts(counts):
+    for (bucket_start, endpoint, method, status_code), amount in counts.items():
+        key_filter = (
+            (AuditRequestAggregate.bucket_start == bucket_start)
+            & (AuditRequestAggregate.endpoint == endpoint)
+            & (AuditRequestAggregate.method == method)
+            & (AuditRequestAggregate.status_code == status_code)
+        )
+        increment = (
+            update(AuditRequestAggregate)
+            .where(key_filter)
+            .values(request_count=AuditRequestAggregate.request_count + amount)
+        )
+        if db.session.execute(increment).rowcount:
+            continue
+        try:
+            with db.session.begin_nested():
+                db.session.execute(
+                    insert(AuditRequestAggregate).values(
+                        bucket_start=bucket_start,
+                        endpoint=endpoint,
+                        method=method,
+                        status_code=status_code,
+                        request_count=amount,
+                    )
+                )
+        except IntegrityError:
+            # Another worker created the bucket row first.
+            db.session.execute(increment)
+
+
+def prune_request_counts(cutoff, dry_run=False):
+    # The dashboard only reads its window; older buckets are dead weight.
+    stale = AuditRequestAggregate.bucket_start < cutoff
+    if dry_run:
+        return db.session.execute(select(func.count(AuditRequestAggregate.id)).where(stale)).scalar_one()
+    removed = db.session.execute(delete(AuditRequestAggregate).where(stale)).rowcount
+    db.session.commit()
+    return removed
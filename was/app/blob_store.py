@@ -0,0 +1,164 @@
+import hashlib
+import os
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import func, select
+
+from app import db
+from app.models import PostAttachment
+
+
+CHUNK_SIZE = 64 * 1024
+# A blob touched this recently may belong to an upload whose attachment row
+# is not committed yet, so release leaves it for the orphan sweep.
+RELEASE_GRACE_SECONDS = 60
+
+
+def blob_relpath(content_hash):
+    # Two levels of 256 shards keep each directory small at millions of blobs.
+    return os.path.join(content_hash[:2], content_hash[2:4], content_hash)
+
+
+def blob_path(upload_dir, content_hash):
+    return os.path.join(upload_dir, blob_relpath(content_hash))
+
+
+def attachment_relpath(attachment):
+    if attachment.content_hash:
+        return blob_relpath(attachment.content_hash)
+    return attachment.stored_name
+
+
+def place_blob(temp_path, final_path):
+    # Touch before dropping our copy: a concurrent release either sees the
+    # fresh mtime and keeps the blob, or has already moved it away, in which
+    # case the touch fails and our copy takes its place.
+    try:
+        os.utime(final_path)
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(temp_path, final_path)
+    else:
+        os.remove(temp_path)
+
+
+def store_blob(stream, upload_dir, chunk_size=CHUNK_SIZE):
+    digest = hashlib.sha256()
+    size = 0
+    temp_dir = os.path.join(upload_dir, ".tmp")
+    os.makedirs(temp_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=temp_dir)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                handle.write(chunk)
+                size += len(chunk)
+        content_hash = digest.hexdigest()
+        place_blob(temp_path, blob_path(upload_dir, content_hash))
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return content_hash, size
+
+
+def adopt_file(path, upload_dir, chunk_size=CHUNK_SIZE):
+    # Hash an already assembled file and move it into place without copying.
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+    content_hash = digest.hexdigest()
+    place_blob(path, blob_path(upload_dir, content_hash))
+    return content_hash, size
+
+
+def blob_reference_count(content_hash):
+    return db.session.execute(
+        select(func.count(PostAttachment.id)).where(PostAttachment.content_hash == content_hash)
+    ).scalar_one()
+
+
+def release_blob(upload_dir, content_hash, grace_seconds=RELEASE_GRACE_SECONDS):
+    # Call after the referencing rows are committed away; the file goes only
+    # when no PostAttachment points at the hash any more.
+    if blob_reference_count(content_hash):
+        return False
+    path = blob_path(upload_dir, content_hash)
+    # Move it aside first so place_blob can no longer touch it in place.
+    released_path = f"{path}.release-{uuid.uuid4().hex}"
+    try:
+        os.rename(path, released_path)
+    except FileNotFoundError:
+        return True
+    if time.time() - os.stat(released_path).st_mtime < grace_seconds:
+        os.replace(released_path, path)
+        return False
+    os.remove(released_path)
+    return True
+
+
+def prune_orphan_blobs(upload_dir, grace_seconds=RELEASE_GRACE_SECONDS):
+    removed = 0
+    for shard, _, names in os.walk(upload_dir):
+        parts = os.path.relpath(shard, upload_dir).split(os.sep)
+        if len(parts) != 2 or any(len(part) != 2 for part in parts):
+            continue
+        hashes = {name for name in names if len(name) == 64}
+        if not hashes:
+            continue
+        referenced = set(
+            db.session.execute(
+                select(PostAttachment.content_hash).where(PostAttachment.content_hash.in_(hashes)).distinct()
+            ).scalars()
+        )
+        for content_hash in hashes - referenced:
+            if release_blob(upload_dir, content_hash, grace_seconds=grace_seconds):
+                removed += 1
+    return removed
+
+
+def migrate_legacy_attachments(upload_dir, batch_size=200):
+    migrated = 0
+    missing = 0
+    last_id = 0
+    while True:
+        rows = (
+            PostAttachment.query.filter(
+                PostAttachment.content_hash.is_(None),
+                PostAttachment.id > last_id,
+            )
+            .order_by(PostAttachment.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        legacy_paths = []
+        for attachment in rows:
+            legacy_path = os.path.join(upload_dir, attachment.stored_name)
+            if not os.path.exists(legacy_path):
+                missing += 1
+                continue
+            with open(legacy_path, "rb") as handle:
+                content_hash, size = store_blob(handle, upload_dir)
+            attachment.content_hash = content_hash
+            attachment.file_size = size
+            legacy_paths.append(legacy_path)
+            migrated += 1
+        last_id = rows[-1].id
+        db.session.commit()
+        for legacy_path in legacy_paths:
+            os.remove(legacy_path)
+    return migrated, missing
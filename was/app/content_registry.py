@@ -0,0 +1,56 @@
+from types import MappingProxyType
+
+from app.health_content import (
+    HEALTH_PROGRAMS as _HEALTH_PROGRAMS,
+    REGIONAL_CENTERS as _REGIONAL_CENTERS,
+    VACCINATION_CHECKUP_CALENDAR as _VACCINATION_CHECKUP_CALENDAR,
+)
+from app.security_catalog import OWASP_TOP10_SCENARIOS as _OWASP_TOP10_SCENARIOS
+
+
+class ContentRegistryError(ValueError):
+    pass
+
+
+def freeze(value):
+    # Registry entries are shared by every request, so nothing handed to a
+    # view or template can be mutated in place.
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def index_unique(items, key, label):
+    index = {}
+    for position, item in enumerate(items):
+        value = item.get(key)
+        if not value:
+            raise ContentRegistryError(f"{label}[{position}] has no {key!r}")
+        if value in index:
+            raise ContentRegistryError(f"duplicate {label} {key} {value!r}")
+        index[value] = item
+    return MappingProxyType(index)
+
+
+def index_groups(items, key):
+    groups = {}
+    for item in items:
+        groups.setdefault(item[key], []).append(item)
+    # Groups keep catalog order, so a filtered view reads like the full list.
+    return MappingProxyType({value: tuple(group) for value, group in groups.items()})
+
+
+HEALTH_PROGRAMS = freeze(_HEALTH_PROGRAMS)
+HEALTH_PROGRAMS_BY_ID = index_unique(HEALTH_PROGRAMS, "id", "health program")
+HEALTH_PROGRAMS_BY_CATEGORY = index_groups(HEALTH_PROGRAMS, "category")
+
+REGIONAL_CENTERS = freeze(_REGIONAL_CENTERS)
+REGIONAL_CENTERS_BY_REGION = index_groups(REGIONAL_CENTERS, "region")
+
+VACCINATION_CHECKUP_CALENDAR = freeze(_VACCINATION_CHECKUP_CALENDAR)
+VACCINATION_CHECKUP_CALENDAR_BY_MONTH = index_groups(VACCINATION_CHECKUP_CALENDAR, "month")
+
+OWASP_TOP10_SCENARIOS = freeze(_OWASP_TOP10_SCENARIOS)
+OWASP_TOP10_SCENARIOS_BY_ID = index_unique(OWASP_TOP10_SCENARIOS, "id", "OWASP scenario")
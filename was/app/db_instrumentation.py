@@ -0,0 +1,127 @@
+import json
+import threading
+import time
+
+from flask import g, has_request_context, request
+from flask_login import current_user
+from sqlalchemy import event
+
+from app import db
+
+
+class RouteSqlStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, endpoint, queries, db_ms, slowest_ms, slowest_sql):
+        with self._lock:
+            entry = self._routes.setdefault(
+                endpoint,
+                {
+                    "endpoint": endpoint,
+                    "requests": 0,
+                    "queries": 0,
+                    "db_ms": 0.0,
+                    "max_db_ms": 0.0,
+                    "slowest_ms": 0.0,
+                    "slowest_sql": "",
+                },
+            )
+            entry["requests"] += 1
+            entry["queries"] += queries
+            entry["db_ms"] += db_ms
+            entry["max_db_ms"] = max(entry["max_db_ms"], db_ms)
+            if slowest_ms > entry["slowest_ms"]:
+                entry["slowest_ms"] = slowest_ms
+                entry["slowest_sql"] = slowest_sql
+
+    def top(self, limit=10):
+        with self._lock:
+            rows = [dict(entry) for entry in self._routes.values()]
+        for row in rows:
+            row["avg_queries"] = row["queries"] / row["requests"]
+            row["avg_db_ms"] = row["db_ms"] / row["requests"]
+        rows.sort(key=lambda row: row["db_ms"], reverse=True)
+        return rows[:limit]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not has_request_context():
+        return
+    elapsed_ms = (time.perf_counter() - context.query_started) * 1000
+    g.sql_query_count = g.get("sql_query_count", 0) + 1
+    g.sql_time_ms = g.get("sql_time_ms", 0.0) + elapsed_ms
+    if elapsed_ms >= g.get("sql_slowest_ms", 0.0):
+        g.sql_slowest_ms = elapsed_ms
+        g.sql_slowest_statement = " ".join(statement.split())[:300]
+
+
+def _may_see_timing():
+    # Query counts and DB time describe the backend. Behind nginx every
+    # client arrives from the proxy's address, so the metrics allowlist
+    # can't tell them apart; only signed-in admins get the header.
+    return current_user.is_authenticated and current_user.role == "admin"
+
+
+def init_db_instrumentation(app):
+    stats = RouteSqlStats()
+    app.extensions["route_sql_stats"] = stats
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(db.engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_sql_usage(response):
+        count = g.get("sql_query_count", 0)
+        db_ms = g.get("sql_time_ms", 0.0)
+        slowest_ms = g.get("sql_slowest_ms", 0.0)
+        slowest_sql = g.get("sql_slowest_statement", "")
+        endpoint = request.endpoint or "-"
+
+        limit = app.config.get("SQL_QUERY_LIMIT")
+        if limit and count > limit:
+            raise AssertionError(f"{endpoint} issued {count} SQL queries (limit {limit})")
+
+        if endpoint != "static":
+            stats.record(endpoint, count, db_ms, slowest_ms, slowest_sql)
+
+        if app.config.get("SQL_SERVER_TIMING") and _may_see_timing():
+            total_ms = (time.perf_counter() - g.get("request_started", time.perf_counter())) * 1000
+            response.headers.add(
+                "Server-Timing",
+                f'db;dur={db_ms:.1f};desc="{count} queries", app;dur={total_ms:.1f}',
+            )
+
+        threshold = app.config.get("SQL_LOG_THRESHOLD_MS")
+        if threshold is not None and db_ms >= threshold:
+            app.logger.warning(
+                json.dumps(
+                    {
+                        "event": "sql_request",
+                        "endpoint": endpoint,
+                        "method": request.method,
+                        "status": response.status_code,
+                        "queries": count,
+                        "db_ms": round(db_ms, 2),
+                        "slowest_ms": round(slowest_ms, 2),
+                        "slowest_sql": slowest_sql,
+                    },
+                    ensure_ascii=False,
+                )
+            )
+        return response
+
+
+def route_sql_stats(app, limit=10):
+    stats = app.extensions.get("route_sql_stats")
+    return stats.top(limit) if stats else []
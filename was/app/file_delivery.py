@@ -0,0 +1,49 @@
+import mimetypes
+import os
+import unicodedata
+from urllib.parse import quote
+
+from flask import Response, abort, current_app, send_from_directory
+from werkzeug.security import safe_join
+
+
+def content_disposition(download_name, as_attachment=True):
+    disposition = "attachment" if as_attachment else "inline"
+    if not download_name:
+        return disposition
+    ascii_name = unicodedata.normalize("NFKD", download_name).encode("ascii", "ignore").decode()
+    ascii_name = ascii_name.replace("\\", "").replace('"', "").strip() or "download"
+    encoded = quote(download_name, safe="!#$&+^`|")
+    # RFC 6266 / RFC 5987: keep the Korean name in filename*, with an ASCII fallback.
+    return f"{disposition}; filename=\"{ascii_name}\"; filename*=UTF-8''{encoded}"
+
+
+def deliver_file(directory, filename, accel_location, download_name=None, as_attachment=True, mimetype=None):
+    path = safe_join(directory, filename)
+    if path is None:
+        abort(404)
+    mimetype = mimetype or mimetypes.guess_type(download_name or filename)[0] or "application/octet-stream"
+    max_age = current_app.config["ATTACHMENT_CACHE_MAX_AGE"]
+
+    if current_app.config["ATTACHMENT_DELIVERY"] != "x-accel":
+        return send_from_directory(
+            directory,
+            filename,
+            as_attachment=as_attachment,
+            download_name=download_name,
+            mimetype=mimetype,
+            conditional=True,
+            etag=True,
+            max_age=max_age,
+        )
+
+    if not os.path.isfile(path):
+        abort(404)
+    # nginx reads the file from the internal location and handles Range,
+    # If-Modified-Since and ETag itself; these headers are passed through.
+    prefix = current_app.config["ATTACHMENT_ACCEL_PREFIX"].rstrip("/")
+    response = Response(status=200, mimetype=mimetype)
+    response.headers["X-Accel-Redirect"] = f"{prefix}/{accel_location}/{quote(filename)}"
+    response.headers["Content-Disposition"] = content_disposition(download_name, as_attachment)
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+    return response
@@ -0,0 +1,154 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app import db
+from app.models import User
+
+
+DERIVATIVE_SIZES = (64, 256)
+
+
+def _stem(stored_name):
+    return stored_name.rsplit(".", 1)[0]
+
+
+def derivative_name(stored_name, size, extension):
+    return f"{_stem(stored_name)}_{size}.{extension}"
+
+
+def derivative_names(stored_name):
+    names = []
+    for size in DERIVATIVE_SIZES:
+        for extension in ("webp", "png", "jpg"):
+            names.append(derivative_name(stored_name, size, extension))
+    return names
+
+
+def _save_atomic(image, path, format_name, **options):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".thumb-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            image.save(handle, format=format_name, **options)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def generate_profile_derivatives(upload_dir, stored_name):
+    source_path = os.path.join(upload_dir, stored_name)
+    with Image.open(source_path) as source:
+        source.seek(0)
+        image = ImageOps.exif_transpose(source)
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    created = []
+    for size in DERIVATIVE_SIZES:
+        thumb = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        fallback_extension = "png" if has_alpha else "jpg"
+        fallback_path = os.path.join(upload_dir, derivative_name(stored_name, size, fallback_extension))
+        if has_alpha:
+            _save_atomic(thumb, fallback_path, "PNG", optimize=True)
+        else:
+            _save_atomic(thumb, fallback_path, "JPEG", quality=85, optimize=True, progressive=True)
+        webp_path = os.path.join(upload_dir, derivative_name(stored_name, size, "webp"))
+        _save_atomic(thumb, webp_path, "WEBP", quality=80, method=4)
+        created.extend([fallback_path, webp_path])
+    return created
+
+
+def remove_profile_derivatives(upload_dir, stored_name):
+    for name in derivative_names(stored_name):
+        path = os.path.join(upload_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def pick_profile_variant(upload_dir, stored_name, min_size, webp=False):
+    # Smallest derivative at least min_size pixels wide that is already on
+    # disk; the original is served until the worker has produced one.
+    eligible = [size for size in DERIVATIVE_SIZES if size >= min_size] or [DERIVATIVE_SIZES[-1]]
+    extensions = ("webp",) if webp else ("png", "jpg")
+    for extension in extensions:
+        name = derivative_name(stored_name, eligible[0], extension)
+        if os.path.exists(os.path.join(upload_dir, name)):
+            return name
+    return None
+
+
+def has_profile_derivatives(upload_dir, stored_name):
+    for size in DERIVATIVE_SIZES:
+        names = [derivative_name(stored_name, size, extension) for extension in ("png", "jpg")]
+        if not os.path.exists(os.path.join(upload_dir, derivative_name(stored_name, size, "webp"))):
+            return False
+        if not any(os.path.exists(os.path.join(upload_dir, name)) for name in names):
+            return False
+    return True
+
+
+class DerivativeWorker:
+    def __init__(self, app, max_workers):
+        self.app = app
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnails")
+
+    def submit(self, upload_dir, stored_name):
+        return self.executor.submit(self.generate, upload_dir, stored_name)
+
+    def generate(self, upload_dir, stored_name):
+        try:
+            return generate_profile_derivatives(upload_dir, stored_name)
+        except FileNotFoundError:
+            # Replaced or removed before the worker got to it.
+            return []
+        except (UnidentifiedImageError, OSError, ValueError, Image.DecompressionBombError) as exc:
+            self.app.logger.warning("profile thumbnail failed for %s: %s", stored_name, exc)
+            return []
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+
+def init_image_derivatives(app):
+    worker = DerivativeWorker(app, app.config["IMAGE_DERIVATIVE_WORKERS"])
+    app.extensions["image_derivatives"] = worker
+    return worker
+
+
+def schedule_profile_derivatives(app, stored_name):
+    worker = app.extensions["image_derivatives"]
+    upload_dir = app.config["PROFILE_UPLOAD_DIR"]
+    if not app.config.get("IMAGE_DERIVATIVES_ASYNC"):
+        return worker.generate(upload_dir, stored_name)
+    return worker.submit(upload_dir, stored_name)
+
+
+def backfill_profile_derivatives(app, batch_size=200, force=False):
+    # For avatars uploaded before derivatives existed, or whose job was lost.
+    worker = app.extensions["image_derivatives"]
+    upload_dir = app.config["PROFILE_UPLOAD_DIR"]
+    generated = skipped = failed = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.session.query(User.id, User.profile_image_name)
+            .filter(User.profile_image_name.isnot(None), User.id > last_id)
+            .order_by(User.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1].id
+        pending = [name for _, name in rows if force or not has_profile_derivatives(upload_dir, name)]
+        skipped += len(rows) - len(pending)
+        for created in worker.executor.map(lambda name: worker.generate(upload_dir, name), pending):
+            if created:
+                generated += 1
+            else:
+                failed += 1
+    return generated, skipped, failed
@@ -0,0 +1,304 @@
+import glob
+import ipaddress
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+
+from flask import g, request
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SKIPPED_ENDPOINTS = {"static", "metrics"}
+
+_registries = weakref.WeakSet()
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1.0, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+        self.registry.changed()
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, amount=1.0, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+        self.registry.changed()
+
+    def dec(self, amount=1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        with self.registry.lock:
+            self.values[self._key(labels)] = float(value)
+        self.registry.changed()
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self.values[key] = entry
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry["buckets"][index] += 1
+                    break
+            entry["sum"] += value
+            entry["count"] += 1
+        self.registry.changed()
+
+
+class MetricsRegistry:
+    def __init__(self, multiproc_dir=None, flush_interval=1.0):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self.multiproc_dir = multiproc_dir
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+
+    def _register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: {
+                    "kind": metric.kind,
+                    "values": [[list(key), _copy_value(value)] for key, value in metric.values.items()],
+                }
+                for name, metric in self.metrics.items()
+            }
+
+    def changed(self):
+        if not self.multiproc_dir:
+            return
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if not self.multiproc_dir:
+            return
+        self._last_flush = time.monotonic()
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        payload = {"pid": os.getpid(), "metrics": self.snapshot()}
+        fd, temp_path = tempfile.mkstemp(dir=self.multiproc_dir, prefix=".metrics-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(temp_path, os.path.join(self.multiproc_dir, f"metrics_{os.getpid()}.json"))
+
+    def collect(self):
+        if not self.multiproc_dir:
+            return self.snapshot()
+
+        # Every worker writes its own file; the scraping worker sums them.
+        self.flush()
+        merged = {}
+        for path in sorted(glob.glob(os.path.join(self.multiproc_dir, "metrics_*.json"))):
+            try:
+                with open(path, encoding="utf-8") as handle:
+                    payload = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            alive = _pid_alive(payload.get("pid"))
+            for name, data in payload.get("metrics", {}).items():
+                if data["kind"] == "gauge" and not alive:
+                    continue
+                target = merged.setdefault(name, {"kind": data["kind"], "values": {}})
+                for key, value in data["values"]:
+                    key = tuple(key)
+                    if key in target["values"]:
+                        target["values"][key] = _merge_value(target["values"][key], value)
+                    else:
+                        target["values"][key] = _copy_value(value)
+        return {
+            name: {"kind": data["kind"], "values": [[list(key), value] for key, value in data["values"].items()]}
+            for name, data in merged.items()
+        }
+
+    def render(self):
+        collected = self.collect()
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key, value in sorted(collected.get(name, {}).get("values", []), key=lambda item: item[0]):
+                labels = list(zip(metric.labelnames, key))
+                if metric.kind != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets, value["buckets"]):
+                    cumulative += count
+                    bucket_labels = labels + [("le", _format_number(bound))]
+                    lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels + [('le', '+Inf')])} {value['count']}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _copy_value(value):
+    if isinstance(value, dict):
+        return {"buckets": list(value["buckets"]), "sum": value["sum"], "count": value["count"]}
+    return value
+
+
+def _merge_value(left, right):
+    if isinstance(left, dict):
+        return {
+            "buckets": [a + b for a, b in zip(left["buckets"], right["buckets"])],
+            "sum": left["sum"] + right["sum"],
+            "count": left["count"] + right["count"],
+        }
+    return left + right
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_number(value):
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def parse_networks(value):
+    networks = []
+    for item in (value or "").split(","):
+        item = item.strip()
+        if item:
+            networks.append(ipaddress.ip_network(item, strict=False))
+    return networks
+
+
+def address_allowed(address, networks):
+    try:
+        ip = ipaddress.ip_address(address or "")
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def clear_multiproc_dir(path):
+    for file_path in glob.glob(os.path.join(path, "metrics_*.json")):
+        os.remove(file_path)
+
+
+def init_metrics(app):
+    registry = MetricsRegistry(
+        multiproc_dir=app.config.get("METRICS_MULTIPROC_DIR") or None,
+        flush_interval=app.config.get("METRICS_FLUSH_INTERVAL", 1.0),
+    )
+    requests_total = registry.counter(
+        "http_requests_total",
+        "HTTP requests handled, by endpoint and status.",
+        ("endpoint", "method", "status"),
+    )
+    latency = registry.histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency in seconds, by endpoint and status.",
+        ("endpoint", "status"),
+    )
+    in_progress = registry.gauge(
+        "http_requests_in_progress",
+        "HTTP requests currently being handled.",
+    )
+    app.extensions["metrics"] = registry
+    _registries.add(registry)
+
+    @app.before_request
+    def start_metrics_timer():
+        if request.endpoint in SKIPPED_ENDPOINTS:
+            return
+        g.metrics_started = time.perf_counter()
+        in_progress.inc()
+
+    @app.after_request
+    def observe_request(response):
+        started = g.get("metrics_started")
+        if started is None:
+            return response
+        endpoint = request.endpoint or "-"
+        status = str(response.status_code)
+        requests_total.inc(endpoint=endpoint, method=request.method, status=status)
+        latency.observe(time.perf_counter() - started, endpoint=endpoint, status=status)
+        return response
+
+    @app.teardown_request
+    def finish_metrics_timer(exc):
+        if g.pop("metrics_started", None) is not None:
+            in_progress.dec()
+
+    return registry
+
+
+def get_metrics_registry(app):
+    return app.extensions.get("metrics")
+
+
+def flush_metrics_registries():
+    for registry in list(_registries):
+        registry.flush()
@@ -1,3 +1,5 @@
+import hashlib
+import zlib
 from datetime import UTC, datetime
 
 from flask_login import UserMixin
@@ -11,6 +13,11 @@ def utc_now():
 
 
 class User(UserMixin, db.Model):
+    __table_args__ = (
+        db.Index("ix_user_created_at_id", "created_at", "id"),
+        db.Index("ix_user_role_created_at", "role", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(50), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -58,6 +65,12 @@ def load_user(user_id):
 
 
 class Post(db.Model):
+    __table_args__ = (
+        db.Index("ix_post_created_at_id", "created_at", "id"),
+        db.Index("ix_post_category_created_at", "category", "created_at", "id"),
+        db.Index("ix_post_user_id_created_at", "user_id", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
@@ -72,9 +85,19 @@ class Post(db.Model):
         lazy=True,
         cascade="all, delete-orphan",
     )
+    upload_sessions = db.relationship(
+        "UploadSession",
+        lazy=True,
+        cascade="all, delete-orphan",
+    )
 
 
 class Notice(db.Model):
+    __table_args__ = (
+        db.Index("ix_notice_is_published_created_at", "is_published", "created_at"),
+        db.Index("ix_notice_created_at_id", "created_at", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
@@ -84,6 +107,13 @@ class Notice(db.Model):
 
 
 class Complaint(db.Model):
+    __table_args__ = (
+        db.Index("ix_complaint_created_at_id", "created_at", "id"),
+        db.Index("ix_complaint_status_created_at", "status", "created_at", "id"),
+        db.Index("ix_complaint_category_created_at", "category", "created_at", "id"),
+        db.Index("ix_complaint_user_id_created_at", "user_id", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
@@ -96,6 +126,12 @@ class Complaint(db.Model):
 
 
 class AuditLog(db.Model):
+    __table_args__ = (
+        db.Index("ix_audit_log_created_at_id", "created_at", "id"),
+        db.Index("ix_audit_log_action_created_at", "action", "created_at"),
+        db.Index("ix_audit_log_actor_id_created_at", "actor_id", "created_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     actor_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
     action = db.Column(db.String(200), nullable=False)
@@ -106,22 +142,144 @@ class AuditLog(db.Model):
     actor = db.relationship("User", foreign_keys=[actor_id], lazy=True)
 
 
+class AuditRequestAggregate(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint(
+            "bucket_start",
+            "endpoint",
+            "method",
+            "status_code",
+            name="uq_audit_request_aggregate_bucket",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    bucket_start = db.Column(db.DateTime, nullable=False, index=True)
+    endpoint = db.Column(db.String(120), nullable=False)
+    method = db.Column(db.String(10), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False)
+    request_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class StatCounter(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False, unique=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=utc_now, onupdate=utc_now, nullable=False)
+
+
+def encode_snapshot_payload(payload_json):
+    raw = payload_json.encode("utf-8")
+    return zlib.compress(raw, 6), hashlib.sha256(raw).hexdigest()
+
+
 class MyDataSnapshot(db.Model):
+    __table_args__ = (
+        db.Index("ix_my_data_snapshot_user_fetched", "user_id", "fetched_at", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
     source = db.Column(db.String(20), default="MOCK", nullable=False)
     consent_given = db.Column(db.Boolean, default=False, nullable=False)
     consent_at = db.Column(db.DateTime, nullable=True)
-    payload_json = db.Column(db.Text, nullable=False)
+    # zlib-compressed JSON; payload_hash is the sha256 of the raw JSON text.
+    payload = db.Column(db.LargeBinary(length=16 * 1024 * 1024), nullable=False)
+    payload_hash = db.Column(db.String(64), nullable=False)
     fetched_at = db.Column(db.DateTime, default=utc_now, nullable=False)
     created_at = db.Column(db.DateTime, default=utc_now, nullable=False)
 
+    @property
+    def payload_json(self):
+        return zlib.decompress(self.payload).decode("utf-8")
+
+    @payload_json.setter
+    def payload_json(self, value):
+        self.payload, self.payload_hash = encode_snapshot_payload(value)
+
+
+class SearchPosting(db.Model):
+    __table_args__ = (
+        db.Index("ix_search_posting_lookup", "doc_type", "term", "doc_id"),
+        db.Index("ix_search_posting_document", "doc_type", "doc_id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    doc_type = db.Column(db.String(20), nullable=False)
+    doc_id = db.Column(db.Integer, nullable=False)
+    term = db.Column(db.String(8), nullable=False)
+    weight = db.Column(db.Integer, nullable=False, default=1)
+
 
 class PostAttachment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     post_id = db.Column(db.Integer, db.ForeignKey("post.id"), nullable=False, index=True)
     original_name = db.Column(db.String(255), nullable=False)
     stored_name = db.Column(db.String(255), nullable=False, unique=True)
+    content_hash = db.Column(db.String(64), nullable=True, index=True)
     mime_type = db.Column(db.String(120), nullable=True)
     file_size = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=utc_now, nullable=False)
+
+
+class UploadSession(db.Model):
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    post_id = db.Column(db.Integer, db.ForeignKey("post.id"), nullable=False, index=True)
+    original_name = db.Column(db.String(255), nullable=False)
+    safe_name = db.Column(db.String(255), nullable=False)
+    mime_type = db.Column(db.String(120), nullable=True)
+    total_size = db.Column(db.Integer, nullable=False)
+    received_size = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=utc_now, nullable=False)
+    updated_at = db.Column(db.DateTime, default=utc_now, onupdate=utc_now, nullable=False, index=True)
+
+
+class ReportExportJob(db.Model):
+    id = db.Column(db.String(32), primary_key=True)
+    requested_by = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    filters = db.Column(db.Text, nullable=False, default="{}")
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    total = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    artifact_name = db.Column(db.String(255), nullable=True)
+    error = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=utc_now, nullable=False, index=True)
+    updated_at = db.Column(db.DateTime, default=utc_now, onupdate=utc_now, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def is_finished(self):
+        return self.status in ("done", "failed")
+
+
+class MyDataFetchJob(db.Model):
+    __table_args__ = (
+        db.Index("ix_my_data_fetch_job_user_created", "user_id", "created_at"),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    provider = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    snapshot_id = db.Column(db.Integer, nullable=True)
+    error = db.Column(db.String(255), nullable=True)
+    duration_ms = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, default=utc_now, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def is_finished(self):
+        return self.status in ("done", "failed")
+
+
+class MyDataMetricPoint(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "metric", "observed_at", name="uq_my_data_metric_point"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    metric = db.Column(db.String(32), nullable=False)
+    observed_at = db.Column(db.DateTime, nullable=False)
+    value = db.Column(db.Float, nullable=False)
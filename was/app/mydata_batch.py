@@ -0,0 +1,126 @@
+import json
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from sqlalchemy import exists, func, insert, select, update
+
+from app import db
+from app.models import MyDataSnapshot, User, encode_snapshot_payload, utc_now
+from app.mydata_metrics import extract_metric_points, upsert_metric_points
+from app.mydata_mock import build_mock_payload, mock_seed
+from app.mydata_store import prune_snapshots_for_users
+
+
+def build_snapshot_rows(users, today):
+    # Runs in worker processes: plain tuples in, encoded payloads out.
+    rows = []
+    for user_id, username, email, full_name, consented in users:
+        payload = build_mock_payload(mock_seed(user_id, username, email), full_name, today)
+        blob, payload_hash = encode_snapshot_payload(json.dumps(payload, ensure_ascii=False))
+        rows.append((user_id, consented, blob, payload_hash, extract_metric_points(payload, today)))
+    return rows
+
+
+def iter_user_chunks(chunk_size, consented_only=True, limit=None):
+    consented = exists().where(MyDataSnapshot.user_id == User.id, MyDataSnapshot.consent_given.is_(True))
+    query = select(User.id, User.username, User.email, User.full_name, consented).order_by(User.id)
+    if consented_only:
+        query = query.where(consented)
+    last_id = 0
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        users = [tuple(row) for row in db.session.execute(query.where(User.id > last_id).limit(size))]
+        if not users:
+            return
+        yield users
+        last_id = users[-1][0]
+        if remaining is not None:
+            remaining -= len(users)
+
+
+def store_snapshot_rows(rows, keep=0, now=None):
+    now = now or utc_now()
+    user_ids = [row[0] for row in rows]
+    latest_ids = (
+        select(func.max(MyDataSnapshot.id))
+        .where(MyDataSnapshot.user_id.in_(user_ids))
+        .group_by(MyDataSnapshot.user_id)
+    )
+    latest = {
+        user_id: (snapshot_id, payload_hash)
+        for snapshot_id, user_id, payload_hash in db.session.execute(
+            select(MyDataSnapshot.id, MyDataSnapshot.user_id, MyDataSnapshot.payload_hash).where(
+                MyDataSnapshot.id.in_(latest_ids)
+            )
+        )
+    }
+
+    unchanged_ids = []
+    new_rows = []
+    metric_points = {}
+    for user_id, consented, blob, payload_hash, points in rows:
+        current = latest.get(user_id)
+        if current is not None and current[1] == payload_hash:
+            unchanged_ids.append(current[0])
+            continue
+        metric_points[user_id] = points
+        new_rows.append(
+            {
+                "user_id": user_id,
+                "source": "MOCK",
+                # Load-test users without consent get rows flagged as such.
+                "consent_given": bool(consented),
+                "consent_at": now if consented else None,
+                "payload": blob,
+                "payload_hash": payload_hash,
+                "fetched_at": now,
+                "created_at": now,
+            }
+        )
+
+    if unchanged_ids:
+        db.session.execute(
+            update(MyDataSnapshot)
+            .where(MyDataSnapshot.id.in_(unchanged_ids))
+            .values(fetched_at=now)
+            .execution_options(synchronize_session=False)
+        )
+    if new_rows:
+        db.session.execute(insert(MyDataSnapshot), new_rows)
+        upsert_metric_points(metric_points)
+    if keep and new_rows:
+        prune_snapshots_for_users([row["user_id"] for row in new_rows], keep)
+    db.session.commit()
+    return len(new_rows), len(unchanged_ids)
+
+
+def prewarm_snapshots(workers=0, chunk_size=500, consented_only=True, keep=0, limit=None, today=None):
+    today = today or date.today()
+    totals = {"users": 0, "inserted": 0, "unchanged": 0}
+
+    def store(rows):
+        inserted, unchanged = store_snapshot_rows(rows, keep=keep)
+        totals["users"] += len(rows)
+        totals["inserted"] += inserted
+        totals["unchanged"] += unchanged
+
+    chunks = iter_user_chunks(chunk_size, consented_only=consented_only, limit=limit)
+    if workers <= 0:
+        for users in chunks:
+            store(build_snapshot_rows(users, today))
+        return totals
+
+    # Keep a bounded number of chunks in flight so memory stays flat no
+    # matter how many users there are.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending = deque()
+        for users in chunks:
+            pending.append(pool.submit(build_snapshot_rows, users, today))
+            if len(pending) >= workers * 2:
+                store(pending.popleft().result())
+        while pending:
+            store(pending.popleft().result())
+    return totals
@@ -0,0 +1,115 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from app import db
+from app.models import MyDataFetchJob, User, utc_now
+from app.mydata_providers import MyDataProviderError, create_mydata_provider
+from app.mydata_store import store_snapshot
+
+
+# A job still "running" after this long belonged to a worker that went away.
+STALE_JOB_AFTER = timedelta(minutes=5)
+
+
+def create_fetch_job(user_id, provider_source):
+    job = MyDataFetchJob(id=uuid.uuid4().hex, user_id=user_id, provider=provider_source, status="queued")
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def latest_fetch_job(user_id):
+    return (
+        MyDataFetchJob.query.filter_by(user_id=user_id)
+        .order_by(MyDataFetchJob.created_at.desc())
+        .first()
+    )
+
+
+def job_is_active(job):
+    return job is not None and not job.is_finished and job.created_at >= utc_now() - STALE_JOB_AFTER
+
+
+def active_fetch_job(user_id):
+    job = latest_fetch_job(user_id)
+    return job if job_is_active(job) else None
+
+
+def run_fetch_job(app, job_id, provider, observe=None):
+    with app.app_context():
+        job = db.session.get(MyDataFetchJob, job_id)
+        if job is None:
+            return None
+        job.status = "running"
+        db.session.commit()
+        user = db.session.get(User, job.user_id)
+
+        started = time.perf_counter()
+        try:
+            payload = provider.fetch(user)
+            snapshot, _ = store_snapshot(
+                user.id,
+                payload,
+                source=provider.source,
+                keep=app.config["MYDATA_SNAPSHOT_RETENTION"],
+            )
+            app.extensions["mydata_view_cache"].invalidate(user.id)
+            job.snapshot_id = snapshot.id
+            job.status = "done"
+        except MyDataProviderError as exc:
+            db.session.rollback()
+            app.logger.warning("mydata fetch %s failed: %s", job_id, exc)
+            job.status = "failed"
+            job.error = str(exc)[:255]
+        except Exception as exc:
+            db.session.rollback()
+            app.logger.exception("mydata fetch %s failed", job_id)
+            job.status = "failed"
+            job.error = str(exc)[:255]
+        elapsed = time.perf_counter() - started
+        job.duration_ms = int(elapsed * 1000)
+        job.finished_at = utc_now()
+        db.session.commit()
+        if observe is not None:
+            observe(elapsed, provider=provider.source, status=job.status)
+        return job.status
+
+
+class MyDataFetcher:
+    def __init__(self, app, provider, max_workers):
+        self.app = app
+        self.provider = provider
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mydata-fetch")
+        self.observe = None
+        registry = app.extensions.get("metrics")
+        if registry is not None:
+            self.observe = registry.histogram(
+                "mydata_fetch_duration_seconds",
+                "MyData provider fetch time in seconds, by provider and outcome.",
+                ("provider", "status"),
+            ).observe
+
+    def run(self, job_id):
+        return run_fetch_job(self.app, job_id, self.provider, observe=self.observe)
+
+    def submit(self, job_id):
+        return self.executor.submit(self.run, job_id)
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+        self.provider.close()
+
+
+def init_mydata_fetcher(app):
+    fetcher = MyDataFetcher(app, create_mydata_provider(app.config), app.config["MYDATA_FETCH_WORKERS"])
+    app.extensions["mydata_fetcher"] = fetcher
+    return fetcher
+
+
+def start_fetch_job(app, job_id):
+    fetcher = app.extensions["mydata_fetcher"]
+    if not app.config.get("MYDATA_FETCH_ASYNC"):
+        return fetcher.run(job_id)
+    return fetcher.submit(job_id)
@@ -0,0 +1,147 @@
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import MyDataMetricPoint
+
+
+CHECKUP_METRICS = {
+    "fasting_glucose": "fastingGlucose",
+    "hba1c": "hba1c",
+    "bmi": "bmi",
+    "total_cholesterol": "totalCholesterol",
+}
+METRIC_NAMES = (*CHECKUP_METRICS, "systolic_bp", "diastolic_bp", "out_of_pocket")
+TREND_BUCKETS = {"day": "%Y-%m-%d", "month": "%Y-%m"}
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_metric_points(payload, observed_at):
+    # Checkups are observed on the fetch day; monthly costs on the 1st of
+    # their month, so refetches overwrite the same points instead of adding.
+    observed_day = datetime(observed_at.year, observed_at.month, observed_at.day)
+    points = {}
+    checkups = payload.get("checkups") or {}
+    for metric, field in CHECKUP_METRICS.items():
+        value = _number(checkups.get(field))
+        if value is not None:
+            points[(metric, observed_day)] = value
+
+    systolic, _, diastolic = str(checkups.get("bloodPressure") or "").partition("/")
+    for metric, raw in (("systolic_bp", systolic), ("diastolic_bp", diastolic)):
+        value = _number(raw)
+        if value is not None:
+            points[(metric, observed_day)] = value
+
+    for item in (payload.get("costSummary") or {}).get("monthly", []):
+        try:
+            month_start = datetime.strptime(item["month"], "%Y-%m")
+        except (KeyError, TypeError, ValueError):
+            continue
+        value = _number(item.get("outOfPocket"))
+        if value is not None:
+            points[("out_of_pocket", month_start)] = value
+    return [(metric, when, value) for (metric, when), value in points.items()]
+
+
+def upsert_metric_points(entries):
+    # entries: {user_id: [(metric, observed_at, value), ...]}
+    entries = {user_id: points for user_id, points in entries.items() if points}
+    if not entries:
+        return 0
+    earliest = min(when for points in entries.values() for _, when, _ in points)
+    existing = {
+        (user_id, metric, when): point_id
+        for point_id, user_id, metric, when in db.session.execute(
+            select(
+                MyDataMetricPoint.id,
+                MyDataMetricPoint.user_id,
+                MyDataMetricPoint.metric,
+                MyDataMetricPoint.observed_at,
+            ).where(
+                MyDataMetricPoint.user_id.in_(list(entries)),
+                MyDataMetricPoint.observed_at >= earliest,
+            )
+        )
+    }
+
+    updates = []
+    inserts = []
+    for user_id, points in entries.items():
+        for metric, when, value in points:
+            point_id = existing.get((user_id, metric, when))
+            if point_id is None:
+                inserts.append({"user_id": user_id, "metric": metric, "observed_at": when, "value": value})
+            else:
+                updates.append({"point_id": point_id, "new_value": value})
+
+    if updates:
+        db.session.connection().execute(
+            update(MyDataMetricPoint.__table__)
+            .where(MyDataMetricPoint.__table__.c.id == bindparam("point_id"))
+            .values(value=bindparam("new_value")),
+            updates,
+        )
+    if inserts:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(MyDataMetricPoint), inserts)
+        except IntegrityError:
+            # A concurrent fetch for the same user got there first.
+            for row in inserts:
+                changed = db.session.execute(
+                    update(MyDataMetricPoint)
+                    .where(
+                        MyDataMetricPoint.user_id == row["user_id"],
+                        MyDataMetricPoint.metric == row["metric"],
+                        MyDataMetricPoint.observed_at == row["observed_at"],
+                    )
+                    .values(value=row["value"])
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if not changed:
+                    db.session.execute(insert(MyDataMetricPoint), [row])
+    return len(updates) + len(inserts)
+
+
+def _bucket_label(column, bucket):
+    pattern = TREND_BUCKETS[bucket]
+    if db.engine.dialect.name in {"mysql", "mariadb"}:
+        return func.date_format(column, pattern)
+    return func.strftime(pattern, column)
+
+
+def metric_trend(user_id, metric, bucket="month", since=None):
+    period = _bucket_label(MyDataMetricPoint.observed_at, bucket).label("period")
+    query = (
+        select(
+            period,
+            func.avg(MyDataMetricPoint.value),
+            func.min(MyDataMetricPoint.value),
+            func.max(MyDataMetricPoint.value),
+            func.count(MyDataMetricPoint.id),
+        )
+        .where(MyDataMetricPoint.user_id == user_id, MyDataMetricPoint.metric == metric)
+        .group_by(period)
+        .order_by(period)
+    )
+    if since is not None:
+        query = query.where(MyDataMetricPoint.observed_at >= since)
+    return [
+        {
+            "period": label,
+            "avg": round(float(average), 2),
+            "min": float(minimum),
+            "max": float(maximum),
+            "count": count,
+        }
+        for label, average, minimum, maximum, count in db.session.execute(query)
+    ]
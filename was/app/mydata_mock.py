@@ -1,4 +1,6 @@
 from datetime import date, timedelta
+from functools import lru_cache
+from operator import itemgetter
 import random
 
 
@@ -51,78 +53,87 @@ ALLERGIES = [
 ]
 
 
-def _iso(dt):
-    return dt.isoformat()
+BLOOD_TYPES = ["A+", "A-", "B+", "B-", "O+", "O-", "AB+", "AB-"]
+MEDICATION_DAYS = [3, 5, 7, 14, 30]
+COPAY_RATES = [0.2, 0.3, 0.4]
+MAX_DAYS_AGO = 400
 
 
-def generate_mock_medical_mydata(user):
-    rng = random.Random(f"mydata:{user.id}:{user.username}:{user.email}")
-    today = date.today()
-
-    age = rng.randint(24, 68)
-    birth_year = today.year - age
-    birth_month = rng.randint(1, 12)
-    birth_day = rng.randint(1, 28)
-    birth_date = date(birth_year, birth_month, birth_day)
-    gender = "M" if rng.randint(0, 1) == 0 else "F"
-    blood_type = rng.choice(["A+", "A-", "B+", "B-", "O+", "O-", "AB+", "AB-"])
-
-    visit_count = rng.randint(3, 8)
+@lru_cache(maxsize=4)
+def mock_calendar(today):
+    # ISO dates for every "n days ago" the generator can pick, plus the six
+    # cost-summary month labels; shared by every payload built for that day.
+    days_ago = tuple((today - timedelta(days=offset)).isoformat() for offset in range(MAX_DAYS_AGO + 1))
+    months = []
+    for month_offset in range(5, -1, -1):
+        ref = today - timedelta(days=month_offset * 30)
+        months.append(f"{ref.year}-{ref.month:02d}")
+    return days_ago, tuple(months)
+
+
+def mock_seed(user_id, username, email):
+    return f"mydata:{user_id}:{username}:{email}"
+
+
+def build_mock_payload(seed, full_name, today):
+    # Draws from the RNG in exactly the original order, so a user's payload
+    # is the same whichever path builds it. randrange(a, b + 1) is what
+    # randint(a, b) calls internally.
+    rng = random.Random(seed)
+    randrange = rng.randrange
+    choice = rng.choice
+    days_ago, months = mock_calendar(today)
+
+    age = randrange(24, 69)
+    birth_date = f"{today.year - age:04d}-{randrange(1, 13):02d}-{randrange(1, 29):02d}"
+    gender = "M" if randrange(0, 2) == 0 else "F"
+    blood_type = choice(BLOOD_TYPES)
+
     visits = []
-    for _ in range(visit_count):
-        code, name = rng.choice(DIAGNOSES)
-        visit_date = today - timedelta(days=rng.randint(10, 360))
+    for _ in range(randrange(3, 9)):
+        code, name = choice(DIAGNOSES)
         visits.append(
             {
-                "date": _iso(visit_date),
-                "provider": rng.choice(HOSPITALS),
-                "department": rng.choice(DEPARTMENTS),
+                "date": days_ago[randrange(10, 361)],
+                "provider": choice(HOSPITALS),
+                "department": choice(DEPARTMENTS),
                 "diagnosisCode": code,
                 "diagnosisName": name,
             }
         )
-    visits.sort(key=lambda item: item["date"], reverse=True)
+    visits.sort(key=itemgetter("date"), reverse=True)
 
-    medication_count = rng.randint(2, 5)
     medications = []
-    for _ in range(medication_count):
+    for _ in range(randrange(2, 6)):
         medications.append(
             {
-                "name": rng.choice(MEDICATIONS),
-                "dose": f"{rng.randint(1, 2)}정",
-                "frequencyPerDay": rng.randint(1, 3),
-                "days": rng.choice([3, 5, 7, 14, 30]),
+                "name": choice(MEDICATIONS),
+                "dose": f"{randrange(1, 3)}정",
+                "frequencyPerDay": randrange(1, 4),
+                "days": choice(MEDICATION_DAYS),
             }
         )
 
     vaccinations = []
-    for _ in range(rng.randint(1, 3)):
-        shot_date = today - timedelta(days=rng.randint(30, 400))
+    for _ in range(randrange(1, 4)):
+        shot_date = days_ago[randrange(30, 401)]
         vaccinations.append(
             {
-                "name": rng.choice(VACCINES),
-                "date": _iso(shot_date),
-                "doseNo": rng.randint(1, 3),
+                "name": choice(VACCINES),
+                "date": shot_date,
+                "doseNo": randrange(1, 4),
             }
         )
-    vaccinations.sort(key=lambda item: item["date"], reverse=True)
+    vaccinations.sort(key=itemgetter("date"), reverse=True)
 
-    fasting_glucose = rng.randint(86, 130)
+    fasting_glucose = randrange(86, 131)
     hba1c = round(rng.uniform(5.1, 7.2), 1)
-    systolic = rng.randint(108, 145)
-    diastolic = rng.randint(68, 94)
+    systolic = randrange(108, 146)
+    diastolic = randrange(68, 95)
     bmi = round(rng.uniform(19.1, 29.8), 1)
-    total_cholesterol = rng.randint(155, 240)
+    total_cholesterol = randrange(155, 241)
 
-    monthly_costs = []
-    for month_offset in range(5, -1, -1):
-        ref = today - timedelta(days=month_offset * 30)
-        monthly_costs.append(
-            {
-                "month": f"{ref.year}-{ref.month:02d}",
-                "outOfPocket": rng.randint(12000, 165000),
-            }
-        )
+    monthly_costs = [{"month": month, "outOfPocket": randrange(12000, 165001)} for month in months]
     out_of_pocket_total = sum(item["outOfPocket"] for item in monthly_costs)
 
     alerts = []
@@ -138,16 +149,16 @@ def generate_mock_medical_mydata(user):
     return {
         "source": "MOCK",
         "profile": {
-            "name": user.full_name,
-            "birthDate": _iso(birth_date),
+            "name": full_name,
+            "birthDate": birth_date,
             "gender": gender,
             "bloodType": blood_type,
-            "allergy": rng.choice(ALLERGIES),
+            "allergy": choice(ALLERGIES),
         },
         "insurance": {
             "type": "국민건강보험",
             "eligibility": "정상",
-            "copayRate": rng.choice([0.2, 0.3, 0.4]),
+            "copayRate": choice(COPAY_RATES),
         },
         "visits": visits,
         "medications": medications,
@@ -166,3 +177,7 @@ def generate_mock_medical_mydata(user):
         },
         "alerts": alerts,
     }
+
+
+def generate_mock_medical_mydata(user):
+    return build_mock_payload(mock_seed(user.id, user.username, user.email), user.full_name, date.today())
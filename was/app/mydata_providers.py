@@ -0,0 +1,157 @@
+import http.client
+import json
+import queue
+import random
+import time
+from urllib.parse import urlsplit
+
+from app.mydata_mock import generate_mock_medical_mydata
+
+
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+# Top-level sections the profile view and metric extraction read.
+PAYLOAD_SECTIONS = {
+    "profile": dict,
+    "insurance": dict,
+    "visits": list,
+    "medications": list,
+    "checkups": dict,
+    "vaccinations": list,
+    "costSummary": dict,
+    "alerts": list,
+}
+
+
+class MyDataProviderError(Exception):
+    def __init__(self, message, retryable=False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class MockMyDataProvider:
+    source = "MOCK"
+
+    def fetch(self, user):
+        return generate_mock_medical_mydata(user)
+
+    def close(self):
+        pass
+
+
+class HttpMyDataProvider:
+    source = "HTTP"
+
+    def __init__(self, base_url, timeout=3.0, retries=2, backoff=0.2, pool_size=4):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"invalid MyData provider URL: {base_url!r}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = (parts.path.rstrip("/") or "") + "/mydata"
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        # Idle keep-alive connections; at most pool_size are kept around.
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+
+    def _connect(self):
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, connection):
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _request(self, body):
+        connection = self._acquire()
+        try:
+            connection.request(
+                "POST",
+                self.path,
+                body=body,
+                headers={"Content-Type": "application/json", "Connection": "keep-alive"},
+            )
+            response = connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException) as exc:
+            # A pooled connection the server already closed fails here too.
+            connection.close()
+            raise MyDataProviderError(f"provider request failed: {exc}", retryable=True) from exc
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(connection)
+
+        if response.status != 200:
+            raise MyDataProviderError(
+                f"provider returned HTTP {response.status}",
+                retryable=response.status in RETRYABLE_STATUSES,
+            )
+        try:
+            payload = json.loads(data)
+        except ValueError as exc:
+            raise MyDataProviderError("provider returned invalid JSON") from exc
+        return validate_payload(payload)
+
+    def fetch(self, user):
+        body = json.dumps(
+            {
+                "userId": user.id,
+                "username": user.username,
+                "email": user.email,
+                "fullName": user.full_name,
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        attempt = 0
+        while True:
+            try:
+                return self._request(body)
+            except MyDataProviderError as exc:
+                if not exc.retryable or attempt >= self.retries:
+                    raise
+            # Full jitter keeps retries from many workers from lining up.
+            time.sleep(random.uniform(0, self.backoff * (2**attempt)))
+            attempt += 1
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def validate_payload(payload):
+    if not isinstance(payload, dict):
+        raise MyDataProviderError(f"provider returned {type(payload).__name__}, expected an object")
+    for section, expected in PAYLOAD_SECTIONS.items():
+        if not isinstance(payload.get(section), expected):
+            raise MyDataProviderError(f"provider payload has no valid {section!r} section")
+    return payload
+
+
+def create_mydata_provider(config):
+    kind = config.get("MYDATA_PROVIDER", "mock")
+    if kind == "mock":
+        return MockMyDataProvider()
+    if kind == "http":
+        return HttpMyDataProvider(
+            config["MYDATA_PROVIDER_URL"],
+            timeout=config["MYDATA_PROVIDER_TIMEOUT"],
+            retries=config["MYDATA_PROVIDER_RETRIES"],
+            backoff=config["MYDATA_PROVIDER_BACKOFF"],
+            pool_size=config["MYDATA_PROVIDER_POOL_SIZE"],
+        )
+    raise ValueError(f"unknown MYDATA_PROVIDER: {kind!r}")
+
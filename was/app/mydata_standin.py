@@ -0,0 +1,60 @@
+import json
+import random
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.mydata_mock import build_mock_payload, mock_seed
+
+
+class MyDataStandInHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep the connection open between requests.
+    protocol_version = "HTTP/1.1"
+    server_version = "MyDataStandIn/1.0"
+
+    def _send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        if self.path.rstrip("/") != "/mydata":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            request = json.loads(raw)
+            seed = mock_seed(request["userId"], request["username"], request["email"])
+            full_name = request["fullName"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": "userId, username, email and fullName are required"})
+            return
+
+        settings = self.server.settings
+        delay = settings["latency"] + random.uniform(0, settings["jitter"])
+        if delay:
+            time.sleep(delay)
+        if settings["error_rate"] and random.random() < settings["error_rate"]:
+            self._send_json(503, {"error": "simulated upstream failure"})
+            return
+        self._send_json(200, build_mock_payload(seed, full_name, date.today()))
+
+    def log_message(self, format, *args):
+        if self.server.settings["verbose"]:
+            super().log_message(format, *args)
+
+
+def create_standin_server(host="127.0.0.1", port=8765, latency=0.0, jitter=0.0, error_rate=0.0, verbose=False):
+    server = ThreadingHTTPServer((host, port), MyDataStandInHandler)
+    server.daemon_threads = True
+    server.settings = {
+        "latency": latency,
+        "jitter": jitter,
+        "error_rate": error_rate,
+        "verbose": verbose,
+    }
+    return server
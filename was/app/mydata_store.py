@@ -0,0 +1,115 @@
+import json
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import defer
+
+from app import db
+from app.models import MyDataSnapshot, utc_now
+from app.mydata_metrics import extract_metric_points, upsert_metric_points
+
+
+def latest_snapshot(user_id, with_payload=True):
+    query = MyDataSnapshot.query
+    if not with_payload:
+        # The blob is only read when the rendered panel is not cached.
+        query = query.options(defer(MyDataSnapshot.payload))
+    return (
+        query.filter_by(user_id=user_id)
+        .order_by(MyDataSnapshot.fetched_at.desc(), MyDataSnapshot.id.desc())
+        .first()
+    )
+
+
+def store_snapshot(user_id, payload, source="MOCK", keep=0):
+    now = utc_now()
+    candidate = MyDataSnapshot(
+        user_id=user_id,
+        source=source,
+        consent_given=True,
+        consent_at=now,
+        payload_json=json.dumps(payload, ensure_ascii=False),
+        fetched_at=now,
+    )
+    latest = latest_snapshot(user_id)
+    if latest is not None and latest.payload_hash == candidate.payload_hash and latest.source == source:
+        # Same data as last time: refresh the sync time instead of adding a row.
+        latest.consent_given = True
+        latest.consent_at = now
+        latest.fetched_at = now
+        db.session.commit()
+        return latest, False
+
+    db.session.add(candidate)
+    db.session.flush()
+    upsert_metric_points({user_id: extract_metric_points(payload, now)})
+    if keep:
+        prune_snapshots(user_id, keep)
+    db.session.commit()
+    return candidate, True
+
+
+def prune_snapshots(user_id, keep):
+    stale_ids = (
+        db.session.execute(
+            select(MyDataSnapshot.id)
+            .where(MyDataSnapshot.user_id == user_id)
+            .order_by(MyDataSnapshot.fetched_at.desc(), MyDataSnapshot.id.desc())
+            .offset(keep)
+        )
+        .scalars()
+        .all()
+    )
+    if stale_ids:
+        db.session.execute(
+            delete(MyDataSnapshot)
+            .where(MyDataSnapshot.id.in_(stale_ids))
+            .execution_options(synchronize_session=False)
+        )
+    return len(stale_ids)
+
+
+def prune_snapshots_for_users(user_ids, keep):
+    ranked = (
+        select(
+            MyDataSnapshot.id,
+            func.row_number()
+            .over(
+                partition_by=MyDataSnapshot.user_id,
+                order_by=(MyDataSnapshot.fetched_at.desc(), MyDataSnapshot.id.desc()),
+            )
+            .label("position"),
+        )
+        .where(MyDataSnapshot.user_id.in_(user_ids))
+        .subquery()
+    )
+    stale_ids = db.session.execute(select(ranked.c.id).where(ranked.c.position > keep)).scalars().all()
+    if stale_ids:
+        db.session.execute(
+            delete(MyDataSnapshot)
+            .where(MyDataSnapshot.id.in_(stale_ids))
+            .execution_options(synchronize_session=False)
+        )
+    return len(stale_ids)
+
+
+def prune_all_snapshots(keep, batch_size=500):
+    removed = 0
+    last_user_id = 0
+    while True:
+        user_ids = (
+            db.session.execute(
+                select(MyDataSnapshot.user_id)
+                .where(MyDataSnapshot.user_id > last_user_id)
+                .group_by(MyDataSnapshot.user_id)
+                .order_by(MyDataSnapshot.user_id)
+                .limit(batch_size)
+            )
+            .scalars()
+            .all()
+        )
+        if not user_ids:
+            break
+        removed += prune_snapshots_for_users(user_ids, keep)
+        db.session.commit()
+        last_user_id = user_ids[-1]
+    return removed
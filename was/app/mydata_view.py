@@ -0,0 +1,121 @@
+import glob
+import json
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+
+from flask import render_template
+from markupsafe import Markup
+
+
+def build_mydata_view(payload):
+    cost = payload.get("costSummary", {})
+    visits = payload.get("visits", [])
+    return {
+        "latest_visit_date": visits[0]["date"] if visits else "-",
+        "out_of_pocket_total": f"{cost.get('outOfPocketTotal', 0):,}",
+        "monthly_costs": [
+            {"month": item["month"], "amount": f"{item['outOfPocket']:,}"}
+            for item in cost.get("monthly", [])
+        ],
+        "profile": payload.get("profile", {}),
+        "insurance": payload.get("insurance", {}),
+        "checkups": payload.get("checkups", {}),
+        "alerts": payload.get("alerts", []),
+        "visits": visits,
+        "medications": payload.get("medications", []),
+        "vaccinations": payload.get("vaccinations", []),
+    }
+
+
+class MyDataViewCache:
+    # One rendered panel per user. Entries are keyed by snapshot id, and a
+    # snapshot's payload never changes, so a stale entry can only miss.
+    def __init__(self, max_entries, shared_dir=""):
+        self.max_entries = max_entries
+        self.shared_dir = shared_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _shared_path(self, user_id, snapshot_id):
+        return os.path.join(self.shared_dir, f"{user_id}_{snapshot_id}.html")
+
+    def get(self, user_id, snapshot_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == snapshot_id:
+                self._entries.move_to_end(user_id)
+                return entry[1]
+        if not self.shared_dir:
+            return None
+        try:
+            with open(self._shared_path(user_id, snapshot_id), encoding="utf-8") as handle:
+                fragment = handle.read()
+        except FileNotFoundError:
+            return None
+        self._remember(user_id, snapshot_id, fragment)
+        return fragment
+
+    def put(self, user_id, snapshot_id, fragment):
+        self._remember(user_id, snapshot_id, fragment)
+        if not self.shared_dir:
+            return
+        os.makedirs(self.shared_dir, exist_ok=True)
+        self._remove_shared(user_id)
+        fd, temp_path = tempfile.mkstemp(dir=self.shared_dir, prefix=".panel-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(fragment)
+            os.replace(temp_path, self._shared_path(user_id, snapshot_id))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+        if self.shared_dir:
+            self._remove_shared(user_id)
+
+    def _remember(self, user_id, snapshot_id, fragment):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (snapshot_id, fragment)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _remove_shared(self, user_id):
+        for path in glob.glob(os.path.join(self.shared_dir, f"{user_id}_*.html")):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def init_mydata_view_cache(app):
+    cache = MyDataViewCache(app.config["MYDATA_VIEW_CACHE_SIZE"], app.config["MYDATA_VIEW_CACHE_DIR"])
+    app.extensions["mydata_view_cache"] = cache
+    return cache
+
+
+def mydata_panel(app, snapshot):
+    cache = app.extensions["mydata_view_cache"]
+    fragment = cache.get(snapshot.user_id, snapshot.id)
+    if fragment is None:
+        try:
+            payload = json.loads(snapshot.payload_json)
+        except (json.JSONDecodeError, zlib.error):
+            return None
+        if not isinstance(payload, dict):
+            return None
+        fragment = render_template("auth/mydata_panel.html", view=build_mydata_view(payload))
+        cache.put(snapshot.user_id, snapshot.id, fragment)
+    return Markup(fragment)
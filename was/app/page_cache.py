@@ -0,0 +1,123 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache, wraps
+
+from flask import Response, current_app, g, request, session
+from flask_login import current_user
+
+from app import health_content
+
+
+@lru_cache(maxsize=None)
+def content_version(release=""):
+    # The public pages only change with health_content (or a deploy, which
+    # can pass its release id), so this is stable for the process lifetime.
+    digest = hashlib.sha1(release.encode("utf-8"))
+    for name in sorted(vars(health_content)):
+        if name.isupper():
+            digest.update(name.encode("utf-8"))
+            digest.update(json.dumps(getattr(health_content, name), ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CachedPage:
+    __slots__ = ("body", "content_type", "etag")
+
+    def __init__(self, body, content_type, etag):
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+
+
+class PageCache:
+    def __init__(self, max_entries, version):
+        self.max_entries = max_entries
+        self.version = version
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, body, content_type):
+        etag = hashlib.sha1(self.version.encode("ascii") + body).hexdigest()
+        entry = CachedPage(body, content_type, etag)
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def init_page_cache(app):
+    cache = PageCache(
+        app.config["PUBLIC_PAGE_CACHE_MAX_ENTRIES"],
+        content_version(app.config["PUBLIC_PAGE_CACHE_RELEASE"]),
+    )
+    app.extensions["page_cache"] = cache
+    return cache
+
+
+def _cacheable_request():
+    if not current_app.config["PUBLIC_PAGE_CACHE"] or request.method not in ("GET", "HEAD"):
+        return False
+    # Logged-in pages carry the user chip, and pending flashes must render once.
+    return not current_user.is_authenticated and not session.get("_flashes")
+
+
+def _cache_key(params):
+    values = []
+    for name, known in params.items():
+        value = request.args.get(name, "").strip()
+        # Arbitrary values would each take an LRU slot and evict real pages.
+        if value and value not in known:
+            return None
+        values.append((name, value))
+    return request.path, tuple(values)
+
+
+def cached_public_page(params=None):
+    # params maps each query parameter the view reads to its known values.
+    params = params or {}
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            key = _cache_key(params) if _cacheable_request() else None
+            if key is None:
+                return view(*args, **kwargs)
+
+            cache = current_app.extensions["page_cache"]
+            entry = cache.get(key)
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                entry = cache.put(key, response.get_data(), response.content_type)
+            else:
+                g.page_cache_hit = True
+
+            if entry.etag in request.if_none_match:
+                response = Response(status=304)
+            else:
+                response = Response(entry.body, content_type=entry.content_type)
+            response.set_etag(entry.etag)
+            response.cache_control.public = True
+            response.cache_control.max_age = current_app.config["PUBLIC_PAGE_CACHE_MAX_AGE"]
+            # Signed-in visitors get a different page from the same URL.
+            response.vary.add("Cookie")
+            return response
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,134 @@
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_, text
+
+from app import db
+
+
+class KeysetPage:
+    def __init__(
+        self,
+        items,
+        page,
+        next_cursor,
+        prev_cursor,
+        cursor=None,
+        direction="next",
+        approx_total=None,
+    ):
+        self.items = items
+        self.page = page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.cursor = cursor
+        self.direction = direction
+        self.approx_total = approx_total
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    @property
+    def next_args(self):
+        return {"cursor": self.next_cursor, "dir": "next", "page": self.page + 1}
+
+    @property
+    def prev_args(self):
+        return {"cursor": self.prev_cursor, "dir": "prev", "page": max(self.page - 1, 1)}
+
+    @property
+    def current_args(self):
+        return {"cursor": self.cursor, "dir": self.direction, "page": self.page}
+
+
+def encode_cursor(sort_value, item_id):
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = f"{sort_value}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(value, parse_sort=datetime.fromisoformat):
+    if not value:
+        return None
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        sort_raw, id_raw = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return parse_sort(sort_raw), int(id_raw)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def estimate_table_rows(model):
+    if db.engine.dialect.name not in {"mysql", "mariadb"}:
+        return None
+    # InnoDB keeps an estimate in the table statistics; reading it is O(1).
+    return db.session.execute(
+        text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :name"
+        ),
+        {"name": model.__tablename__},
+    ).scalar()
+
+
+def keyset_paginate(query, model, per_page, cursor=None, direction="next", page=1, with_total=False, rank=None):
+    # With rank (an integer score column already joined into the query) the
+    # page is ordered by relevance instead of recency.
+    if rank is None:
+        sort_col = model.created_at
+        position = decode_cursor(cursor)
+    else:
+        sort_col = rank
+        query = query.add_columns(rank)
+        position = decode_cursor(cursor, parse_sort=int)
+    id_col = model.id
+    if position is None:
+        direction = "next"
+        page = 1
+
+    if position is not None and direction == "prev":
+        sort_value, item_id = position
+        query = query.filter(
+            or_(sort_col > sort_value, and_(sort_col == sort_value, id_col > item_id))
+        ).order_by(sort_col.asc(), id_col.asc())
+    else:
+        direction = "next"
+        if position is not None:
+            sort_value, item_id = position
+            query = query.filter(
+                or_(sort_col < sort_value, and_(sort_col == sort_value, id_col < item_id))
+            )
+        query = query.order_by(sort_col.desc(), id_col.desc())
+
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == "prev":
+        rows.reverse()
+        has_prev, has_next = has_more, True
+    else:
+        has_prev, has_next = position is not None, has_more
+
+    if rank is None:
+        items = rows
+        keys = [(row.created_at, row.id) for row in rows]
+    else:
+        items = [item for item, _ in rows]
+        keys = [(int(score), item.id) for item, score in rows]
+    next_cursor = encode_cursor(*keys[-1]) if keys and has_next else None
+    prev_cursor = encode_cursor(*keys[0]) if keys and has_prev else None
+    return KeysetPage(
+        items,
+        page=max(page, 1),
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+        cursor=cursor if position is not None else None,
+        direction=direction,
+        approx_total=estimate_table_rows(model) if with_total else None,
+    )
@@ -0,0 +1,145 @@
+from datetime import timedelta
+
+from sqlalchemy import inspect, select
+
+from app import db
+from app.models import AuditLog, Complaint, MyDataSnapshot, Notice, Post, User, utc_now
+
+
+def _list_query_shapes():
+    since = utc_now() - timedelta(days=30)
+    return [
+        (
+            "posts_list",
+            select(Post).order_by(Post.created_at.desc(), Post.id.desc()).limit(11),
+            ("post", ["created_at", "id"]),
+        ),
+        (
+            "posts_list:category",
+            select(Post)
+            .where(Post.category == "vaccination")
+            .order_by(Post.created_at.desc(), Post.id.desc())
+            .limit(11),
+            ("post", ["category", "created_at"]),
+        ),
+        (
+            "profile:my_posts",
+            select(Post).where(Post.user_id == 1).order_by(Post.created_at.desc()).limit(10),
+            ("post", ["user_id", "created_at"]),
+        ),
+        (
+            "index:latest_notices",
+            select(Notice)
+            .where(Notice.is_published.is_(True))
+            .order_by(Notice.created_at.desc())
+            .limit(5),
+            ("notice", ["is_published", "created_at"]),
+        ),
+        (
+            "admin_complaints:status",
+            select(Complaint)
+            .where(Complaint.status == "received")
+            .order_by(Complaint.created_at.desc(), Complaint.id.desc())
+            .limit(11),
+            ("complaint", ["status", "created_at"]),
+        ),
+        (
+            "admin_complaints:category",
+            select(Complaint)
+            .where(Complaint.category == "general")
+            .order_by(Complaint.created_at.desc(), Complaint.id.desc())
+            .limit(11),
+            ("complaint", ["category", "created_at"]),
+        ),
+        (
+            "complaints_list:owner",
+            select(Complaint).where(Complaint.user_id == 1).order_by(Complaint.created_at.desc()),
+            ("complaint", ["user_id", "created_at"]),
+        ),
+        (
+            "admin_users",
+            select(User).order_by(User.created_at.desc(), User.id.desc()).limit(11),
+            ("user", ["created_at", "id"]),
+        ),
+        (
+            "admin_logs",
+            select(AuditLog).order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(21),
+            ("audit_log", ["created_at", "id"]),
+        ),
+        (
+            "admin_logs:event",
+            select(AuditLog)
+            .where(AuditLog.action == "login_failed", AuditLog.created_at >= since)
+            .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+            .limit(21),
+            ("audit_log", ["action", "created_at"]),
+        ),
+        (
+            "profile:latest_snapshot",
+            select(MyDataSnapshot)
+            .where(MyDataSnapshot.user_id == 1)
+            .order_by(MyDataSnapshot.fetched_at.desc(), MyDataSnapshot.id.desc())
+            .limit(1),
+            ("my_data_snapshot", ["user_id", "fetched_at"]),
+        ),
+    ]
+
+
+def _explain(statement):
+    dialect = db.engine.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    connection = db.session.connection()
+    # Walking a whole index in order is fine for a plain LIMIT, but with a
+    # WHERE clause it still touches every row.
+    filtered = statement.whereclause is not None
+    if dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+        details = [row[-1] for row in rows]
+        full_scan = any(
+            detail.startswith("SCAN ") and (filtered or "INDEX" not in detail)
+            for detail in details
+        )
+        filesort = any("TEMP B-TREE FOR ORDER BY" in detail for detail in details)
+        return details, full_scan, filesort
+
+    rows = connection.exec_driver_sql(f"EXPLAIN {sql}").mappings().all()
+    details = [
+        f"table={row.get('table')} type={row.get('type')} key={row.get('key')} "
+        f"rows={row.get('rows')} extra={row.get('Extra') or ''}"
+        for row in rows
+    ]
+    full_scan = any(
+        row.get("type") == "ALL" or (filtered and row.get("type") == "index") for row in rows
+    )
+    filesort = any("filesort" in (row.get("Extra") or "") for row in rows)
+    return details, full_scan, filesort
+
+
+def _has_leading_index(inspector, table_name, columns):
+    candidates = [index["column_names"] for index in inspector.get_indexes(table_name)]
+    primary = inspector.get_pk_constraint(table_name).get("constrained_columns") or []
+    candidates.append(primary)
+    return any(list(existing[: len(columns)]) == columns for existing in candidates)
+
+
+def advise_indexes():
+    inspector = inspect(db.engine)
+    report = []
+    for name, statement, (table_name, columns) in _list_query_shapes():
+        details, full_scan, filesort = _explain(statement)
+        suggestion = None
+        if not _has_leading_index(inspector, table_name, columns):
+            suggestion = (
+                f"CREATE INDEX ix_{table_name}_{'_'.join(columns)} "
+                f"ON {table_name} ({', '.join(columns)})"
+            )
+        report.append(
+            {
+                "name": name,
+                "plan": details,
+                "full_scan": full_scan,
+                "filesort": filesort,
+                "suggestion": suggestion,
+            }
+        )
+    return report
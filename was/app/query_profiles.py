@@ -0,0 +1,20 @@
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from app.models import AuditLog, Complaint, Post
+
+
+# Relationship backrefs only exist once the mappers are configured, so the
+# options are built on first use rather than at import time.
+LOAD_PROFILES = {
+    "post_list": lambda: (joinedload(Post.author), raiseload("*")),
+    "post_detail": lambda: (joinedload(Post.author), selectinload(Post.attachments)),
+    "post_summary": lambda: (raiseload("*"),),
+    "complaint_admin_list": lambda: (joinedload(Complaint.requester), raiseload("*")),
+    "complaint_detail": lambda: (joinedload(Complaint.assigned_admin),),
+    "complaint_summary": lambda: (raiseload("*"),),
+    "audit_log_list": lambda: (joinedload(AuditLog.actor), raiseload("*")),
+}
+
+
+def with_profile(query, name):
+    return query.options(*LOAD_PROFILES[name]())
@@ -0,0 +1,98 @@
+import glob
+import hashlib
+import os
+import tempfile
+
+
+# Bump when the PDF layout changes so cached files stop matching.
+REPORT_LAYOUT_VERSION = "2"
+
+
+def report_fingerprint(complaint):
+    digest = hashlib.sha1()
+    for part in (
+        REPORT_LAYOUT_VERSION,
+        complaint.id,
+        complaint.updated_at.isoformat() if complaint.updated_at else "-",
+        complaint.status,
+        complaint.assigned_admin_id or "-",
+        complaint.category,
+        complaint.title,
+        complaint.content,
+    ):
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+class ReportCache:
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, complaint_id, fingerprint):
+        return os.path.join(self.directory, f"complaint_{complaint_id}_{fingerprint}.pdf")
+
+    def get(self, complaint_id, fingerprint):
+        path = self._path(complaint_id, fingerprint)
+        try:
+            # mtime doubles as the LRU clock; atime is often disabled.
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, complaint_id, fingerprint, pdf_bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        self.invalidate(complaint_id)
+        path = self._path(complaint_id, fingerprint)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".report-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(pdf_bytes)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict(keep=path)
+        return path
+
+    def invalidate(self, complaint_id):
+        for path in glob.glob(os.path.join(self.directory, f"complaint_{complaint_id}_*.pdf")):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def evict(self, keep=None):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".pdf") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+def get_report_cache(app):
+    cache = app.extensions.get("report_cache")
+    if cache is None:
+        cache = ReportCache(app.config["REPORT_CACHE_DIR"], app.config["REPORT_CACHE_MAX_BYTES"])
+        app.extensions["report_cache"] = cache
+    return cache
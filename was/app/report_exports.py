@@ -0,0 +1,191 @@
+import json
+import multiprocessing
+import os
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models import Complaint, ReportExportJob, utc_now
+from app.reports import complaint_report_context, render_complaint_report_entry
+from app.search_index import search_ranking
+
+
+EXPORT_BATCH_SIZE = 100
+# A job with no progress for this long belonged to a worker that went away
+# (the executor lives in the gunicorn worker that accepted the request).
+STALE_JOB_AFTER = timedelta(minutes=15)
+STALE_JOB_ERROR = "내보내기 작업이 중단되었습니다. 다시 요청해주세요."
+
+
+def artifact_path(app, job):
+    return os.path.join(app.config["REPORT_EXPORT_DIR"], job.artifact_name)
+
+
+def complaint_export_query(filters):
+    query = Complaint.query.options(joinedload(Complaint.assigned_admin))
+    if filters.get("q"):
+        # Join the full ranking so the export holds every complaint the
+        # admin list matched.
+        ranking = search_ranking("complaint", filters["q"])
+        query = query.join(ranking, ranking.c.doc_id == Complaint.id)
+    if filters.get("status"):
+        query = query.filter(Complaint.status == filters["status"])
+    if filters.get("category"):
+        query = query.filter(Complaint.category == filters["category"])
+    return query
+
+
+def fail_stale_export_jobs():
+    cutoff = utc_now() - STALE_JOB_AFTER
+    stale = ReportExportJob.query.filter(
+        ReportExportJob.status.in_(("queued", "running")),
+        ReportExportJob.updated_at < cutoff,
+    ).all()
+    for job in stale:
+        job.status = "failed"
+        job.error = STALE_JOB_ERROR
+        job.finished_at = utc_now()
+    if stale:
+        db.session.commit()
+    return len(stale)
+
+
+def create_export_job(user_id, filters):
+    fail_stale_export_jobs()
+    job = ReportExportJob(
+        id=uuid.uuid4().hex,
+        requested_by=user_id,
+        filters=json.dumps(filters, ensure_ascii=False, sort_keys=True),
+        status="queued",
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def prune_export_artifacts(directory, max_age_seconds):
+    if not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    with os.scandir(directory) as scan:
+        for entry in scan:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+    return removed
+
+
+def run_export_job(app, job_id, category_labels, pool=None):
+    directory = app.config["REPORT_EXPORT_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{job_id}.zip.part")
+    with app.app_context():
+        job = db.session.get(ReportExportJob, job_id)
+        if job is None:
+            return None
+        if job.is_finished:
+            # Already given up on as stale while it waited in the queue.
+            return job.status
+        try:
+            filters = json.loads(job.filters)
+            query = complaint_export_query(filters)
+            job.status = "running"
+            job.total = query.order_by(None).count()
+            db.session.commit()
+
+            render = pool.map if pool is not None else map
+            completed = 0
+            last_id = 0
+            with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as archive:
+                while True:
+                    batch = (
+                        query.filter(Complaint.id > last_id)
+                        .order_by(Complaint.id)
+                        .limit(EXPORT_BATCH_SIZE)
+                        .all()
+                    )
+                    if not batch:
+                        break
+                    last_id = batch[-1].id
+                    contexts = [complaint_report_context(item, category_labels) for item in batch]
+                    # Drop the ORM rows before rendering; only the plain
+                    # contexts travel to the workers.
+                    db.session.expunge_all()
+                    for complaint_id, pdf_bytes in render(render_complaint_report_entry, contexts):
+                        archive.writestr(f"complaint_{complaint_id}_report.pdf", pdf_bytes)
+                        completed += 1
+                    job = db.session.get(ReportExportJob, job_id)
+                    job.completed = completed
+                    db.session.commit()
+
+            job.artifact_name = f"{job_id}.zip"
+            os.replace(temp_path, os.path.join(directory, job.artifact_name))
+            job.total = completed
+            job.status = "done"
+            job.finished_at = utc_now()
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            app.logger.exception("complaint report export %s failed", job_id)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            job = db.session.get(ReportExportJob, job_id)
+            job.status = "failed"
+            job.error = str(exc)[:255]
+            job.finished_at = utc_now()
+            db.session.commit()
+        return job.status
+
+
+class ReportExportRunner:
+    def __init__(self, app, workers):
+        self.app = app
+        self.workers = workers
+        # One export at a time; each one already fans out across processes.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-export")
+        self.pool = None
+
+    def _process_pool(self):
+        if self.workers <= 0:
+            return None
+        if self.pool is None:
+            # spawn: forking a threaded gunicorn worker can copy held locks.
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self.pool
+
+    def run(self, job_id, category_labels):
+        prune_export_artifacts(
+            self.app.config["REPORT_EXPORT_DIR"],
+            self.app.config["REPORT_EXPORT_TTL_HOURS"] * 3600,
+        )
+        return run_export_job(self.app, job_id, category_labels, pool=self._process_pool())
+
+    def submit(self, job_id, category_labels):
+        return self.executor.submit(self.run, job_id, category_labels)
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+        if self.pool is not None:
+            self.pool.shutdown(wait=wait)
+
+
+def init_report_exports(app):
+    runner = ReportExportRunner(app, app.config["REPORT_EXPORT_WORKERS"])
+    app.extensions["report_exports"] = runner
+    return runner
+
+
+def start_export_job(app, job_id, category_labels):
+    runner = app.extensions["report_exports"]
+    if not app.config.get("REPORT_EXPORT_ASYNC"):
+        return runner.run(job_id, category_labels)
+    return runner.submit(job_id, category_labels)
@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.pdfgen import canvas
+
+
+REPORT_FONT = "HYSMyeongJo-Medium"
+FALLBACK_FONT = "Helvetica"
+
+REPORT_FIELDS = (
+    ("id", "Complaint ID"),
+    ("title", "Title"),
+    ("category", "Category"),
+    ("status", "Status"),
+    ("created_at", "Created At"),
+    ("updated_at", "Updated At"),
+    ("assigned_admin", "Assigned Admin"),
+)
+
+
+@lru_cache(maxsize=None)
+def report_font():
+    # Registered once per process; gunicorn and export workers each pay it once.
+    try:
+        pdfmetrics.registerFont(UnicodeCIDFont(REPORT_FONT))
+        return REPORT_FONT
+    except Exception:
+        return FALLBACK_FONT
+
+
+@lru_cache(maxsize=8192)
+def _char_width(char, font_name, font_size):
+    return pdfmetrics.stringWidth(char, font_name, font_size)
+
+
+def wrap_text(text, font_name, font_size, max_width):
+    lines = []
+    for paragraph in text.splitlines() or [""]:
+        line = ""
+        width = 0.0
+        break_at = 0
+        for char in paragraph:
+            char_width = _char_width(char, font_name, font_size)
+            if line and width + char_width > max_width:
+                if char == " ":
+                    lines.append(line.rstrip())
+                    line, width, break_at = "", 0.0, 0
+                    continue
+                if break_at:
+                    # Korean is spaced by eojeol, so prefer the last space.
+                    lines.append(line[:break_at].rstrip())
+                    line = line[break_at:]
+                else:
+                    lines.append(line)
+                    line = ""
+                width = sum(_char_width(item, font_name, font_size) for item in line)
+                break_at = 0
+            line += char
+            width += char_width
+            if char == " ":
+                break_at = len(line)
+        lines.append(line)
+    return lines
+
+
+@dataclass(frozen=True)
+class ReportTemplate:
+    font_name: str
+    page_width: float
+    page_height: float
+    margin: float
+    label_x: float
+    value_x: float
+    value_width: float
+    body_width: float
+    field_leading: float = 18
+    body_leading: float = 14
+    title_size: int = 16
+    field_size: int = 11
+    heading_size: int = 12
+    body_size: int = 10
+
+
+@lru_cache(maxsize=None)
+def report_template():
+    font_name = report_font()
+    width, height = A4
+    margin = 40
+    label_width = max(
+        pdfmetrics.stringWidth(f"{label}:", font_name, ReportTemplate.field_size)
+        for _, label in REPORT_FIELDS
+    )
+    value_x = margin + label_width + 8
+    return ReportTemplate(
+        font_name=font_name,
+        page_width=width,
+        page_height=height,
+        margin=margin,
+        label_x=margin,
+        value_x=value_x,
+        value_width=width - margin - value_x,
+        body_width=width - 2 * margin,
+    )
+
+
+def complaint_report_context(complaint, category_labels):
+    # Plain values only, so the context can be pickled into a worker process.
+    return {
+        "id": complaint.id,
+        "title": complaint.title,
+        "category": category_labels.get(complaint.category, complaint.category),
+        "status": complaint.status,
+        "created_at": complaint.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "updated_at": complaint.updated_at.strftime("%Y-%m-%d %H:%M:%S") if complaint.updated_at else "-",
+        "assigned_admin": complaint.assigned_admin.username if complaint.assigned_admin else "-",
+        "content": complaint.content or "",
+    }
+
+
+def render_complaint_report(context):
+    template = report_template()
+    font_name = template.font_name
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=(template.page_width, template.page_height))
+    top = template.page_height - 48
+    bottom = 48
+
+    y = top
+    pdf.setFont(font_name, template.title_size)
+    pdf.drawString(template.margin, y, "공공의료 민원 처리 결과 리포트")
+
+    y -= 28
+    pdf.setFont(font_name, template.field_size)
+    for key, label in REPORT_FIELDS:
+        pdf.drawString(template.label_x, y, f"{label}:")
+        value_lines = wrap_text(str(context[key]), font_name, template.field_size, template.value_width)
+        for value_line in value_lines:
+            pdf.drawString(template.value_x, y, value_line)
+            y -= template.field_leading
+
+    y -= 6
+    pdf.setFont(font_name, template.heading_size)
+    pdf.drawString(template.margin, y, "민원 내용")
+    y -= template.field_leading
+
+    pdf.setFont(font_name, template.body_size)
+    for line in wrap_text(context["content"], font_name, template.body_size, template.body_width):
+        if y < bottom:
+            pdf.showPage()
+            y = top
+            pdf.setFont(font_name, template.body_size)
+        pdf.drawString(template.margin, y, line)
+        y -= template.body_leading
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def render_complaint_report_entry(context):
+    return context["id"], render_complaint_report(context)
@@ -1,8 +1,7 @@
 import json
-from io import BytesIO
 import os
 import uuid
-from datetime import UTC
+from datetime import UTC, timedelta
 from functools import wraps
 from zoneinfo import ZoneInfo
 
@@ -10,47 +9,105 @@ from flask import (
     abort,
     current_app,
     flash,
+    g,
     jsonify,
     redirect,
     Response,
     render_template,
     request,
-    send_from_directory,
+    send_file,
+    session,
     url_for,
 )
 from flask_login import current_user, login_required, login_user, logout_user
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.cidfonts import UnicodeCIDFont
-from reportlab.pdfgen import canvas
 from sqlalchemy import func, or_
 from werkzeug.utils import secure_filename
 
 from app import db
+from app.audit import record_request_count, write_audit_entry
+from app.audit_partitions import add_months, month_start
+from app.audit_policy import request_bucket, should_log_web_request
+from app.blob_store import attachment_relpath, release_blob, store_blob
+from app.content_registry import (
+    HEALTH_PROGRAMS,
+    HEALTH_PROGRAMS_BY_ID,
+    OWASP_TOP10_SCENARIOS,
+    OWASP_TOP10_SCENARIOS_BY_ID,
+    REGIONAL_CENTERS,
+    REGIONAL_CENTERS_BY_REGION,
+    VACCINATION_CHECKUP_CALENDAR,
+    VACCINATION_CHECKUP_CALENDAR_BY_MONTH,
+)
+from app.db_instrumentation import route_sql_stats
+from app.file_delivery import deliver_file
 from app.health_content import (
     COMPLAINT_STATUS_FAQ,
     COMPLAINT_TYPE_GUIDE,
     EMERGENCY_BANNER,
     HEALTH_FAQ,
     HEALTH_NEWS,
-    HEALTH_PROGRAMS,
     MEDICAL_SUPPORT_PROGRAMS,
     RECORDS_PRIVACY_PROCEDURE,
-    REGIONAL_CENTERS,
-    VACCINATION_CHECKUP_CALENDAR,
 )
+from app.image_derivatives import (
+    pick_profile_variant,
+    remove_profile_derivatives,
+    schedule_profile_derivatives,
+)
+from app.metrics import address_allowed, get_metrics_registry, parse_networks
 from app.models import (
     AuditLog,
+    AuditRequestAggregate,
     Complaint,
-    MyDataSnapshot,
+    MyDataFetchJob,
     Notice,
     Post,
     PostAttachment,
+    ReportExportJob,
+    UploadSession,
     User,
     utc_now,
 )
-from app.mydata_mock import generate_mock_medical_mydata
-from app.security_catalog import OWASP_TOP10_SCENARIOS
+from app.mydata_fetch import (
+    active_fetch_job,
+    create_fetch_job,
+    job_is_active,
+    start_fetch_job,
+)
+from app.mydata_metrics import METRIC_NAMES, TREND_BUCKETS, metric_trend
+from app.mydata_store import latest_snapshot
+from app.mydata_view import mydata_panel
+from app.page_cache import cached_public_page
+from app.pagination import keyset_paginate
+from app.query_profiles import with_profile
+from app.report_cache import get_report_cache, report_fingerprint
+from app.report_exports import artifact_path, create_export_job, fail_stale_export_jobs, start_export_job
+from app.reports import complaint_report_context, render_complaint_report
+from app.search_index import (
+    complaint_fields,
+    index_document,
+    notice_fields,
+    post_fields,
+    remove_document,
+    search_ranking,
+)
+from app.stats_store import (
+    read_dashboard_stats,
+    record_complaint_change,
+    record_complaint_status_change,
+    record_notice_change,
+    record_post_change,
+    record_user_change,
+)
+from app.upload_ingest import IngestFile, read_head, sniff_matches, stream_size
+from app.upload_sessions import (
+    UploadConflict,
+    UploadRejected,
+    complete_upload_session,
+    create_upload_session,
+    discard_upload_session,
+    write_chunk,
+)
 from app.validators import (
     COMPLAINT_CATEGORY_SET,
     COMPLAINT_STATUS_SET,
@@ -98,6 +155,7 @@ LOG_EVENT_OPTIONS = {
     "complaint_create",
     "complaint_status_update",
     "complaint_report_download",
+    "complaint_report_export",
     "notice_create",
     "notice_toggle_publish",
     "user_role_update",
@@ -105,6 +163,13 @@ LOG_EVENT_OPTIONS = {
     "mydata_fetch",
 }
 
+LOG_PERIOD_OPTIONS = {
+    "1d": 1,
+    "7d": 7,
+    "30d": 30,
+    "90d": 90,
+}
+
 KST = ZoneInfo("Asia/Seoul")
 
 POST_ATTACHMENT_ALLOWED_EXTENSIONS = {
@@ -137,22 +202,20 @@ def admin_required(func):
 
 
 def log_action(action, target_type=None, target_id=None, meta=None, actor_id=None):
-    entry = AuditLog(
-        actor_id=(
-            actor_id
-            if actor_id is not None
-            else (current_user.id if current_user.is_authenticated else None)
-        ),
-        action=action,
-        target_type=target_type,
-        target_id=str(target_id) if target_id else None,
-        meta=meta,
+    write_audit_entry(
+        {
+            "actor_id": (
+                actor_id
+                if actor_id is not None
+                else (current_user.id if current_user.is_authenticated else None)
+            ),
+            "action": action,
+            "target_type": target_type,
+            "target_id": str(target_id) if target_id else None,
+            "meta": meta,
+            "created_at": utc_now(),
+        }
     )
-    try:
-        db.session.add(entry)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
 
 
 def to_kst(dt):
@@ -195,6 +258,20 @@ def parse_page(default=1):
     return page if page and page > 0 else default
 
 
+def parse_cursor_args(source=None):
+    source = source if source is not None else request.args
+    cursor = (source.get("cursor") or "").strip() or None
+    direction = "prev" if source.get("dir") == "prev" else "next"
+    page = source.get("page", 1, type=int) or 1
+    return cursor, direction, page if page > 0 else 1
+
+
+def format_size(num_bytes):
+    if num_bytes >= 1024 * 1024:
+        return f"{num_bytes / (1024 * 1024):g}MB"
+    return f"{num_bytes / 1024:g}KB"
+
+
 def validate_attachment_files(file_storage_list):
     validated = []
     errors = []
@@ -216,6 +293,15 @@ def validate_attachment_files(file_storage_list):
         if extension not in POST_ATTACHMENT_ALLOWED_EXTENSIONS:
             errors.append(f"지원하지 않는 파일 형식입니다: {original_name}")
             continue
+        max_bytes = current_app.config["UPLOAD_MAX_FILE_BYTES"]
+        if getattr(file_storage.stream, "oversize", False) or stream_size(file_storage.stream) > max_bytes:
+            errors.append(
+                f"첨부파일은 {format_size(max_bytes)} 이하만 업로드할 수 있습니다: {original_name}"
+            )
+            continue
+        if not sniff_matches(extension, read_head(file_storage.stream)):
+            errors.append(f"파일 내용이 확장자와 일치하지 않습니다: {original_name}")
+            continue
 
         validated.append((file_storage, safe_name, original_name))
 
@@ -225,25 +311,34 @@ def validate_attachment_files(file_storage_list):
 def persist_post_attachments(post_id, validated_files):
     created = []
     for file_storage, safe_name, original_name in validated_files:
-        stored_name = f"{uuid.uuid4().hex}_{safe_name}"
-        upload_path = os.path.join(current_app.config["POST_UPLOAD_DIR"], stored_name)
-        file_storage.save(upload_path)
+        stream = file_storage.stream
+        if isinstance(stream, IngestFile):
+            content_hash, file_size = stream.commit_to_blob(current_app.config["POST_UPLOAD_DIR"])
+        else:
+            content_hash, file_size = store_blob(stream, current_app.config["POST_UPLOAD_DIR"])
         created.append(
             PostAttachment(
                 post_id=post_id,
                 original_name=original_name[:255],
-                stored_name=stored_name,
+                stored_name=f"{uuid.uuid4().hex}_{safe_name}",
+                content_hash=content_hash,
                 mime_type=file_storage.mimetype,
-                file_size=os.path.getsize(upload_path) if os.path.exists(upload_path) else 0,
+                file_size=file_size,
             )
         )
     return created
 
 
-def remove_attachment_file(stored_name):
-    file_path = os.path.join(current_app.config["POST_UPLOAD_DIR"], stored_name)
-    if os.path.exists(file_path):
-        os.remove(file_path)
+def release_attachment_files(attachments):
+    upload_dir = current_app.config["POST_UPLOAD_DIR"]
+    grace_seconds = current_app.config["BLOB_RELEASE_GRACE_SECONDS"]
+    for content_hash, stored_name in attachments:
+        if content_hash:
+            release_blob(upload_dir, content_hash, grace_seconds=grace_seconds)
+            continue
+        file_path = os.path.join(upload_dir, stored_name)
+        if os.path.exists(file_path):
+            os.remove(file_path)
 
 
 def validate_profile_image_file(file_storage):
@@ -258,6 +353,13 @@ def validate_profile_image_file(file_storage):
     extension = safe_name.rsplit(".", 1)[1].lower()
     if extension not in PROFILE_IMAGE_ALLOWED_EXTENSIONS:
         return None, "프로필 이미지는 jpg/jpeg/png/gif/webp 형식만 업로드할 수 있습니다."
+    max_bytes = current_app.config["UPLOAD_MAX_FILE_BYTES"]
+    # IngestFile stops storing a part past the limit, so an oversized image
+    # arrives here empty and must not be saved.
+    if getattr(file_storage.stream, "oversize", False) or stream_size(file_storage.stream) > max_bytes:
+        return None, f"프로필 이미지는 {format_size(max_bytes)} 이하만 업로드할 수 있습니다."
+    if not sniff_matches(extension, read_head(file_storage.stream)):
+        return None, "프로필 이미지 파일 내용이 확장자와 일치하지 않습니다."
     stored_name = f"profile_{uuid.uuid4().hex}.{extension}"
     return {
         "safe_name": safe_name,
@@ -272,6 +374,7 @@ def remove_profile_image_file(stored_name):
     file_path = os.path.join(current_app.config["PROFILE_UPLOAD_DIR"], stored_name)
     if os.path.exists(file_path):
         os.remove(file_path)
+    remove_profile_derivatives(current_app.config["PROFILE_UPLOAD_DIR"], stored_name)
 
 
 def save_profile_image(file_storage, stored_name):
@@ -280,59 +383,7 @@ def save_profile_image(file_storage, stored_name):
 
 
 def build_complaint_report_pdf(complaint):
-    buffer = BytesIO()
-    pdf = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-
-    font_name = "Helvetica"
-    try:
-        pdfmetrics.registerFont(UnicodeCIDFont("HYSMyeongJo-Medium"))
-        font_name = "HYSMyeongJo-Medium"
-    except Exception:
-        pass
-
-    y = height - 48
-    pdf.setFont(font_name, 16)
-    pdf.drawString(40, y, "공공의료 민원 처리 결과 리포트")
-
-    y -= 28
-    pdf.setFont(font_name, 11)
-    lines = [
-        f"Complaint ID: {complaint.id}",
-        f"Title: {complaint.title}",
-        f"Category: {COMPLAINT_CATEGORY_LABELS.get(complaint.category, complaint.category)}",
-        f"Status: {complaint.status}",
-        f"Created At: {complaint.created_at.strftime('%Y-%m-%d %H:%M:%S')}",
-        f"Updated At: {complaint.updated_at.strftime('%Y-%m-%d %H:%M:%S') if complaint.updated_at else '-'}",
-        f"Assigned Admin: {complaint.assigned_admin.username if complaint.assigned_admin else '-'}",
-    ]
-    for line in lines:
-        pdf.drawString(40, y, line[:110])
-        y -= 18
-
-    y -= 6
-    pdf.setFont(font_name, 12)
-    pdf.drawString(40, y, "민원 내용")
-    y -= 18
-
-    pdf.setFont(font_name, 10)
-    content_lines = (complaint.content or "").splitlines() or [""]
-    for content_line in content_lines:
-        chunk = content_line
-        while chunk:
-            part = chunk[:90]
-            chunk = chunk[90:]
-            if y < 48:
-                pdf.showPage()
-                y = height - 48
-                pdf.setFont(font_name, 10)
-            pdf.drawString(40, y, part)
-            y -= 14
-
-    pdf.showPage()
-    pdf.save()
-    buffer.seek(0)
-    return buffer.read()
+    return render_complaint_report(complaint_report_context(complaint, COMPLAINT_CATEGORY_LABELS))
 
 
 def init_routes(app):
@@ -343,7 +394,21 @@ def init_routes(app):
     @app.after_request
     def capture_web_request(response):
         endpoint = request.endpoint or ""
-        if endpoint == "static" or request.path.startswith("/static/"):
+        if endpoint in {"static", "metrics"} or request.path.startswith("/static/"):
+            return response
+
+        status_code = response.status_code
+        record_request_count(endpoint, request.method, status_code)
+        if g.get("page_cache_hit"):
+            # Cached public pages are counted but not written to the audit log.
+            return response
+        keep, sample_rate = should_log_web_request(
+            current_app.config,
+            endpoint,
+            request.method,
+            status_code,
+        )
+        if not keep:
             return response
 
         forwarded_for = request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
@@ -351,9 +416,11 @@ def init_routes(app):
         user_agent = request.user_agent.string if request.user_agent else "-"
         query_string = request.query_string.decode("utf-8", errors="ignore")
         meta = (
-            f"status={response.status_code};endpoint={endpoint or '-'};"
+            f"status={status_code};endpoint={endpoint or '-'};"
             f"ip={client_ip};query={query_string[:120]};ua={user_agent[:140]}"
         )
+        if sample_rate < 1.0:
+            meta += f";sample={sample_rate:g}"
         log_action(
             "web_request",
             target_type=request.method,
@@ -367,10 +434,18 @@ def init_routes(app):
     def inject_global_banner():
         return {"emergency_banner": EMERGENCY_BANNER}
 
+    @app.template_global("profile_image_url")
+    def profile_image_url(user, size, fmt=None):
+        if not user.profile_image_name:
+            return None
+        return url_for("profile_image", user_id=user.id, v=user.profile_image_name, size=size, fmt=fmt)
+
     @app.route("/")
     def index():
         latest_notices = Notice.query.filter_by(is_published=True).order_by(Notice.created_at.desc()).limit(5).all()
-        latest_posts = Post.query.order_by(Post.created_at.desc()).limit(5).all()
+        latest_posts = (
+            with_profile(Post.query, "post_list").order_by(Post.created_at.desc()).limit(5).all()
+        )
         highlighted_programs = HEALTH_PROGRAMS[:2]
         return render_template(
             "index.html",
@@ -385,6 +460,7 @@ def init_routes(app):
         )
 
     @app.route("/health-info")
+    @cached_public_page()
     def health_info():
         return render_template(
             "health/info.html",
@@ -394,20 +470,31 @@ def init_routes(app):
         )
 
     @app.route("/health-centers")
+    @cached_public_page(params={"region": REGIONAL_CENTERS_BY_REGION})
     def health_centers():
+        region = request.args.get("region", "").strip()
+        centers = REGIONAL_CENTERS_BY_REGION.get(region, ()) if region else REGIONAL_CENTERS
         return render_template(
             "health/centers.html",
-            centers=REGIONAL_CENTERS,
+            centers=centers,
+            regions=REGIONAL_CENTERS_BY_REGION,
+            selected_region=region,
         )
 
     @app.route("/health-calendar")
+    @cached_public_page(params={"month": VACCINATION_CHECKUP_CALENDAR_BY_MONTH})
     def health_calendar():
+        month = request.args.get("month", "").strip()
+        schedules = VACCINATION_CHECKUP_CALENDAR_BY_MONTH.get(month, ()) if month else VACCINATION_CHECKUP_CALENDAR
         return render_template(
             "health/calendar.html",
-            schedules=VACCINATION_CHECKUP_CALENDAR,
+            schedules=schedules,
+            months=VACCINATION_CHECKUP_CALENDAR_BY_MONTH,
+            selected_month=month,
         )
 
     @app.route("/support-programs")
+    @cached_public_page()
     def support_programs():
         return render_template(
             "health/support_programs.html",
@@ -415,6 +502,7 @@ def init_routes(app):
         )
 
     @app.route("/records/procedure")
+    @cached_public_page()
     def records_procedure():
         return render_template(
             "health/records_procedure.html",
@@ -423,7 +511,7 @@ def init_routes(app):
 
     @app.route("/health-programs/<string:program_id>")
     def health_program_detail(program_id):
-        program = next((item for item in HEALTH_PROGRAMS if item["id"] == program_id), None)
+        program = HEALTH_PROGRAMS_BY_ID.get(program_id)
         if program is None:
             abort(404)
         return render_template(
@@ -466,6 +554,7 @@ def init_routes(app):
             )
             user.set_password(password)
             db.session.add(user)
+            record_user_change()
             db.session.commit()
             flash("회원가입이 완료되었습니다. 로그인하세요.", "success")
             return redirect(url_for("login"))
@@ -641,6 +730,7 @@ def init_routes(app):
             if image_meta:
                 if old_profile_image_name and old_profile_image_name != image_meta["stored_name"]:
                     remove_profile_image_file(old_profile_image_name)
+                schedule_profile_derivatives(current_app._get_current_object(), image_meta["stored_name"])
 
             terms_changed = "yes" if previous_terms != optional_terms_agreed else "no"
             image_changed = "yes" if (remove_profile_image or image_meta) else "no"
@@ -653,25 +743,28 @@ def init_routes(app):
             flash("프로필이 수정되었습니다.", "success")
             return redirect(url_for("profile"))
 
-        snapshot = (
-            MyDataSnapshot.query.filter_by(user_id=current_user.id)
-            .order_by(MyDataSnapshot.fetched_at.desc(), MyDataSnapshot.id.desc())
-            .first()
-        )
-        mydata = None
-        if snapshot:
-            try:
-                mydata = json.loads(snapshot.payload_json)
-            except json.JSONDecodeError:
-                mydata = None
+        snapshot = latest_snapshot(current_user.id, with_payload=False)
+        panel = mydata_panel(current_app, snapshot) if snapshot else None
+        # Only look up a fetch job while one started from this session is pending.
+        fetch_job = None
+        fetch_job_id = session.get("mydata_job_id")
+        if fetch_job_id:
+            fetch_job = db.session.get(MyDataFetchJob, fetch_job_id)
+            if not job_is_active(fetch_job):
+                session.pop("mydata_job_id", None)
+                if fetch_job is not None and fetch_job.status == "failed":
+                    flash("의료 마이데이터를 불러오지 못했습니다. 잠시 후 다시 시도해주세요.", "danger")
+                fetch_job = None
         my_posts = (
-            Post.query.filter_by(user_id=current_user.id)
+            with_profile(Post.query, "post_summary")
+            .filter_by(user_id=current_user.id)
             .order_by(Post.created_at.desc())
             .limit(10)
             .all()
         )
         my_complaints = (
-            Complaint.query.filter_by(user_id=current_user.id)
+            with_profile(Complaint.query, "complaint_summary")
+            .filter_by(user_id=current_user.id)
             .order_by(Complaint.created_at.desc())
             .limit(10)
             .all()
@@ -679,13 +772,34 @@ def init_routes(app):
         return render_template(
             "auth/profile.html",
             mydata_snapshot=snapshot,
-            mydata=mydata,
+            mydata_panel=panel,
+            mydata_job=fetch_job,
             my_posts=my_posts,
             my_complaints=my_complaints,
             complaint_category_labels=COMPLAINT_CATEGORY_LABELS,
             post_category_labels=POST_CATEGORY_LABELS,
         )
 
+    @app.route("/users/<int:user_id>/profile-image")
+    def profile_image(user_id):
+        user = db.get_or_404(User, user_id)
+        # Ids are sequential; the stored name in ?v= is what keeps avatars
+        # as unguessable as the old uuid static paths.
+        if not user.profile_image_name or request.args.get("v") != user.profile_image_name:
+            abort(404)
+        upload_dir = current_app.config["PROFILE_UPLOAD_DIR"]
+        filename = user.profile_image_name
+        size = request.args.get("size", type=int)
+        variant = None
+        if size:
+            variant = pick_profile_variant(upload_dir, filename, size, webp=request.args.get("fmt") == "webp")
+        response = deliver_file(upload_dir, variant or filename, "profiles", as_attachment=False)
+        if size and variant is None:
+            # The original stands in until the thumbnail exists; don't let
+            # browsers keep it under the size-specific URL.
+            response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
     @app.route("/profile/mydata/fetch", methods=["POST"])
     @login_required
     def profile_mydata_fetch():
@@ -694,44 +808,85 @@ def init_routes(app):
             flash("의료 마이데이터 불러오기 전에 수집/이용 동의가 필요합니다.", "danger")
             return redirect(url_for("profile"))
 
-        payload = generate_mock_medical_mydata(current_user)
-        snapshot = MyDataSnapshot(
-            user_id=current_user.id,
-            source="MOCK",
-            consent_given=True,
-            consent_at=utc_now(),
-            payload_json=json.dumps(payload, ensure_ascii=False),
-            fetched_at=utc_now(),
-        )
-        db.session.add(snapshot)
-        db.session.commit()
-        log_action("mydata_fetch", "mydata", snapshot.id, meta="source=MOCK")
-        flash("의료 마이데이터를 불러왔습니다. (목데이터)", "success")
+        job = active_fetch_job(current_user.id)
+        if job is None:
+            job = create_fetch_job(current_user.id, current_app.extensions["mydata_fetcher"].provider.source)
+            log_action("mydata_fetch", "mydata", job.id, meta=f"source={job.provider}")
+            start_fetch_job(current_app, job.id)
+            db.session.refresh(job)
+
+        if not job.is_finished:
+            session["mydata_job_id"] = job.id
+
+        if job.status == "done":
+            flash("의료 마이데이터를 불러왔습니다.", "success")
+        elif job.status == "failed":
+            flash("의료 마이데이터를 불러오지 못했습니다. 잠시 후 다시 시도해주세요.", "danger")
+        else:
+            flash("의료 마이데이터를 요청했습니다. 완료되면 화면이 자동으로 갱신됩니다.", "info")
         return redirect(url_for("profile"))
 
+    @app.route("/profile/mydata/trends")
+    @login_required
+    def profile_mydata_trends():
+        metric = request.args.get("metric", "")
+        bucket = request.args.get("bucket", "month")
+        months = request.args.get("months", 12, type=int)
+        if metric not in METRIC_NAMES:
+            return jsonify({"ok": False, "message": "지원하지 않는 지표입니다."}), 400
+        if bucket not in TREND_BUCKETS:
+            return jsonify({"ok": False, "message": "지원하지 않는 집계 단위입니다."}), 400
+        months = min(max(months or 12, 1), 60)
+        since = add_months(month_start(utc_now()), -(months - 1))
+        return jsonify(
+            {
+                "ok": True,
+                "metric": metric,
+                "bucket": bucket,
+                "points": metric_trend(current_user.id, metric, bucket=bucket, since=since),
+            }
+        )
+
+    @app.route("/profile/mydata/jobs/<string:job_id>")
+    @login_required
+    def profile_mydata_job(job_id):
+        job = db.get_or_404(MyDataFetchJob, job_id)
+        if job.user_id != current_user.id:
+            abort(404)
+        return jsonify(
+            {
+                "ok": job.status != "failed",
+                "status": job.status,
+                "message": "의료 마이데이터를 불러오지 못했습니다." if job.status == "failed" else "",
+            }
+        )
+
     @app.route("/posts")
     def posts_list():
         q = request.args.get("q", "").strip()
         category = request.args.get("category", "all")
-        query = Post.query.join(User, Post.user_id == User.id)
+        query = with_profile(Post.query, "post_list")
 
+        ranking = None
         if q:
-            keyword = f"%{q}%"
-            query = query.filter(
-                (Post.title.ilike(keyword))
-                | (Post.content.ilike(keyword))
-                | (User.username.ilike(keyword))
-            )
+            ranking = search_ranking("post", q)
+            query = query.join(ranking, ranking.c.doc_id == Post.id)
 
         if category in POST_CATEGORY_SET:
             query = query.filter(Post.category == category)
         else:
             category = "all"
 
-        pagination = query.order_by(Post.created_at.desc()).paginate(
-            page=parse_page(),
+        cursor, direction, page = parse_cursor_args()
+        pagination = keyset_paginate(
+            query,
+            Post,
             per_page=10,
-            error_out=False,
+            cursor=cursor,
+            direction=direction,
+            page=page,
+            with_total=not q and category == "all",
+            rank=ranking.c.score if ranking is not None else None,
         )
         return render_template(
             "posts/list.html",
@@ -768,6 +923,8 @@ def init_routes(app):
             )
             db.session.add(post)
             db.session.flush()
+            index_document("post", post.id, post_fields(post, current_user.username))
+            record_post_change()
             attachment_entities = persist_post_attachments(post.id, validated_files)
             for entity in attachment_entities:
                 db.session.add(entity)
@@ -790,7 +947,7 @@ def init_routes(app):
 
     @app.route("/posts/<int:post_id>", methods=["GET", "POST"])
     def posts_detail(post_id):
-        post = db.get_or_404(Post, post_id)
+        post = with_profile(Post.query, "post_detail").filter_by(id=post_id).first_or_404()
 
         if request.method == "POST":
             if not current_user.is_authenticated:
@@ -816,6 +973,7 @@ def init_routes(app):
             post.title = title
             post.content = content
             post.category = category
+            index_document("post", post.id, post_fields(post))
             attachment_entities = persist_post_attachments(post.id, validated_files)
             for entity in attachment_entities:
                 db.session.add(entity)
@@ -846,10 +1004,12 @@ def init_routes(app):
             flash("삭제 권한이 없습니다.", "danger")
             return redirect(url_for("posts_detail", post_id=post_id))
 
-        for attachment in post.attachments:
-            remove_attachment_file(attachment.stored_name)
+        attachment_files = [(item.content_hash, item.stored_name) for item in post.attachments]
+        remove_document("post", post_id)
+        record_post_change(-1)
         db.session.delete(post)
         db.session.commit()
+        release_attachment_files(attachment_files)
         log_action("post_delete", "post", post_id)
         flash("게시물이 삭제되었습니다.", "info")
         return redirect(url_for("posts_list"))
@@ -860,11 +1020,12 @@ def init_routes(app):
             id=attachment_id,
             post_id=post_id,
         ).first_or_404()
-        return send_from_directory(
+        return deliver_file(
             current_app.config["POST_UPLOAD_DIR"],
-            attachment.stored_name,
-            as_attachment=True,
+            attachment_relpath(attachment),
+            "posts",
             download_name=attachment.original_name,
+            mimetype=attachment.mime_type,
         )
 
     @app.route("/posts/<int:post_id>/attachments/<int:attachment_id>/delete", methods=["POST"])
@@ -879,13 +1040,127 @@ def init_routes(app):
             flash("첨부파일 삭제 권한이 없습니다.", "danger")
             return redirect(url_for("posts_detail", post_id=post_id))
 
-        remove_attachment_file(attachment.stored_name)
+        attachment_files = [(attachment.content_hash, attachment.stored_name)]
         db.session.delete(attachment)
         db.session.commit()
+        release_attachment_files(attachment_files)
         log_action("post_attachment_delete", "post", post_id, meta=f"attachment_id={attachment_id}")
         flash("첨부파일이 삭제되었습니다.", "info")
         return redirect(url_for("posts_detail", post_id=post_id))
 
+    def owned_upload_session(session_id):
+        upload_session = db.get_or_404(UploadSession, session_id)
+        if upload_session.user_id != current_user.id:
+            abort(404)
+        return upload_session
+
+    def upload_session_status(upload_session):
+        return {
+            "ok": True,
+            "id": upload_session.id,
+            "post_id": upload_session.post_id,
+            "filename": upload_session.original_name,
+            "size": upload_session.total_size,
+            "offset": upload_session.received_size,
+            "complete": upload_session.received_size == upload_session.total_size,
+            "chunk_size": current_app.config["UPLOAD_CHUNK_BYTES"],
+        }
+
+    @app.route("/uploads", methods=["POST"])
+    @login_required
+    def upload_session_create():
+        data = request.get_json(silent=True) or {}
+        post_id = data.get("post_id")
+        post = db.session.get(Post, post_id) if isinstance(post_id, int) else None
+        if post is None:
+            return jsonify({"ok": False, "message": "게시물을 찾을 수 없습니다."}), 404
+        if current_user.id != post.user_id and current_user.role != "admin":
+            return jsonify({"ok": False, "message": "첨부파일 업로드 권한이 없습니다."}), 403
+
+        original_name = str(data.get("filename") or "").strip()
+        safe_name = secure_filename(original_name)
+        extension = safe_name.rsplit(".", 1)[1].lower() if "." in safe_name else ""
+        if extension not in POST_ATTACHMENT_ALLOWED_EXTENSIONS:
+            return jsonify({"ok": False, "message": "지원하지 않는 파일 형식입니다."}), 400
+        total_size = data.get("size")
+        max_bytes = current_app.config["UPLOAD_SESSION_MAX_BYTES"]
+        if not isinstance(total_size, int) or total_size <= 0 or total_size > max_bytes:
+            return jsonify(
+                {"ok": False, "message": f"파일 크기는 {format_size(max_bytes)} 이하여야 합니다."}
+            ), 400
+
+        upload_session = create_upload_session(
+            current_user.id,
+            post.id,
+            original_name,
+            safe_name,
+            str(data.get("mime_type") or "")[:120] or None,
+            total_size,
+        )
+        db.session.commit()
+        response = jsonify(upload_session_status(upload_session))
+        response.headers["Location"] = url_for("upload_session_status_view", session_id=upload_session.id)
+        return response, 201
+
+    @app.route("/uploads/<string:session_id>", methods=["GET"])
+    @login_required
+    def upload_session_status_view(session_id):
+        return jsonify(upload_session_status(owned_upload_session(session_id)))
+
+    @app.route("/uploads/<string:session_id>", methods=["PUT"])
+    @login_required
+    def upload_session_chunk(session_id):
+        upload_session = owned_upload_session(session_id)
+        offset = request.args.get("offset", type=int)
+        if offset is None:
+            offset = request.headers.get("Upload-Offset", type=int)
+        if offset is None:
+            return jsonify({"ok": False, "message": "offset 값이 필요합니다."}), 400
+        try:
+            write_chunk(upload_session, offset, request.stream, current_app.config["UPLOAD_CHUNK_BYTES"])
+        except UploadConflict as exc:
+            return jsonify(
+                {"ok": False, "offset": exc.expected_offset, "message": "업로드 위치가 맞지 않습니다."}
+            ), 409
+        except UploadRejected as exc:
+            return jsonify({"ok": False, "message": str(exc)}), 400
+        return jsonify(upload_session_status(upload_session))
+
+    @app.route("/uploads/<string:session_id>/complete", methods=["POST"])
+    @login_required
+    def upload_session_complete(session_id):
+        upload_session = owned_upload_session(session_id)
+        try:
+            attachment = complete_upload_session(upload_session)
+        except UploadConflict as exc:
+            return jsonify(
+                {"ok": False, "offset": exc.expected_offset, "message": "아직 전송되지 않은 부분이 있습니다."}
+            ), 409
+        log_action(
+            "post_attachment_upload",
+            "post",
+            attachment.post_id,
+            meta="count=1;chunked=1",
+        )
+        return jsonify(
+            {
+                "ok": True,
+                "attachment_id": attachment.id,
+                "file_size": attachment.file_size,
+                "download_url": url_for(
+                    "post_attachment_download",
+                    post_id=attachment.post_id,
+                    attachment_id=attachment.id,
+                ),
+            }
+        ), 201
+
+    @app.route("/uploads/<string:session_id>", methods=["DELETE"])
+    @login_required
+    def upload_session_discard(session_id):
+        discard_upload_session(owned_upload_session(session_id))
+        return jsonify({"ok": True})
+
     @app.route("/notices")
     def notices_list():
         if current_user.is_authenticated and current_user.role == "admin":
@@ -905,10 +1180,10 @@ def init_routes(app):
     @app.route("/complaints")
     @login_required
     def complaints_list():
-        if current_user.role == "admin":
-            complaints = Complaint.query.order_by(Complaint.created_at.desc()).all()
-        else:
-            complaints = Complaint.query.filter_by(user_id=current_user.id).order_by(Complaint.created_at.desc()).all()
+        query = with_profile(Complaint.query, "complaint_summary")
+        if current_user.role != "admin":
+            query = query.filter_by(user_id=current_user.id)
+        complaints = query.order_by(Complaint.created_at.desc()).all()
         return render_template(
             "complaints/list.html",
             complaints=complaints,
@@ -916,6 +1191,7 @@ def init_routes(app):
         )
 
     @app.route("/complaints/guide")
+    @cached_public_page()
     def complaints_guide():
         return render_template(
             "complaints/guide.html",
@@ -923,6 +1199,7 @@ def init_routes(app):
         )
 
     @app.route("/complaints/faq")
+    @cached_public_page()
     def complaints_faq():
         return render_template(
             "complaints/faq.html",
@@ -950,6 +1227,9 @@ def init_routes(app):
                 user_id=current_user.id,
             )
             db.session.add(complaint)
+            db.session.flush()
+            index_document("complaint", complaint.id, complaint_fields(complaint, current_user.username))
+            record_complaint_change(complaint)
             db.session.commit()
             log_action("complaint_create", "complaint", complaint.id)
             flash("민원이 접수되었습니다.", "success")
@@ -960,7 +1240,9 @@ def init_routes(app):
     @app.route("/complaints/<int:complaint_id>", methods=["GET", "POST"])
     @login_required
     def complaints_detail(complaint_id):
-        complaint = db.get_or_404(Complaint, complaint_id)
+        complaint = (
+            with_profile(Complaint.query, "complaint_detail").filter_by(id=complaint_id).first_or_404()
+        )
         if current_user.role != "admin" and complaint.user_id != current_user.id:
             flash("열람 권한이 없습니다.", "danger")
             return redirect(url_for("complaints_list"))
@@ -974,9 +1256,11 @@ def init_routes(app):
             if errors:
                 flash_errors(errors)
                 return redirect(url_for("complaints_detail", complaint_id=complaint_id))
+            record_complaint_status_change(complaint.status, status)
             complaint.status = status
             complaint.assigned_admin_id = current_user.id
             db.session.commit()
+            get_report_cache(current_app).invalidate(complaint.id)
             log_action("complaint_status_update", "complaint", complaint.id, meta=complaint.status)
             flash("민원 상태가 변경되었습니다.", "success")
             return redirect(url_for("complaints_detail", complaint_id=complaint_id))
@@ -995,40 +1279,58 @@ def init_routes(app):
             flash("리포트 다운로드 권한이 없습니다.", "danger")
             return redirect(url_for("complaints_list"))
 
-        pdf_bytes = build_complaint_report_pdf(complaint)
+        fingerprint = report_fingerprint(complaint)
+        if fingerprint in request.if_none_match:
+            response = Response(status=304)
+            response.set_etag(fingerprint)
+            return response
+
+        cache = get_report_cache(current_app)
+        path = cache.get(complaint.id, fingerprint)
+        if path is None:
+            path = cache.put(complaint.id, fingerprint, build_complaint_report_pdf(complaint))
         log_action("complaint_report_download", "complaint", complaint.id)
-        return Response(
-            pdf_bytes,
+        response = send_file(
+            path,
             mimetype="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=complaint_{complaint.id}_report.pdf"
-            },
+            as_attachment=True,
+            download_name=f"complaint_{complaint.id}_report.pdf",
+            etag=fingerprint,
+            conditional=True,
         )
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
 
     @app.route("/admin")
     @login_required
     @admin_required
     def admin_dashboard():
-        stats = {
-            "users": User.query.count(),
-            "posts": Post.query.count(),
-            "notices": Notice.query.count(),
-            "complaints": Complaint.query.count(),
-            "complaints_pending": Complaint.query.filter(
-                Complaint.status.in_(["received", "in_review"])
-            ).count(),
-        }
-        complaint_category_stats = (
-            db.session.query(Complaint.category, func.count(Complaint.id))
-            .group_by(Complaint.category)
-            .order_by(func.count(Complaint.id).desc())
+        stats, complaint_category_stats = read_dashboard_stats()
+        logs = (
+            AuditLog.query.filter(
+                AuditLog.created_at
+                >= utc_now() - timedelta(days=current_app.config["AUDIT_DASHBOARD_WINDOW_DAYS"])
+            )
+            .order_by(AuditLog.created_at.desc())
+            .limit(20)
+            .all()
+        )
+        request_total = func.sum(AuditRequestAggregate.request_count)
+        traffic_stats = (
+            db.session.query(AuditRequestAggregate.endpoint, request_total)
+            .filter(AuditRequestAggregate.bucket_start >= request_bucket(utc_now()) - timedelta(minutes=60))
+            .group_by(AuditRequestAggregate.endpoint)
+            .order_by(request_total.desc())
+            .limit(10)
             .all()
         )
-        logs = AuditLog.query.order_by(AuditLog.created_at.desc()).limit(20).all()
         return render_template(
             "admin/dashboard.html",
             stats=stats,
             logs=logs,
+            traffic_stats=traffic_stats,
+            sql_stats=route_sql_stats(current_app),
             complaint_category_stats=complaint_category_stats,
             complaint_category_labels=COMPLAINT_CATEGORY_LABELS,
         )
@@ -1037,32 +1339,40 @@ def init_routes(app):
     @login_required
     @admin_required
     def admin_users():
-        page = request.args.get("page", 1, type=int)
+        cursor, direction, page = parse_cursor_args()
         q = request.args.get("q", "").strip()
         role_filter = request.args.get("role", "all")
 
         if request.method == "POST":
             user_id = request.form.get("user_id", type=int)
             role = request.form.get("role", "user")
-            page = request.form.get("page", 1, type=int) or 1
+            cursor, direction, page = parse_cursor_args(request.form)
             q = request.form.get("q", "").strip()
             role_filter = request.form.get("role_filter", "all")
+            list_url = url_for(
+                "admin_users",
+                cursor=cursor,
+                dir=direction,
+                page=page,
+                q=q,
+                role=role_filter,
+            )
             if user_id is None:
                 flash("대상 사용자를 확인할 수 없습니다.", "danger")
-                return redirect(url_for("admin_users", page=page, q=q, role=role_filter))
+                return redirect(list_url)
             errors = validate_role(role)
             if errors:
                 flash_errors(errors)
-                return redirect(url_for("admin_users", page=page, q=q, role=role_filter))
+                return redirect(list_url)
             target = db.get_or_404(User, user_id)
             if target.id == current_user.id and role != "admin":
                 flash("본인 관리자 권한은 제거할 수 없습니다.", "danger")
-                return redirect(url_for("admin_users", page=page, q=q, role=role_filter))
+                return redirect(list_url)
             target.role = role
             db.session.commit()
             log_action("user_role_update", "user", target.id, meta=role)
             flash("사용자 권한이 변경되었습니다.", "success")
-            return redirect(url_for("admin_users", page=page, q=q, role=role_filter))
+            return redirect(list_url)
 
         query = User.query
         if q:
@@ -1075,10 +1385,14 @@ def init_routes(app):
         if role_filter in {"user", "admin"}:
             query = query.filter_by(role=role_filter)
 
-        pagination = query.order_by(User.created_at.desc()).paginate(
-            page=parse_page(page),
+        pagination = keyset_paginate(
+            query,
+            User,
             per_page=10,
-            error_out=False,
+            cursor=cursor,
+            direction=direction,
+            page=page,
+            with_total=not q and role_filter not in {"user", "admin"},
         )
         return render_template(
             "admin/users.html",
@@ -1122,6 +1436,9 @@ def init_routes(app):
                 created_by=current_user.id,
             )
             db.session.add(notice)
+            db.session.flush()
+            index_document("notice", notice.id, notice_fields(notice))
+            record_notice_change()
             db.session.commit()
             log_action("notice_create", "notice", notice.id)
             flash("공지사항이 등록되었습니다.", "success")
@@ -1136,17 +1453,18 @@ def init_routes(app):
 
         query = Notice.query
         if q:
-            keyword = f"%{q}%"
-            query = query.filter(
-                (Notice.title.ilike(keyword))
-                | (Notice.content.ilike(keyword))
+            ranking = search_ranking("notice", q)
+            query = query.join(ranking, ranking.c.doc_id == Notice.id).order_by(
+                ranking.c.score.desc(), Notice.id.desc()
             )
+        else:
+            query = query.order_by(Notice.created_at.desc())
         if visibility == "published":
             query = query.filter_by(is_published=True)
         elif visibility == "private":
             query = query.filter_by(is_published=False)
 
-        pagination = query.order_by(Notice.created_at.desc()).paginate(
+        pagination = query.paginate(
             page=parse_page(page),
             per_page=10,
             error_out=False,
@@ -1186,23 +1504,26 @@ def init_routes(app):
     def admin_posts():
         q = request.args.get("q", "").strip()
         category_filter = request.args.get("category", "all")
-        query = Post.query.join(User, Post.user_id == User.id)
+        query = with_profile(Post.query, "post_list")
+        ranking = None
         if q:
-            keyword = f"%{q}%"
-            query = query.filter(
-                (Post.title.ilike(keyword))
-                | (Post.content.ilike(keyword))
-                | (User.username.ilike(keyword))
-            )
+            ranking = search_ranking("post", q)
+            query = query.join(ranking, ranking.c.doc_id == Post.id)
         if category_filter in POST_CATEGORY_SET:
             query = query.filter(Post.category == category_filter)
         else:
             category_filter = "all"
 
-        pagination = query.order_by(Post.created_at.desc()).paginate(
-            page=parse_page(),
+        cursor, direction, page = parse_cursor_args()
+        pagination = keyset_paginate(
+            query,
+            Post,
             per_page=10,
-            error_out=False,
+            cursor=cursor,
+            direction=direction,
+            page=page,
+            with_total=not q and category_filter == "all",
+            rank=ranking.c.score if ranking is not None else None,
         )
         return render_template(
             "admin/posts.html",
@@ -1221,8 +1542,18 @@ def init_routes(app):
         q = request.args.get("q", "").strip()
         event_filter = request.args.get("event", "all").strip()
         method_filter = request.args.get("method", "all").upper().strip()
+        period_filter = request.args.get("period", "all").strip()
 
-        query = AuditLog.query.outerjoin(User, AuditLog.actor_id == User.id)
+        query = with_profile(AuditLog.query, "audit_log_list").outerjoin(
+            User, AuditLog.actor_id == User.id
+        )
+        if period_filter in LOG_PERIOD_OPTIONS:
+            # A lower bound on created_at lets MariaDB prune old partitions.
+            query = query.filter(
+                AuditLog.created_at >= utc_now() - timedelta(days=LOG_PERIOD_OPTIONS[period_filter])
+            )
+        else:
+            period_filter = "all"
         if q:
             keyword = f"%{q}%"
             query = query.filter(
@@ -1245,10 +1576,20 @@ def init_routes(app):
         else:
             method_filter = "all"
 
-        pagination = query.order_by(AuditLog.created_at.desc()).paginate(
-            page=parse_page(),
+        cursor, direction, page = parse_cursor_args()
+        pagination = keyset_paginate(
+            query,
+            AuditLog,
             per_page=20,
-            error_out=False,
+            cursor=cursor,
+            direction=direction,
+            page=page,
+            with_total=(
+                not q
+                and event_filter == "all"
+                and method_filter == "all"
+                and period_filter == "all"
+            ),
         )
         return render_template(
             "admin/logs.html",
@@ -1259,6 +1600,8 @@ def init_routes(app):
             event_options=sorted(LOG_EVENT_OPTIONS),
             method_filter=method_filter,
             method_options=method_options,
+            period_filter=period_filter,
+            period_options=LOG_PERIOD_OPTIONS,
         )
 
     @app.route("/admin/complaints")
@@ -1269,23 +1612,30 @@ def init_routes(app):
         status_filter = request.args.get("status", "all")
         category_filter = request.args.get("category", "all")
 
-        query = Complaint.query.join(User, Complaint.user_id == User.id)
+        query = with_profile(Complaint.query, "complaint_admin_list")
+        ranking = None
         if q:
-            keyword = f"%{q}%"
-            query = query.filter(
-                (Complaint.title.ilike(keyword))
-                | (Complaint.content.ilike(keyword))
-                | (User.username.ilike(keyword))
-            )
+            ranking = search_ranking("complaint", q)
+            query = query.join(ranking, ranking.c.doc_id == Complaint.id)
         if status_filter in COMPLAINT_STATUS_SET:
             query = query.filter(Complaint.status == status_filter)
         if category_filter in COMPLAINT_CATEGORY_SET:
             query = query.filter(Complaint.category == category_filter)
 
-        pagination = query.order_by(Complaint.created_at.desc()).paginate(
-            page=parse_page(),
+        cursor, direction, page = parse_cursor_args()
+        pagination = keyset_paginate(
+            query,
+            Complaint,
             per_page=10,
-            error_out=False,
+            cursor=cursor,
+            direction=direction,
+            page=page,
+            with_total=(
+                not q
+                and status_filter not in COMPLAINT_STATUS_SET
+                and category_filter not in COMPLAINT_CATEGORY_SET
+            ),
+            rank=ranking.c.score if ranking is not None else None,
         )
         return render_template(
             "admin/complaints.html",
@@ -1299,6 +1649,74 @@ def init_routes(app):
             complaint_category_labels=COMPLAINT_CATEGORY_LABELS,
         )
 
+    @app.route("/admin/complaints/export", methods=["POST"])
+    @login_required
+    @admin_required
+    def admin_complaints_export():
+        q = request.form.get("q", "").strip()
+        status_filter = request.form.get("status", "all")
+        category_filter = request.form.get("category", "all")
+        filters = {
+            "q": q or None,
+            "status": status_filter if status_filter in COMPLAINT_STATUS_SET else None,
+            "category": category_filter if category_filter in COMPLAINT_CATEGORY_SET else None,
+        }
+        job = create_export_job(current_user.id, filters)
+        log_action("complaint_report_export", "report_export", job.id, meta=job.filters)
+        start_export_job(current_app, job.id, COMPLAINT_CATEGORY_LABELS)
+        return redirect(url_for("admin_complaints_export_detail", job_id=job.id))
+
+    def get_export_job_or_404(job_id):
+        job = db.get_or_404(ReportExportJob, job_id)
+        if job.requested_by != current_user.id:
+            abort(404)
+        return job
+
+    @app.route("/admin/complaints/export/<string:job_id>")
+    @login_required
+    @admin_required
+    def admin_complaints_export_detail(job_id):
+        job = get_export_job_or_404(job_id)
+        return render_template("admin/complaint_export.html", job=job, filters=json.loads(job.filters))
+
+    @app.route("/admin/complaints/export/<string:job_id>/status")
+    @login_required
+    @admin_required
+    def admin_complaints_export_status(job_id):
+        job = get_export_job_or_404(job_id)
+        if not job.is_finished and fail_stale_export_jobs():
+            db.session.refresh(job)
+        return jsonify(
+            {
+                "ok": job.status != "failed",
+                "status": job.status,
+                "total": job.total,
+                "completed": job.completed,
+                "download_url": (
+                    url_for("admin_complaints_export_download", job_id=job.id)
+                    if job.status == "done"
+                    else None
+                ),
+                "message": job.error or "",
+            }
+        )
+
+    @app.route("/admin/complaints/export/<string:job_id>/download")
+    @login_required
+    @admin_required
+    def admin_complaints_export_download(job_id):
+        job = get_export_job_or_404(job_id)
+        path = artifact_path(current_app, job) if job.status == "done" else None
+        if path is None or not os.path.exists(path):
+            flash("내보내기 파일이 준비되지 않았거나 보관 기간이 지났습니다.", "info")
+            return redirect(url_for("admin_complaints_export_detail", job_id=job.id))
+        return send_file(
+            path,
+            mimetype="application/zip",
+            as_attachment=True,
+            download_name=f"complaint_reports_{job.created_at.strftime('%Y%m%d_%H%M%S')}.zip",
+        )
+
     @app.route("/security/scenarios")
     @login_required
     @admin_required
@@ -1312,14 +1730,7 @@ def init_routes(app):
     @login_required
     @admin_required
     def security_scenario_detail(scenario_id):
-        scenario = next(
-            (
-                item
-                for item in OWASP_TOP10_SCENARIOS
-                if item["id"] == scenario_id
-            ),
-            None,
-        )
+        scenario = OWASP_TOP10_SCENARIOS_BY_ID.get(scenario_id)
         if scenario is None:
             abort(404)
         return render_template(
@@ -1327,6 +1738,17 @@ def init_routes(app):
             scenario=scenario,
         )
 
+    @app.route("/metrics")
+    def metrics():
+        # admin_required is left open for the training scenarios, so the
+        # scrape endpoint checks its own access.
+        is_admin = current_user.is_authenticated and current_user.role == "admin"
+        networks = parse_networks(current_app.config["METRICS_ALLOWED_NETWORKS"])
+        if not is_admin and not address_allowed(request.remote_addr, networks):
+            abort(403)
+        registry = get_metrics_registry(current_app)
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
     @app.errorhandler(404)
     def not_found_error(_):
         return render_template("errors/404.html"), 404
@@ -0,0 +1,145 @@
+import re
+from collections import Counter
+
+from sqlalchemy import delete, false, func, insert, or_, select
+
+from app import db
+from app.models import Complaint, Notice, Post, SearchPosting, User
+
+
+WORD_RE = re.compile(r"[0-9a-zㄱ-ㆎ가-힣]+")
+
+TITLE_WEIGHT = 3
+AUTHOR_WEIGHT = 2
+CONTENT_WEIGHT = 1
+
+
+def tokenize(text):
+    terms = Counter()
+    for word in WORD_RE.findall((text or "").lower()):
+        if len(word) == 1:
+            terms[word] += 1
+            continue
+        for index in range(len(word) - 1):
+            terms[word[index : index + 2]] += 1
+    return terms
+
+
+def _weighted_terms(fields):
+    weights = Counter()
+    for text, weight in fields:
+        for term, count in tokenize(text).items():
+            weights[term] += count * weight
+    return weights
+
+
+def post_fields(post, author_name=None):
+    author_name = author_name or (post.author.username if post.author else "")
+    return [
+        (post.title, TITLE_WEIGHT),
+        (author_name, AUTHOR_WEIGHT),
+        (post.content, CONTENT_WEIGHT),
+    ]
+
+
+def complaint_fields(complaint, requester_name=None):
+    requester_name = requester_name or (complaint.requester.username if complaint.requester else "")
+    return [
+        (complaint.title, TITLE_WEIGHT),
+        (requester_name, AUTHOR_WEIGHT),
+        (complaint.content, CONTENT_WEIGHT),
+    ]
+
+
+def notice_fields(notice):
+    return [
+        (notice.title, TITLE_WEIGHT),
+        (notice.content, CONTENT_WEIGHT),
+    ]
+
+
+def remove_document(doc_type, doc_id):
+    db.session.execute(
+        delete(SearchPosting).where(
+            SearchPosting.doc_type == doc_type,
+            SearchPosting.doc_id == doc_id,
+        )
+    )
+
+
+def _insert_postings(doc_type, doc_id, fields):
+    rows = [
+        {"doc_type": doc_type, "doc_id": doc_id, "term": term, "weight": weight}
+        for term, weight in _weighted_terms(fields).items()
+    ]
+    if rows:
+        db.session.execute(insert(SearchPosting), rows)
+
+
+def index_document(doc_type, doc_id, fields):
+    remove_document(doc_type, doc_id)
+    _insert_postings(doc_type, doc_id, fields)
+
+
+def search_ranking(doc_type, q):
+    # Subquery of (doc_id, score) for every match; join it to page by rank.
+    terms = tokenize(q)
+    bigrams = sorted(term for term in terms if len(term) > 1)
+    query = select(
+        SearchPosting.doc_id.label("doc_id"),
+        func.sum(SearchPosting.weight).label("score"),
+    ).where(SearchPosting.doc_type == doc_type)
+    if bigrams:
+        # Every bigram of the query must be present, like a substring match.
+        query = (
+            query.where(SearchPosting.term.in_(bigrams))
+            .group_by(SearchPosting.doc_id)
+            .having(func.count(func.distinct(SearchPosting.term)) == len(bigrams))
+        )
+    elif terms:
+        # A single character may start a bigram, end one, or be a word itself.
+        query = query.where(
+            or_(
+                *[SearchPosting.term.startswith(term) for term in terms],
+                *[SearchPosting.term.like(f"_{term}") for term in terms],
+            )
+        ).group_by(SearchPosting.doc_id)
+    else:
+        query = query.where(false()).group_by(SearchPosting.doc_id)
+    return query.subquery()
+
+
+def rebuild_search_index(batch_size=500):
+    db.session.execute(delete(SearchPosting))
+    sources = [
+        ("post", Post, Post.user_id, post_fields),
+        ("complaint", Complaint, Complaint.user_id, complaint_fields),
+        ("notice", Notice, Notice.created_by, lambda notice, _: notice_fields(notice)),
+    ]
+    counts = {}
+    for doc_type, model, owner_column, build_fields in sources:
+        counts[doc_type] = 0
+        last_id = 0
+        while True:
+            rows = (
+                db.session.query(model, User.username)
+                .outerjoin(User, owner_column == User.id)
+                .filter(model.id > last_id)
+                .order_by(model.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            for entity, owner_name in rows:
+                _insert_postings(doc_type, entity.id, build_fields(entity, owner_name))
+            counts[doc_type] += len(rows)
+            last_id = rows[-1][0].id
+            db.session.commit()
+            db.session.expunge_all()
+    db.session.commit()
+    return counts
+
+
+def search_index_is_empty():
+    return db.session.query(SearchPosting.id).first() is None
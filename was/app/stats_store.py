@@ -0,0 +1,207 @@
+import os
+import threading
+import time
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import Complaint, Notice, Post, StatCounter, User
+
+
+PENDING_STATUSES = ("received", "in_review")
+RECONCILE_MARKER = "meta:reconciled_at"
+
+
+def complaint_status_key(status):
+    return f"complaints:status:{status}"
+
+
+def complaint_category_key(category):
+    return f"complaints:category:{category}"
+
+
+def adjust_counters(deltas):
+    # Runs inside the caller's transaction so the counters commit (or roll
+    # back) together with the row change they describe.
+    for name, amount in deltas.items():
+        if not amount:
+            continue
+        increment = (
+            update(StatCounter)
+            .where(StatCounter.name == name)
+            .values(value=StatCounter.value + amount)
+        )
+        if db.session.execute(increment).rowcount:
+            continue
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(StatCounter).values(name=name, value=amount))
+        except IntegrityError:
+            db.session.execute(increment)
+
+
+def record_user_change(sign=1):
+    adjust_counters({"users": sign})
+
+
+def record_post_change(sign=1):
+    adjust_counters({"posts": sign})
+
+
+def record_notice_change(sign=1):
+    adjust_counters({"notices": sign})
+
+
+def record_complaint_change(complaint, sign=1):
+    adjust_counters(
+        {
+            "complaints": sign,
+            complaint_status_key(complaint.status or "received"): sign,
+            complaint_category_key(complaint.category): sign,
+        }
+    )
+
+
+def record_complaint_status_change(old_status, new_status):
+    if old_status == new_status:
+        return
+    adjust_counters({complaint_status_key(old_status): -1, complaint_status_key(new_status): 1})
+
+
+def _true_counts():
+    counts = {
+        "users": db.session.execute(select(func.count(User.id))).scalar_one(),
+        "posts": db.session.execute(select(func.count(Post.id))).scalar_one(),
+        "notices": db.session.execute(select(func.count(Notice.id))).scalar_one(),
+        "complaints": db.session.execute(select(func.count(Complaint.id))).scalar_one(),
+    }
+    for status, count in db.session.execute(
+        select(Complaint.status, func.count(Complaint.id)).group_by(Complaint.status)
+    ):
+        counts[complaint_status_key(status)] = count
+    for category, count in db.session.execute(
+        select(Complaint.category, func.count(Complaint.id)).group_by(Complaint.category)
+    ):
+        counts[complaint_category_key(category)] = count
+    return counts
+
+
+def reconcile_stats():
+    counts = _true_counts()
+    existing = {
+        row.name: row
+        for row in StatCounter.query.filter(StatCounter.name != RECONCILE_MARKER).all()
+    }
+    drift = {}
+    for name, row in existing.items():
+        expected = counts.get(name, 0)
+        if row.value != expected:
+            drift[name] = expected - row.value
+            row.value = expected
+    for name, expected in counts.items():
+        if name not in existing:
+            drift[name] = expected
+            db.session.add(StatCounter(name=name, value=expected))
+    db.session.commit()
+    return drift
+
+
+def claim_reconcile(interval):
+    # Workers share the marker row; only the one whose UPDATE lands runs
+    # the full count for this interval.
+    now = int(time.time())
+    claimed = db.session.execute(
+        update(StatCounter)
+        .where(StatCounter.name == RECONCILE_MARKER, StatCounter.value <= now - interval)
+        .values(value=now)
+    ).rowcount
+    if not claimed:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(StatCounter).values(name=RECONCILE_MARKER, value=now))
+            claimed = 1
+        except IntegrityError:
+            claimed = 0
+    db.session.commit()
+    return bool(claimed)
+
+
+def read_dashboard_stats():
+    values = {name: value for name, value in db.session.execute(select(StatCounter.name, StatCounter.value))}
+    if "users" not in values:
+        reconcile_stats()
+        values = {name: value for name, value in db.session.execute(select(StatCounter.name, StatCounter.value))}
+
+    stats = {
+        "users": values.get("users", 0),
+        "posts": values.get("posts", 0),
+        "notices": values.get("notices", 0),
+        "complaints": values.get("complaints", 0),
+        "complaints_pending": sum(
+            values.get(complaint_status_key(status), 0) for status in PENDING_STATUSES
+        ),
+    }
+    prefix = complaint_category_key("")
+    category_stats = sorted(
+        (
+            (name[len(prefix):], value)
+            for name, value in values.items()
+            if name.startswith(prefix) and value > 0
+        ),
+        key=lambda item: (-item[1], item[0]),
+    )
+    return stats, category_stats
+
+
+class StatsReconciler:
+    def __init__(self, app, interval):
+        self.app = app
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == pid and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="stats-reconciler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    if claim_reconcile(self.interval):
+                        drift = reconcile_stats()
+                        if drift:
+                            self.app.logger.warning("stat counters reconciled: %s", drift)
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception("stat counter reconcile failed")
+                finally:
+                    db.session.remove()
+
+    def shutdown(self):
+        self._stop.set()
+
+
+def init_stats_reconciler(app):
+    interval = app.config.get("STATS_RECONCILE_INTERVAL") or 0
+    if interval <= 0:
+        return None
+    reconciler = StatsReconciler(app, interval)
+    app.extensions["stats_reconciler"] = reconciler
+
+    @app.before_request
+    def start_stats_reconciler():
+        reconciler.ensure_started()
+
+    return reconciler
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import tempfile
+
+from flask import Request, current_app
+
+from app.blob_store import blob_path, place_blob
+
+
+SNIFF_BYTES = 16
+
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_MAGIC = b"PK\x03\x04"
+
+MAGIC_SIGNATURES = {
+    "jpg": (b"\xff\xd8\xff",),
+    "jpeg": (b"\xff\xd8\xff",),
+    "png": (b"\x89PNG\r\n\x1a\n",),
+    "gif": (b"GIF87a", b"GIF89a"),
+    "pdf": (b"%PDF-",),
+    "doc": (OLE2_MAGIC,),
+    "xls": (OLE2_MAGIC,),
+    "hwp": (OLE2_MAGIC,),
+    "docx": (ZIP_MAGIC,),
+    "xlsx": (ZIP_MAGIC,),
+    "hwpx": (ZIP_MAGIC,),
+}
+
+
+def sniff_matches(extension, head):
+    if extension == "txt":
+        return b"\x00" not in head
+    if extension == "webp":
+        return head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+    signatures = MAGIC_SIGNATURES.get(extension)
+    if signatures is None:
+        return False
+    return any(head.startswith(signature) for signature in signatures)
+
+
+class IngestFile:
+    # Werkzeug's multipart parser writes each part straight into this file,
+    # chunk by chunk, so the checksum and size are known once parsing ends.
+    def __init__(self, temp_dir, max_bytes=None):
+        os.makedirs(temp_dir, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=temp_dir, prefix="upload-")
+        self._file = os.fdopen(fd, "w+b")
+        self._digest = hashlib.sha256()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.head = b""
+        self.oversize = False
+        self.committed = False
+
+    def write(self, data):
+        if self.oversize:
+            return len(data)
+        if self.max_bytes and self.size + len(data) > self.max_bytes:
+            # Keep consuming the part so the rest of the form still parses,
+            # but stop storing it.
+            self.oversize = True
+            self._file.truncate(0)
+            return len(data)
+        if len(self.head) < SNIFF_BYTES:
+            self.head += data[: SNIFF_BYTES - len(self.head)]
+        self._digest.update(data)
+        self._file.write(data)
+        self.size += len(data)
+        return len(data)
+
+    @property
+    def content_hash(self):
+        return self._digest.hexdigest()
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def commit_to_blob(self, upload_dir):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        place_blob(self.path, blob_path(upload_dir, self.content_hash))
+        self.committed = True
+        return self.content_hash, self.size
+
+    def close(self):
+        self._file.close()
+        if not self.committed and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class IngestRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        config = current_app.config
+        temp_dir = config.get("UPLOAD_TEMP_DIR") or os.path.join(config["POST_UPLOAD_DIR"], ".tmp")
+        return IngestFile(temp_dir, max_bytes=config.get("UPLOAD_MAX_FILE_BYTES"))
+
+
+def read_head(stream):
+    if isinstance(stream, IngestFile):
+        return stream.head
+    head = stream.read(SNIFF_BYTES)
+    stream.seek(0)
+    return head
+
+
+def stream_size(stream):
+    if isinstance(stream, IngestFile):
+        return stream.size
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
@@ -0,0 +1,164 @@
+import glob
+import os
+import time
+import uuid
+
+from flask import current_app
+from sqlalchemy import select, update
+
+from app import db
+from app.blob_store import CHUNK_SIZE, adopt_file
+from app.models import PostAttachment, UploadSession, utc_now
+from app.upload_ingest import SNIFF_BYTES, sniff_matches
+
+
+class UploadConflict(Exception):
+    def __init__(self, expected_offset):
+        super().__init__(f"expected offset {expected_offset}")
+        self.expected_offset = expected_offset
+
+
+class UploadRejected(Exception):
+    pass
+
+
+def sessions_dir():
+    config = current_app.config
+    temp_dir = config.get("UPLOAD_TEMP_DIR") or os.path.join(config["POST_UPLOAD_DIR"], ".tmp")
+    return os.path.join(temp_dir, "sessions")
+
+
+def part_path(session_id):
+    return os.path.join(sessions_dir(), f"{session_id}.part")
+
+
+def create_upload_session(user_id, post_id, original_name, safe_name, mime_type, total_size):
+    upload_session = UploadSession(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        post_id=post_id,
+        original_name=original_name[:255],
+        safe_name=safe_name,
+        mime_type=mime_type,
+        total_size=total_size,
+        received_size=0,
+    )
+    db.session.add(upload_session)
+    os.makedirs(sessions_dir(), exist_ok=True)
+    open(part_path(upload_session.id), "wb").close()
+    return upload_session
+
+
+def write_chunk(upload_session, offset, stream, chunk_limit):
+    if offset != upload_session.received_size:
+        raise UploadConflict(upload_session.received_size)
+
+    path = part_path(upload_session.id)
+    extension = upload_session.safe_name.rsplit(".", 1)[1].lower()
+    written = 0
+    try:
+        handle = open(path, "r+b")
+    except FileNotFoundError:
+        # A concurrent complete already took the part file.
+        raise UploadConflict(upload_session.received_size) from None
+    with handle:
+        handle.seek(offset)
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if written + len(chunk) > chunk_limit or offset + written + len(chunk) > upload_session.total_size:
+                raise UploadRejected("청크 크기가 허용 범위를 벗어났습니다.")
+            if offset == 0 and written == 0 and not sniff_matches(extension, chunk[:SNIFF_BYTES]):
+                raise UploadRejected("파일 내용이 확장자와 일치하지 않습니다.")
+            handle.write(chunk)
+            written += len(chunk)
+        handle.truncate(offset + written)
+
+    # Two retries of the same chunk can race; only one may move the offset.
+    advanced = db.session.execute(
+        update(UploadSession)
+        .where(UploadSession.id == upload_session.id, UploadSession.received_size == offset)
+        .values(received_size=offset + written, updated_at=utc_now())
+    ).rowcount
+    db.session.commit()
+    db.session.refresh(upload_session)
+    if not advanced:
+        raise UploadConflict(upload_session.received_size)
+    return upload_session.received_size
+
+
+def complete_upload_session(upload_session):
+    # Lock the row so a second complete waits, then sees the row gone.
+    locked = db.session.execute(
+        select(UploadSession)
+        .where(UploadSession.id == upload_session.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    if locked is None:
+        raise UploadConflict(upload_session.total_size)
+    if locked.received_size != locked.total_size:
+        raise UploadConflict(locked.received_size)
+
+    # The rename is atomic, so only one complete can take the part file even
+    # where the database does not honour FOR UPDATE.
+    path = part_path(locked.id)
+    claimed_path = f"{path}.{uuid.uuid4().hex}.complete"
+    try:
+        os.rename(path, claimed_path)
+    except FileNotFoundError:
+        db.session.rollback()
+        raise UploadConflict(locked.total_size) from None
+    actual_size = os.path.getsize(claimed_path)
+    if actual_size != locked.total_size:
+        # Racing chunk retries left the file shorter; resume from what is there.
+        os.rename(claimed_path, path)
+        locked.received_size = min(actual_size, locked.received_size)
+        locked.updated_at = utc_now()
+        db.session.commit()
+        raise UploadConflict(locked.received_size)
+
+    content_hash, file_size = adopt_file(claimed_path, current_app.config["POST_UPLOAD_DIR"])
+    attachment = PostAttachment(
+        post_id=locked.post_id,
+        original_name=locked.original_name,
+        stored_name=f"{uuid.uuid4().hex}_{locked.safe_name}",
+        content_hash=content_hash,
+        mime_type=locked.mime_type,
+        file_size=file_size,
+    )
+    db.session.add(attachment)
+    db.session.delete(locked)
+    db.session.commit()
+    return attachment
+
+
+def discard_upload_session(upload_session):
+    path = part_path(upload_session.id)
+    db.session.delete(upload_session)
+    db.session.commit()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def gc_upload_sessions(max_age, now=None):
+    cutoff = (now or utc_now()) - max_age
+    stale = UploadSession.query.filter(UploadSession.updated_at < cutoff).all()
+    stale_ids = [item.id for item in stale]
+    for upload_session in stale:
+        db.session.delete(upload_session)
+    db.session.commit()
+
+    removed_files = 0
+    live_ids = {row.id for row in db.session.query(UploadSession.id)}
+    file_cutoff = time.time() - max_age.total_seconds()
+    for path in glob.glob(os.path.join(sessions_dir(), "*.part")):
+        session_id = os.path.basename(path)[: -len(".part")]
+        if session_id in live_ids:
+            continue
+        # Part files of deleted posts have no session row left either.
+        if session_id in stale_ids or os.path.getmtime(path) < file_cutoff:
+            os.remove(path)
+            removed_files += 1
+    return len(stale_ids), removed_files
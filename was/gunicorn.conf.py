@@ -0,0 +1,20 @@
+import os
+
+bind = "0.0.0.0:8000"
+
+
+def on_starting(server):
+    metrics_dir = os.environ.get("METRICS_MULTIPROC_DIR")
+    if metrics_dir:
+        from app.metrics import clear_multiproc_dir
+
+        os.makedirs(metrics_dir, exist_ok=True)
+        clear_multiproc_dir(metrics_dir)
+
+
+def worker_exit(server, worker):
+    from app.audit import shutdown_audit_writers
+    from app.metrics import flush_metrics_registries
+
+    shutdown_audit_writers()
+    flush_metrics_registries()
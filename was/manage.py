@@ -1,9 +1,36 @@
 import os
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from types import SimpleNamespace
+
+import click
 
 from app import create_app, db
-from app.models import Complaint, MyDataSnapshot, Notice, Post, User, utc_now
+from app.audit_partitions import (
+    add_months,
+    archive_audit_partitions,
+    ensure_audit_partitions,
+    list_audit_partitions,
+    month_start,
+    uses_native_partitions,
+)
+from app.audit_policy import prune_request_counts
+from app.blob_store import migrate_legacy_attachments, prune_orphan_blobs
+from app.image_derivatives import backfill_profile_derivatives
+from app.models import Complaint, MyDataSnapshot, Notice, Post, User, encode_snapshot_payload, utc_now
+from app.mydata_batch import prewarm_snapshots
+from app.mydata_metrics import extract_metric_points, upsert_metric_points
 from app.mydata_mock import generate_mock_medical_mydata
+from app.mydata_providers import MyDataProviderError, create_mydata_provider
+from app.mydata_standin import create_standin_server
+from app.mydata_store import prune_all_snapshots, store_snapshot
+from app.query_advisor import advise_indexes
+from app.reports import render_complaint_report, report_font, report_template, wrap_text
+from app.search_index import rebuild_search_index, search_index_is_empty
+from app.stats_store import reconcile_stats
+from app.upload_sessions import gc_upload_sessions
 from sqlalchemy import inspect, text
 
 app = create_app()
@@ -14,6 +41,11 @@ def init_db_cli():
     db.create_all()
     ensure_schema_upgrades()
     ensure_default_admin()
+    if uses_native_partitions():
+        ensure_audit_partitions(utc_now())
+    if search_index_is_empty():
+        rebuild_search_index()
+    reconcile_stats()
     print("Database initialized.")
 
 
@@ -97,6 +129,321 @@ def ensure_schema_upgrades():
         if alter_statements:
             db.session.commit()
 
+    if "post_attachment" in tables:
+        attachment_columns = {col["name"] for col in inspector.get_columns("post_attachment")}
+        if "content_hash" not in attachment_columns:
+            db.session.execute(
+                text("ALTER TABLE post_attachment ADD COLUMN content_hash VARCHAR(64) NULL")
+            )
+            db.session.commit()
+
+    if "my_data_snapshot" in tables:
+        snapshot_columns = {col["name"] for col in inspector.get_columns("my_data_snapshot")}
+        if "payload_json" in snapshot_columns:
+            compress_mydata_snapshots(snapshot_columns)
+
+    ensure_model_indexes(inspector, tables)
+
+
+def ensure_model_indexes(inspector, tables):
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda item: item.name):
+            if index.name not in existing:
+                index.create(db.engine)
+                created.append(index.name)
+    return created
+
+
+def compress_mydata_snapshots(snapshot_columns, batch_size=500):
+    blob_type = "MEDIUMBLOB" if db.engine.dialect.name in ("mysql", "mariadb") else "BLOB"
+    if "payload" not in snapshot_columns:
+        db.session.execute(text(f"ALTER TABLE my_data_snapshot ADD COLUMN payload {blob_type} NULL"))
+    if "payload_hash" not in snapshot_columns:
+        db.session.execute(text("ALTER TABLE my_data_snapshot ADD COLUMN payload_hash VARCHAR(64) NULL"))
+    db.session.commit()
+
+    while True:
+        rows = db.session.execute(
+            text(
+                "SELECT id, payload_json FROM my_data_snapshot "
+                "WHERE payload IS NULL ORDER BY id LIMIT :limit"
+            ),
+            {"limit": batch_size},
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            payload, payload_hash = encode_snapshot_payload(row.payload_json)
+            db.session.execute(
+                text("UPDATE my_data_snapshot SET payload = :payload, payload_hash = :payload_hash WHERE id = :id"),
+                {"payload": payload, "payload_hash": payload_hash, "id": row.id},
+            )
+        db.session.commit()
+
+    db.session.execute(text("ALTER TABLE my_data_snapshot DROP COLUMN payload_json"))
+    db.session.commit()
+
+
+@app.cli.command("audit-partitions")
+@click.option("--months-ahead", default=3, show_default=True, type=int)
+def audit_partitions_cli(months_ahead):
+    created = ensure_audit_partitions(utc_now(), months_ahead=months_ahead)
+    for name in created:
+        print(f"created partition {name}")
+    mode = "native" if uses_native_partitions() else "logical"
+    for partition in list_audit_partitions():
+        print(
+            f"{partition['name']} [{mode}] "
+            f"{partition['start']:%Y-%m-%d} ~ {partition['end']:%Y-%m-%d} rows={partition['rows']}"
+        )
+
+
+@app.cli.command("audit-archive")
+@click.option("--retention-months", default=None, type=int)
+@click.option("--output-dir", default=None)
+@click.option("--dry-run", is_flag=True)
+def audit_archive_cli(retention_months, output_dir, dry_run):
+    retention_months = retention_months or app.config["AUDIT_RETENTION_MONTHS"]
+    output_dir = output_dir or app.config["AUDIT_ARCHIVE_DIR"]
+    cutoff = add_months(month_start(utc_now()), -retention_months)
+    results = archive_audit_partitions(cutoff, output_dir, dry_run=dry_run)
+    if not results:
+        print(f"No audit partitions older than {cutoff:%Y-%m-%d}.")
+    for name, path, rows in results:
+        if dry_run:
+            print(f"[dry-run] {name} rows={rows}")
+        else:
+            print(f"archived {name} rows={rows} -> {path}")
+
+    aggregate_cutoff = utc_now() - timedelta(days=app.config["AUDIT_DASHBOARD_WINDOW_DAYS"])
+    pruned = prune_request_counts(aggregate_cutoff, dry_run=dry_run)
+    prefix = "[dry-run] " if dry_run else ""
+    print(f"{prefix}request aggregates older than {aggregate_cutoff:%Y-%m-%d %H:%M} removed: {pruned}")
+
+
+@app.cli.command("search-reindex")
+@click.option("--batch-size", default=500, show_default=True, type=int)
+def search_reindex_cli(batch_size):
+    counts = rebuild_search_index(batch_size=batch_size)
+    print(
+        "Search index rebuilt: "
+        + ", ".join(f"{doc_type}={count}" for doc_type, count in counts.items())
+    )
+
+
+@app.cli.command("attachments-migrate")
+@click.option("--batch-size", default=200, show_default=True, type=int)
+def attachments_migrate_cli(batch_size):
+    migrated, missing = migrate_legacy_attachments(app.config["POST_UPLOAD_DIR"], batch_size=batch_size)
+    print(f"Attachments moved to content-addressed storage: {migrated} (missing files: {missing}).")
+
+
+@app.cli.command("uploads-gc")
+@click.option("--max-age-hours", default=None, type=int, help="Defaults to UPLOAD_SESSION_TTL_HOURS.")
+def uploads_gc_cli(max_age_hours):
+    hours = max_age_hours if max_age_hours is not None else app.config["UPLOAD_SESSION_TTL_HOURS"]
+    sessions, files = gc_upload_sessions(timedelta(hours=hours))
+    print(f"Stale upload sessions removed: {sessions} (part files: {files}).")
+    blobs = prune_orphan_blobs(app.config["POST_UPLOAD_DIR"], grace_seconds=app.config["BLOB_RELEASE_GRACE_SECONDS"])
+    print(f"Unreferenced attachment blobs removed: {blobs}.")
+
+
+@app.cli.command("profile-thumbnails")
+@click.option("--batch-size", default=200, show_default=True, type=int)
+@click.option("--force", is_flag=True, help="Regenerate thumbnails that already exist.")
+def profile_thumbnails_cli(batch_size, force):
+    generated, skipped, failed = backfill_profile_derivatives(app, batch_size=batch_size, force=force)
+    print(f"Profile thumbnails generated: {generated} (already present: {skipped}, failed: {failed}).")
+
+
+@app.cli.command("stats-reconcile")
+def stats_reconcile_cli():
+    drift = reconcile_stats()
+    if not drift:
+        print("Stat counters already match the tables.")
+        return
+    for name, delta in sorted(drift.items()):
+        print(f"{name}: {delta:+d}")
+    print(f"Stat counters reconciled: {len(drift)} corrected.")
+
+
+@app.cli.command("report-benchmark")
+@click.option("--count", default=50, show_default=True, type=click.IntRange(min=1))
+@click.option("--paragraphs", default=40, show_default=True, type=int)
+def report_benchmark_cli(count, paragraphs):
+    sentence = "보건소 방문 예약 후 안내받은 일정과 실제 접수 시간이 달라 재방문이 필요했습니다. "
+    context = {
+        "id": 0,
+        "title": "벤치마크용 장문 민원 " * 8,
+        "category": "일반 민원",
+        "status": "in_progress",
+        "created_at": "2024-01-01 09:00:00",
+        "updated_at": "2024-01-02 18:30:00",
+        "assigned_admin": "admin",
+        "content": "\n".join(sentence * 4 for _ in range(paragraphs)),
+    }
+
+    started = time.perf_counter()
+    report_font()
+    report_template()
+    setup_ms = (time.perf_counter() - started) * 1000
+
+    timings = []
+    size = 0
+    for _ in range(count):
+        started = time.perf_counter()
+        size = len(render_complaint_report(context))
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    template = report_template()
+    lines = wrap_text(context["content"], template.font_name, template.body_size, template.body_width)
+    print(f"font={template.font_name} one-time setup={setup_ms:.1f}ms")
+    print(
+        f"{count} renders: mean={sum(timings) / len(timings):.1f}ms "
+        f"p50={timings[len(timings) // 2]:.1f}ms p95={timings[int(len(timings) * 0.95) - 1]:.1f}ms "
+        f"max={timings[-1]:.1f}ms"
+    )
+    print(f"body lines={len(lines)} pdf bytes={size}")
+
+
+@app.cli.command("mydata-prune")
+@click.option("--keep", default=None, type=int, help="Defaults to MYDATA_SNAPSHOT_RETENTION.")
+def mydata_prune_cli(keep):
+    keep = keep if keep is not None else app.config["MYDATA_SNAPSHOT_RETENTION"]
+    if keep <= 0:
+        print("Snapshot retention is disabled; nothing pruned.")
+        return
+    removed = prune_all_snapshots(keep)
+    print(f"MyData snapshots pruned: {removed} (keeping {keep} per user).")
+
+
+@app.cli.command("mydata-prewarm")
+@click.option("--workers", default=os.cpu_count() or 1, show_default=True, type=int, help="0 generates in-process.")
+@click.option("--chunk-size", default=500, show_default=True, type=int)
+@click.option("--limit", default=None, type=int)
+@click.option("--all-users", is_flag=True, help="Include users who never consented (load tests only).")
+def mydata_prewarm_cli(workers, chunk_size, limit, all_users):
+    started = time.perf_counter()
+    totals = prewarm_snapshots(
+        workers=workers,
+        chunk_size=chunk_size,
+        consented_only=not all_users,
+        keep=app.config["MYDATA_SNAPSHOT_RETENTION"],
+        limit=limit,
+    )
+    elapsed = time.perf_counter() - started
+    rate = totals["users"] / elapsed if elapsed else 0
+    print(
+        f"MyData prewarm: users={totals['users']} inserted={totals['inserted']} "
+        f"unchanged={totals['unchanged']} in {elapsed:.1f}s ({rate:.0f} users/s)"
+    )
+
+
+@app.cli.command("mydata-standin")
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8765, show_default=True, type=int)
+@click.option("--latency-ms", default=150, show_default=True, type=int)
+@click.option("--jitter-ms", default=100, show_default=True, type=int)
+@click.option("--error-rate", default=0.0, show_default=True, type=float)
+@click.option("--verbose", is_flag=True)
+def mydata_standin_cli(host, port, latency_ms, jitter_ms, error_rate, verbose):
+    server = create_standin_server(
+        host,
+        port,
+        latency=latency_ms / 1000,
+        jitter=jitter_ms / 1000,
+        error_rate=error_rate,
+        verbose=verbose,
+    )
+    print(f"MyData stand-in listening on http://{host}:{port}/mydata (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@app.cli.command("mydata-provider-check")
+@click.option("--count", default=50, show_default=True, type=click.IntRange(min=1))
+@click.option("--concurrency", default=4, show_default=True, type=click.IntRange(min=1))
+def mydata_provider_check_cli(count, concurrency):
+    provider = create_mydata_provider(app.config)
+    user = SimpleNamespace(id=0, username="latency-probe", email="probe@example.com", full_name="측정 사용자")
+
+    def timed_fetch(_):
+        started = time.perf_counter()
+        try:
+            provider.fetch(user)
+            ok = True
+        except MyDataProviderError:
+            ok = False
+        return ok, (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed_fetch, range(count)))
+    provider.close()
+    timings = sorted(elapsed for _, elapsed in results)
+    failures = sum(1 for ok, _ in results if not ok)
+    print(f"provider={provider.source} requests={count} concurrency={concurrency} failed={failures}")
+    print(
+        f"p50={timings[len(timings) // 2]:.0f}ms p95={timings[int(len(timings) * 0.95) - 1]:.0f}ms "
+        f"max={timings[-1]:.0f}ms"
+    )
+
+
+@app.cli.command("mydata-metrics-backfill")
+@click.option("--batch-size", default=500, show_default=True, type=int)
+def mydata_metrics_backfill_cli(batch_size):
+    processed = 0
+    written = 0
+    last_id = 0
+    while True:
+        snapshots = (
+            MyDataSnapshot.query.filter(MyDataSnapshot.id > last_id)
+            .order_by(MyDataSnapshot.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not snapshots:
+            break
+        # Oldest first, so a newer snapshot's value wins for shared months.
+        for snapshot in snapshots:
+            try:
+                payload = json.loads(snapshot.payload_json)
+            except ValueError:
+                continue
+            written += upsert_metric_points(
+                {snapshot.user_id: extract_metric_points(payload, snapshot.fetched_at)}
+            )
+            processed += 1
+        last_id = snapshots[-1].id
+        db.session.commit()
+        db.session.expunge_all()
+    print(f"MyData metric points written: {written} from {processed} snapshots.")
+
+
+@app.cli.command("index-advisor")
+def index_advisor_cli():
+    report = advise_indexes()
+    for item in report:
+        flags = []
+        if item["full_scan"]:
+            flags.append("FULL SCAN")
+        if item["filesort"]:
+            flags.append("SORT")
+        print(f"[{'/'.join(flags) or 'ok'}] {item['name']}")
+        for line in item["plan"]:
+            print(f"    {line}")
+        if item["suggestion"]:
+            print(f"    suggest: {item['suggestion']};")
+    missing = sum(1 for item in report if item["suggestion"])
+    print(f"{len(report)} queries checked, {missing} missing index suggestions.")
+
 
 @app.cli.command("seed-demo")
 def seed_demo_cli():
@@ -163,21 +510,10 @@ def seed_demo_cli():
         .first()
     )
     if not existing_snapshot:
-        db.session.add(
-            MyDataSnapshot(
-                user_id=user1.id,
-                source="MOCK",
-                consent_given=True,
-                consent_at=utc_now(),
-                payload_json=json.dumps(
-                    generate_mock_medical_mydata(user1),
-                    ensure_ascii=False,
-                ),
-                fetched_at=utc_now(),
-            )
-        )
-        db.session.commit()
+        store_snapshot(user1.id, generate_mock_medical_mydata(user1))
 
+    rebuild_search_index()
+    reconcile_stats()
     print("Demo data seeded: admin, user1, user2, posts, notices, complaints, mydata.")
 
 
@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+from app import create_app, db
+from app.models import User
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    def factory(db_name="app.db", **overrides):
+        config = {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / db_name}",
+            "SECRET_KEY": "test-secret",
+            "POST_UPLOAD_DIR": str(tmp_path / "posts"),
+            "PROFILE_UPLOAD_DIR": str(tmp_path / "profiles"),
+        }
+        config.update(overrides)
+        app = create_app(config)
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+        return app
+
+    return factory
+
+
+@pytest.fixture
+def create_user():
+    def factory(username, role="user"):
+        user = User(
+            username=username,
+            email=f"{username}@example.com",
+            full_name=f"{username} name",
+            phone="010-9999-9999",
+            role=role,
+        )
+        user.set_password("pass12345")
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    return factory
+
+
+@pytest.fixture
+def login():
+    def factory(client, username, password="pass12345"):
+        return client.post(
+            "/login",
+            data={"username": username, "password": password},
+            follow_redirects=False,
+        )
+
+    return factory
+
+
+@pytest.fixture
+def post_with_attachment():
+    def factory(client, filename, data, title="첨부 게시물", follow_redirects=False):
+        return client.post(
+            "/posts/new",
+            data={
+                "title": title,
+                "content": "본문",
+                "category": "general",
+                "attachments": (io.BytesIO(data), filename),
+            },
+            content_type="multipart/form-data",
+            follow_redirects=follow_redirects,
+        )
+
+    return factory
+
+
+@pytest.fixture
+def update_profile_image():
+    def factory(client, filename, data, follow_redirects=False):
+        return client.post(
+            "/profile",
+            data={
+                "full_name": "Avatar User",
+                "phone": "010-1234-5678",
+                "email": "avatar@example.com",
+                "current_password": "pass12345",
+                "profile_image": (io.BytesIO(data), filename),
+            },
+            content_type="multipart/form-data",
+            follow_redirects=follow_redirects,
+        )
+
+    return factory
@@ -0,0 +1,134 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from app import db
+from app.audit import get_audit_writer, get_request_counter
+from app.audit_partitions import archive_audit_partitions, list_audit_partitions
+from app.audit_policy import prune_request_counts
+from app.models import AuditLog, AuditRequestAggregate
+
+
+def test_async_audit_writer_batches_rows(create_user, make_app):
+    app = make_app("audit_async.db", AUDIT_LOG_ASYNC=True, AUDIT_BATCH_SIZE=50, AUDIT_FLUSH_INTERVAL=30.0)
+
+    with app.app_context():
+        create_user("audituser")
+
+    client = app.test_client()
+    client.post("/login", data={"username": "audituser", "password": "wrong-pass"})
+    client.get("/health-info")
+
+    writer = get_audit_writer(app)
+    writer.flush()
+    stats = writer.stats()
+    assert stats["enqueued"] == 4
+    assert stats["written"] == 4
+    assert stats["dropped"] == 0
+
+    with app.app_context():
+        actions = {row.action for row in AuditLog.query.all()}
+        assert {"login_attempt", "login_failed", "web_request"} <= actions
+    writer.shutdown()
+
+
+def test_async_audit_writer_drops_when_queue_is_full(make_app):
+    app = make_app(
+        "audit_drop.db",
+        AUDIT_LOG_ASYNC=True,
+        AUDIT_QUEUE_SIZE=2,
+        AUDIT_FLUSH_INTERVAL=30.0,
+        AUDIT_BATCH_SIZE=100,
+    )
+
+    writer = get_audit_writer(app)
+    writer._ensure_started = lambda: None
+    accepted = [
+        writer.submit({"action": "web_request", "target_type": "GET", "target_id": f"/{idx}"})
+        for idx in range(5)
+    ]
+    assert accepted == [True, True, False, False, False]
+    assert writer.stats()["dropped"] == 3
+
+    writer.flush()
+    with app.app_context():
+        assert AuditLog.query.count() == 2
+
+
+def test_web_request_sampling_keeps_errors_and_writes_and_aggregates_all(make_app):
+    app = make_app("audit_sampling.db", AUDIT_WEB_SAMPLE_RATE=0.0)
+
+    client = app.test_client()
+    client.get("/health-info")
+    client.get("/health-info")
+    client.get("/health-programs/not-exists")
+    client.post("/login", data={"username": "nobody", "password": "x"})
+    # Counts are buffered by the writer even though audit rows are inline.
+    assert get_audit_writer(app) is None
+    get_request_counter(app).flush()
+
+    with app.app_context():
+        web_rows = AuditLog.query.filter_by(action="web_request").all()
+        assert sorted((row.target_type, row.target_id) for row in web_rows) == [
+            ("GET", "/health-programs/not-exists"),
+            ("POST", "/login"),
+        ]
+        counts = {
+            (row.endpoint, row.method, row.status_code): row.request_count
+            for row in AuditRequestAggregate.query.all()
+        }
+        assert counts[("health_info", "GET", 200)] == 2
+        assert counts[("health_program_detail", "GET", 404)] == 1
+        assert counts[("login", "POST", 200)] == 1
+
+
+def test_archive_old_audit_partitions_to_jsonl(tmp_path, make_app):
+    archive_dir = tmp_path / "archive"
+    app = make_app("audit_archive.db")
+
+    with app.app_context():
+        for created_at in [
+            datetime(2025, 1, 3, 9, 0, 0),
+            datetime(2025, 1, 28, 9, 0, 0),
+            datetime(2025, 2, 14, 9, 0, 0),
+            datetime(2025, 6, 1, 9, 0, 0),
+        ]:
+            db.session.add(AuditLog(action="login", target_type="user", created_at=created_at))
+        db.session.commit()
+
+        partitions = list_audit_partitions()
+        assert [item["name"] for item in partitions] == ["p202501", "p202502", "p202506"]
+
+        results = archive_audit_partitions(datetime(2025, 3, 1), str(archive_dir))
+        assert [(name, rows) for name, _, rows in results] == [("p202501", 2), ("p202502", 1)]
+
+        with gzip.open(archive_dir / "audit_log_202501.jsonl.gz", "rt", encoding="utf-8") as handle:
+            archived = [json.loads(line) for line in handle]
+        assert [row["created_at"] for row in archived] == [
+            "2025-01-03T09:00:00",
+            "2025-01-28T09:00:00",
+        ]
+        assert AuditLog.query.count() == 1
+
+
+def test_prune_request_counts_drops_buckets_outside_dashboard_window(make_app):
+    app = make_app("audit_prune.db")
+
+    with app.app_context():
+        for bucket_start in [datetime(2025, 1, 1, 9, 0), datetime(2025, 1, 9, 9, 0), datetime(2025, 1, 10, 9, 0)]:
+            db.session.add(
+                AuditRequestAggregate(
+                    bucket_start=bucket_start,
+                    endpoint="index",
+                    method="GET",
+                    status_code=200,
+                    request_count=3,
+                )
+            )
+        db.session.commit()
+
+        cutoff = datetime(2025, 1, 10) - timedelta(days=7)
+        assert prune_request_counts(cutoff, dry_run=True) == 1
+        assert AuditRequestAggregate.query.count() == 3
+        assert prune_request_counts(cutoff) == 1
+        assert sorted(row.bucket_start.day for row in AuditRequestAggregate.query.all()) == [9, 10]
@@ -0,0 +1,126 @@
+import hashlib
+import io
+import os
+import time
+
+from app import blob_store, db
+from app.blob_store import blob_path, migrate_legacy_attachments, prune_orphan_blobs, release_blob, store_blob
+from app.models import Post, PostAttachment
+
+
+def test_identical_uploads_share_one_blob_until_last_reference(
+    tmp_path, create_user, login, make_app, post_with_attachment
+):
+    app = make_app("blobs.db", BLOB_RELEASE_GRACE_SECONDS=0)
+    with app.app_context():
+        create_user("bloba")
+        create_user("blobb")
+    body = b"%PDF-1.4 shared notice"
+    digest = hashlib.sha256(body).hexdigest()
+    path = blob_path(str(tmp_path / "posts"), digest)
+
+    client_a = app.test_client()
+    client_b = app.test_client()
+    login(client_a, "bloba")
+    login(client_b, "blobb")
+    assert post_with_attachment(client_a, "notice.pdf", body, title="first").status_code == 302
+    assert post_with_attachment(client_b, "notice.pdf", body, title="second").status_code == 302
+
+    with app.app_context():
+        attachments = PostAttachment.query.order_by(PostAttachment.id).all()
+        assert [item.content_hash for item in attachments] == [digest, digest]
+        assert attachments[0].stored_name != attachments[1].stored_name
+        first_post = Post.query.filter_by(title="first").first()
+        second = attachments[1]
+        second_ids = (second.post_id, second.id)
+
+    assert path.endswith(os.path.join(digest[:2], digest[2:4], digest))
+    assert os.path.exists(path)
+    blob_files = [name for _, _, files in os.walk(tmp_path / "posts") for name in files]
+    assert blob_files == [digest]
+
+    assert client_a.post(f"/posts/{first_post.id}/delete").status_code == 302
+    assert os.path.exists(path)
+
+    download = client_b.get(f"/posts/{second_ids[0]}/attachments/{second_ids[1]}")
+    assert download.status_code == 200
+    assert download.data == body
+
+    response = client_b.post(f"/posts/{second_ids[0]}/attachments/{second_ids[1]}/delete")
+    assert response.status_code == 302
+    assert not os.path.exists(path)
+
+
+def test_release_keeps_blob_that_a_concurrent_store_just_reused(tmp_path, monkeypatch, make_app):
+    app = make_app("blobs.db")
+    upload_dir = str(tmp_path / "posts")
+    body = b"%PDF-1.4 raced notice"
+
+    with app.app_context():
+        content_hash, _ = store_blob(io.BytesIO(body), upload_dir)
+        path = blob_path(upload_dir, content_hash)
+        stale = time.time() - 3600
+        os.utime(path, (stale, stale))
+
+        # Store finds the blob and touches it; release runs before its row commits.
+        store_blob(io.BytesIO(body), upload_dir)
+        assert not release_blob(upload_dir, content_hash, grace_seconds=60)
+        assert os.path.exists(path)
+
+        # Release moves the blob away between the store's hash and its touch.
+        os.utime(path, (stale, stale))
+        real_utime = os.utime
+        released = []
+
+        def racing_utime(target, *args, **kwargs):
+            if target == path and not released:
+                released.append(release_blob(upload_dir, content_hash, grace_seconds=60))
+            return real_utime(target, *args, **kwargs)
+
+        monkeypatch.setattr(blob_store.os, "utime", racing_utime)
+        store_blob(io.BytesIO(body), upload_dir)
+        monkeypatch.undo()
+        assert released == [True]
+        with open(path, "rb") as handle:
+            assert handle.read() == body
+
+        assert prune_orphan_blobs(upload_dir, grace_seconds=60) == 0
+        os.utime(path, (stale, stale))
+        assert prune_orphan_blobs(upload_dir, grace_seconds=60) == 1
+        assert not os.path.exists(path)
+        assert os.listdir(os.path.dirname(path)) == []
+
+
+def test_legacy_attachments_migrate_into_blob_store(tmp_path, create_user, make_app):
+    app = make_app("blobs.db")
+    upload_dir = tmp_path / "posts"
+    (upload_dir / "legacy_report.txt").write_bytes(b"legacy body")
+
+    with app.app_context():
+        user = create_user("bloba")
+        post = Post(title="legacy", content="본문", user_id=user.id)
+        db.session.add(post)
+        db.session.flush()
+        db.session.add(
+            PostAttachment(
+                post_id=post.id,
+                original_name="report.txt",
+                stored_name="legacy_report.txt",
+                file_size=11,
+            )
+        )
+        db.session.commit()
+        post_id = post.id
+
+        attachment = PostAttachment.query.first()
+        response = app.test_client().get(f"/posts/{post_id}/attachments/{attachment.id}")
+        assert response.data == b"legacy body"
+
+        assert migrate_legacy_attachments(str(upload_dir)) == (1, 0)
+        attachment = PostAttachment.query.first()
+        assert attachment.content_hash == hashlib.sha256(b"legacy body").hexdigest()
+        assert not (upload_dir / "legacy_report.txt").exists()
+        assert os.path.exists(blob_path(str(upload_dir), attachment.content_hash))
+
+    response = app.test_client().get(f"/posts/{post_id}/attachments/{attachment.id}")
+    assert response.data == b"legacy body"
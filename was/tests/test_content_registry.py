@@ -0,0 +1,74 @@
+import pytest
+
+from app.content_registry import (
+    HEALTH_PROGRAMS,
+    HEALTH_PROGRAMS_BY_CATEGORY,
+    HEALTH_PROGRAMS_BY_ID,
+    OWASP_TOP10_SCENARIOS_BY_ID,
+    REGIONAL_CENTERS,
+    REGIONAL_CENTERS_BY_REGION,
+    VACCINATION_CHECKUP_CALENDAR_BY_MONTH,
+    ContentRegistryError,
+    freeze,
+    index_groups,
+    index_unique,
+)
+from app.health_content import HEALTH_PROGRAMS as SOURCE_HEALTH_PROGRAMS
+from app.security_catalog import OWASP_TOP10_SCENARIOS as SOURCE_SCENARIOS
+
+
+def test_registry_indexes_match_source_content():
+    assert [item["id"] for item in HEALTH_PROGRAMS] == [item["id"] for item in SOURCE_HEALTH_PROGRAMS]
+    assert set(OWASP_TOP10_SCENARIOS_BY_ID) == {item["id"] for item in SOURCE_SCENARIOS}
+    assert HEALTH_PROGRAMS_BY_ID["vaccination"]["documents"] == tuple(SOURCE_HEALTH_PROGRAMS[0]["documents"])
+
+    for category, programs in HEALTH_PROGRAMS_BY_CATEGORY.items():
+        assert all(item["category"] == category for item in programs)
+    assert sum(len(group) for group in REGIONAL_CENTERS_BY_REGION.values()) == len(REGIONAL_CENTERS)
+    assert all(
+        item["month"] == month
+        for month, schedules in VACCINATION_CHECKUP_CALENDAR_BY_MONTH.items()
+        for item in schedules
+    )
+
+
+def test_registry_views_are_immutable():
+    with pytest.raises(TypeError):
+        HEALTH_PROGRAMS_BY_ID["new"] = {}
+    with pytest.raises(TypeError):
+        HEALTH_PROGRAMS_BY_ID["vaccination"]["name"] = "changed"
+    with pytest.raises(AttributeError):
+        HEALTH_PROGRAMS_BY_ID["vaccination"]["documents"].append("extra")
+
+
+def test_registry_rejects_duplicate_or_missing_ids():
+    items = freeze([{"id": "x", "region": "서울"}, {"id": "x", "region": "부산"}])
+    with pytest.raises(ContentRegistryError, match="duplicate"):
+        index_unique(items, "id", "center")
+    with pytest.raises(ContentRegistryError, match="has no"):
+        index_unique(freeze([{"region": "서울"}]), "id", "center")
+    assert list(index_groups(items, "region")) == ["서울", "부산"]
+
+
+def test_detail_and_filtered_pages_use_registry(make_app):
+    app = make_app("content_registry.db")
+
+    client = app.test_client()
+    program = HEALTH_PROGRAMS[0]
+    detail = client.get(f"/health-programs/{program['id']}")
+    assert detail.status_code == 200
+    assert program["name"] in detail.get_data(as_text=True)
+    assert client.get("/health-programs/not-exists").status_code == 404
+
+    region = next(iter(REGIONAL_CENTERS_BY_REGION))
+    other_centers = [item for item in REGIONAL_CENTERS if item["region"] != region]
+    filtered = client.get("/health-centers", query_string={"region": region}).get_data(as_text=True)
+    assert REGIONAL_CENTERS_BY_REGION[region][0]["name"] in filtered
+    assert all(item["name"] not in filtered for item in other_centers)
+    unfiltered = client.get("/health-centers").get_data(as_text=True)
+    assert all(item["name"] in unfiltered for item in REGIONAL_CENTERS)
+
+    month = next(iter(VACCINATION_CHECKUP_CALENDAR_BY_MONTH))
+    calendar = client.get("/health-calendar", query_string={"month": month}).get_data(as_text=True)
+    assert VACCINATION_CHECKUP_CALENDAR_BY_MONTH[month][0]["title"] in calendar
+    assert "해당 월의 일정이 없습니다." in client.get("/health-calendar?month=1999-01").get_data(as_text=True)
@@ -1,5 +1,7 @@
+import html
 import json
 import io
+import re
 from datetime import datetime
 
 from app import create_app, db
@@ -304,7 +306,10 @@ def test_admin_users_search_filter_and_pagination(tmp_path):
     assert filtered.status_code == 200
     assert b"user00" in filtered.data
 
-    page2 = client.get("/admin/users?page=2", follow_redirects=False)
+    first_page = client.get("/admin/users", follow_redirects=False)
+    next_link = re.search(r'href="(/admin/users\?[^"]*dir=next[^"]*)"', first_page.get_data(as_text=True))
+    assert next_link is not None
+    page2 = client.get(html.unescape(next_link.group(1)), follow_redirects=False)
     assert page2.status_code == 200
     assert "페이지 2".encode() in page2.data
 
@@ -713,7 +718,7 @@ def test_profile_update_requires_password_and_supports_image_terms_and_lists(tmp
             "email": "new-profile@example.com",
             "agree_optional_terms": "on",
             "current_password": "pass12345",
-            "profile_image": (io.BytesIO(b"fakeimagebytes"), "avatar.png"),
+            "profile_image": (io.BytesIO(b"\x89PNG\r\n\x1a\nfakeimagebytes"), "avatar.png"),
         },
         content_type="multipart/form-data",
         follow_redirects=False,
@@ -0,0 +1,49 @@
+import json
+import logging
+
+from app.db_instrumentation import route_sql_stats
+
+
+def test_server_timing_header_and_route_aggregate(create_user, login, make_app):
+    app = make_app("timing.db", SQL_SERVER_TIMING=True, METRICS_ALLOWED_NETWORKS="10.0.0.0/8")
+
+    with app.app_context():
+        create_user("timingadmin", role="admin")
+
+    anonymous = app.test_client().get("/posts")
+    assert "Server-Timing" not in anonymous.headers
+    internal = app.test_client().get("/posts", environ_base={"REMOTE_ADDR": "10.1.2.3"})
+    assert "Server-Timing" not in internal.headers
+
+    client = app.test_client()
+    assert login(client, "timingadmin").status_code == 302
+
+    response = client.get("/posts")
+    assert response.status_code == 200
+    header = response.headers["Server-Timing"]
+    assert header.startswith("db;dur=")
+    assert "queries" in header
+    assert "app;dur=" in header
+
+    dashboard = client.get("/admin")
+    assert dashboard.status_code == 200
+    assert "라우트별 DB 사용량" in dashboard.get_data(as_text=True)
+
+    rows = {row["endpoint"]: row for row in route_sql_stats(app, limit=50)}
+    assert rows["posts_list"]["requests"] == 3
+    assert rows["posts_list"]["queries"] >= 1
+    assert rows["posts_list"]["slowest_sql"].startswith("SELECT")
+
+
+def test_slow_request_emits_structured_log(caplog, make_app):
+    app = make_app("timing_log.db", SQL_LOG_THRESHOLD_MS=0)
+
+    with caplog.at_level(logging.WARNING, logger=app.logger.name):
+        response = app.test_client().get("/posts")
+
+    assert "Server-Timing" not in response.headers
+    entries = [json.loads(record.getMessage()) for record in caplog.records]
+    entry = next(item for item in entries if item["endpoint"] == "posts_list")
+    assert entry["event"] == "sql_request"
+    assert entry["status"] == 200
+    assert entry["queries"] >= 1
@@ -0,0 +1,56 @@
+from app.blob_store import attachment_relpath
+from app.models import PostAttachment
+
+
+def _stored_attachment(app):
+    with app.app_context():
+        attachment = PostAttachment.query.one()
+        return attachment.post_id, attachment.id, attachment_relpath(attachment)
+
+
+def test_direct_delivery_supports_range_and_conditional_get(create_user, login, make_app, post_with_attachment):
+    app = make_app("delivery.db")
+    with app.app_context():
+        create_user("deliveryuser")
+    client = app.test_client()
+    login(client, "deliveryuser")
+    assert post_with_attachment(client, "안내문_notice.txt", b"0123456789abcdef").status_code == 302
+    post_id, attachment_id, _ = _stored_attachment(app)
+    url = f"/posts/{post_id}/attachments/{attachment_id}"
+
+    full = client.get(url)
+    assert full.status_code == 200
+    assert full.data == b"0123456789abcdef"
+    disposition = full.headers["Content-Disposition"]
+    assert disposition.startswith("attachment;")
+    assert "filename*=UTF-8''" in disposition
+    assert full.headers["Accept-Ranges"] == "bytes"
+
+    partial = client.get(url, headers={"Range": "bytes=4-7"})
+    assert partial.status_code == 206
+    assert partial.data == b"4567"
+
+    cached = client.get(url, headers={"If-None-Match": full.headers["ETag"]})
+    assert cached.status_code == 304
+
+
+def test_x_accel_delivery_hands_transfer_to_nginx(create_user, login, make_app, post_with_attachment):
+    app = make_app("delivery.db", ATTACHMENT_DELIVERY="x-accel")
+    with app.app_context():
+        create_user("deliveryuser")
+    client = app.test_client()
+    login(client, "deliveryuser")
+    assert post_with_attachment(client, "안내문_notice.txt", b"0123456789abcdef").status_code == 302
+    post_id, attachment_id, relpath = _stored_attachment(app)
+
+    response = client.get(f"/posts/{post_id}/attachments/{attachment_id}")
+    assert response.status_code == 200
+    assert response.data == b""
+    assert response.headers["X-Accel-Redirect"] == f"/_protected/posts/{relpath}"
+    assert response.headers["Content-Disposition"] == (
+        "attachment; filename=\"_notice.txt\"; "
+        "filename*=UTF-8''%EC%95%88%EB%82%B4%EB%AC%B8_notice.txt"
+    )
+
+    missing = client.get(f"/posts/{post_id}/attachments/{attachment_id + 1}")
+    assert missing.status_code == 404
@@ -0,0 +1,136 @@
+import io
+import os
+
+from PIL import Image
+
+from app import db
+from app.image_derivatives import (
+    backfill_profile_derivatives,
+    derivative_name,
+    has_profile_derivatives,
+    init_image_derivatives,
+    schedule_profile_derivatives,
+)
+from app.models import User
+
+
+def _png_bytes(size=(800, 600)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (15, 118, 110)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_profile_upload_produces_thumbnails_and_serves_smallest_fit(
+    tmp_path, create_user, login, make_app, update_profile_image
+):
+    app = make_app("thumbs.db")
+    with app.app_context():
+        create_user("thumbuser")
+    upload_dir = tmp_path / "profiles"
+    client = app.test_client()
+    login(client, "thumbuser")
+
+    assert update_profile_image(client, "avatar.png", _png_bytes()).status_code == 302
+
+    with app.app_context():
+        user = User.query.filter_by(username="thumbuser").first()
+        stored_name = user.profile_image_name
+        user_id = user.id
+
+    for size in (64, 256):
+        with Image.open(upload_dir / derivative_name(stored_name, size, "jpg")) as thumb:
+            assert thumb.size == (size, size)
+        assert (upload_dir / derivative_name(stored_name, size, "webp")).exists()
+
+    page = client.get("/profile").get_data(as_text=True)
+    assert f"/users/{user_id}/profile-image?v={stored_name}&amp;size=144&amp;fmt=webp" in page
+    assert "size=48" in page
+
+    small = client.get(f"/users/{user_id}/profile-image?v={stored_name}&size=48&fmt=webp")
+    assert small.mimetype == "image/webp"
+    with Image.open(io.BytesIO(small.data)) as image:
+        assert image.size == (64, 64)
+    medium = client.get(f"/users/{user_id}/profile-image?v={stored_name}&size=144")
+    with Image.open(io.BytesIO(medium.data)) as image:
+        assert image.size == (256, 256)
+    original = client.get(f"/users/{user_id}/profile-image?v={stored_name}")
+    with Image.open(io.BytesIO(original.data)) as image:
+        assert image.size == (800, 600)
+
+    anonymous = app.test_client()
+    assert anonymous.get(f"/users/{user_id}/profile-image").status_code == 404
+    assert anonymous.get(f"/users/{user_id}/profile-image?v=profile_guess.png").status_code == 404
+    assert anonymous.get(f"/users/{user_id}/profile-image?v={stored_name}").status_code == 200
+
+    replaced = update_profile_image(client, "avatar.png", _png_bytes((300, 300)))
+    assert replaced.status_code == 302
+    assert not (upload_dir / derivative_name(stored_name, 64, "webp")).exists()
+
+
+def test_original_is_served_until_derivatives_exist(create_user, login, make_app, update_profile_image):
+    app = make_app("thumbs.db", IMAGE_DERIVATIVES_ASYNC=True)
+    with app.app_context():
+        create_user("thumbuser")
+    # Swap in a worker that never runs so the upload stays underived.
+    app.extensions["image_derivatives"].shutdown()
+    app.extensions["image_derivatives"].submit = lambda upload_dir, stored_name: None
+    client = app.test_client()
+    login(client, "thumbuser")
+    body = _png_bytes((120, 90))
+    assert update_profile_image(client, "avatar.png", body).status_code == 302
+
+    with app.app_context():
+        user = User.query.filter_by(username="thumbuser").first()
+        stored_name = user.profile_image_name
+        user_id = user.id
+
+    response = client.get(f"/users/{user_id}/profile-image?v={stored_name}&size=48&fmt=webp")
+    assert response.status_code == 200
+    assert response.data == body
+    assert "no-cache" in response.headers["Cache-Control"]
+    assert "max-age=3600" not in response.headers["Cache-Control"]
+
+    init_image_derivatives(app)
+    app.config["IMAGE_DERIVATIVES_ASYNC"] = True
+    future = schedule_profile_derivatives(app, stored_name)
+    assert len(future.result(timeout=10)) == 4
+    response = client.get(f"/users/{user_id}/profile-image?v={stored_name}&size=48&fmt=webp")
+    assert response.mimetype == "image/webp"
+    assert "no-cache" not in response.headers["Cache-Control"]
+
+
+def test_invalid_image_keeps_original_without_derivatives(
+    tmp_path, create_user, login, make_app, update_profile_image
+):
+    app = make_app("thumbs.db")
+    with app.app_context():
+        create_user("thumbuser")
+    client = app.test_client()
+    login(client, "thumbuser")
+    assert update_profile_image(client, "avatar.png", b"\x89PNG\r\n\x1a\nnot really a png").status_code == 302
+
+    with app.app_context():
+        stored_name = User.query.filter_by(username="thumbuser").first().profile_image_name
+    assert os.listdir(tmp_path / "profiles") == [stored_name]
+
+
+def test_backfill_generates_missing_derivatives_for_existing_avatars(tmp_path, create_user, make_app):
+    app = make_app("thumbs.db")
+    with app.app_context():
+        create_user("thumbuser")
+    upload_dir = tmp_path / "profiles"
+    upload_dir.mkdir(exist_ok=True)
+    (upload_dir / "profile_legacy.png").write_bytes(_png_bytes((200, 150)))
+    (upload_dir / "profile_broken.png").write_bytes(b"not an image")
+
+    with app.app_context():
+        user = User.query.filter_by(username="thumbuser").first()
+        user.profile_image_name = "profile_legacy.png"
+        broken = create_user("brokenavatar")
+        broken.profile_image_name = "profile_broken.png"
+        db.session.commit()
+
+        assert not has_profile_derivatives(str(upload_dir), "profile_legacy.png")
+        assert backfill_profile_derivatives(app, batch_size=1) == (1, 0, 1)
+        assert has_profile_derivatives(str(upload_dir), "profile_legacy.png")
+        assert backfill_profile_derivatives(app) == (0, 1, 1)
@@ -0,0 +1,83 @@
+import json
+
+from app.metrics import MetricsRegistry
+from app.models import AuditLog
+
+
+def test_metrics_endpoint_reports_requests_and_latency(make_app):
+    app = make_app("metrics.db")
+    client = app.test_client()
+
+    assert client.get("/posts").status_code == 200
+    assert client.get("/posts").status_code == 200
+    assert client.get("/posts/999").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    body = response.get_data(as_text=True)
+    assert 'http_requests_total{endpoint="posts_list",method="GET",status="200"} 2' in body
+    assert 'http_requests_total{endpoint="posts_detail",method="GET",status="404"} 1' in body
+    assert 'http_request_duration_seconds_count{endpoint="posts_list",status="200"} 2' in body
+    assert 'http_request_duration_seconds_bucket{endpoint="posts_list",status="200",le="+Inf"} 2' in body
+    assert "http_requests_in_progress 0" in body
+    assert 'endpoint="metrics"' not in body
+
+    with app.app_context():
+        assert AuditLog.query.filter_by(target_id="/metrics").count() == 0
+
+
+def test_metrics_endpoint_requires_admin_or_internal_address(create_user, login, make_app):
+    app = make_app("metrics.db", METRICS_ALLOWED_NETWORKS="10.0.0.0/8")
+    with app.app_context():
+        create_user("metricsadmin", role="admin")
+        create_user("metricsuser")
+
+    outside = {"REMOTE_ADDR": "203.0.113.5"}
+    client = app.test_client()
+    assert client.get("/metrics", environ_base=outside).status_code == 403
+    assert client.get("/metrics", environ_base={"REMOTE_ADDR": "10.1.2.3"}).status_code == 200
+
+    assert login(client, "metricsuser").status_code == 302
+    assert client.get("/metrics", environ_base=outside).status_code == 403
+
+    admin_client = app.test_client()
+    assert login(admin_client, "metricsadmin").status_code == 302
+    assert admin_client.get("/metrics", environ_base=outside).status_code == 200
+
+
+def test_multiprocess_registry_merges_worker_files(tmp_path):
+    metrics_dir = tmp_path / "metrics"
+    registry = MetricsRegistry(multiproc_dir=str(metrics_dir), flush_interval=60)
+    requests_total = registry.counter("http_requests_total", "Requests.", ("endpoint",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("endpoint",), buckets=(0.1, 1.0))
+    in_progress = registry.gauge("in_progress", "In flight.")
+
+    requests_total.inc(endpoint="index")
+    latency.observe(0.05, endpoint="index")
+    in_progress.set(2)
+    registry.flush()
+
+    # A worker that has already exited: its counters survive, its gauges do not.
+    (metrics_dir / "metrics_99999999.json").write_text(
+        json.dumps(
+            {
+                "pid": 99999999,
+                "metrics": {
+                    "http_requests_total": {"kind": "counter", "values": [[["index"], 3.0]]},
+                    "latency_seconds": {
+                        "kind": "histogram",
+                        "values": [[["index"], {"buckets": [0, 2], "sum": 1.0, "count": 3}]],
+                    },
+                    "in_progress": {"kind": "gauge", "values": [[[], 5.0]]},
+                },
+            }
+        )
+    )
+
+    body = registry.render()
+    assert 'http_requests_total{endpoint="index"} 4' in body
+    assert 'latency_seconds_bucket{endpoint="index",le="0.1"} 1' in body
+    assert 'latency_seconds_bucket{endpoint="index",le="1"} 3' in body
+    assert 'latency_seconds_count{endpoint="index"} 4' in body
+    assert "in_progress 2" in body
@@ -0,0 +1,44 @@
+import json
+from datetime import date, datetime, time
+
+from app.models import MyDataSnapshot, User
+from app.mydata_batch import build_snapshot_rows, prewarm_snapshots
+from app.mydata_mock import generate_mock_medical_mydata
+from app.mydata_store import store_snapshot
+
+
+def test_batch_rows_match_per_user_generator(create_user, make_app):
+    app = make_app("mydata_batch_rows.db")
+    with app.app_context():
+        users = [create_user(f"batchuser{index}") for index in range(5)]
+        tuples = [(user.id, user.username, user.email, user.full_name, True) for user in users]
+        rows = build_snapshot_rows(tuples, date.today())
+
+        for user, (user_id, consented, blob, payload_hash, points) in zip(users, rows):
+            snapshot = MyDataSnapshot(payload=blob, payload_hash=payload_hash)
+            assert user_id == user.id and consented
+            assert ("bmi", datetime.combine(date.today(), time()), generate_mock_medical_mydata(user)["checkups"]["bmi"]) in points
+            assert json.loads(snapshot.payload_json) == generate_mock_medical_mydata(user)
+
+
+def test_prewarm_refreshes_consented_users_in_chunks(create_user, make_app):
+    app = make_app("mydata_prewarm.db")
+    with app.app_context():
+        consented = [create_user(f"consented{index}") for index in range(5)]
+        create_user("neverasked")
+        for user in consented[:3]:
+            store_snapshot(user.id, {"stale": True})
+        store_snapshot(consented[3].id, generate_mock_medical_mydata(consented[3]))
+        store_snapshot(consented[4].id, {"stale": True})
+
+        totals = prewarm_snapshots(chunk_size=2, keep=1)
+        assert totals == {"users": 5, "inserted": 4, "unchanged": 1}
+        assert MyDataSnapshot.query.count() == 5
+        for user in consented:
+            snapshot = MyDataSnapshot.query.filter_by(user_id=user.id).one()
+            assert json.loads(snapshot.payload_json) == generate_mock_medical_mydata(user)
+
+        totals = prewarm_snapshots(workers=2, chunk_size=2, consented_only=False, keep=1)
+        assert totals == {"users": 6, "inserted": 1, "unchanged": 5}
+        stranger = MyDataSnapshot.query.join(User).filter(User.username == "neverasked").one()
+        assert stranger.consent_given is False
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from app.models import MyDataMetricPoint
+from app.mydata_metrics import extract_metric_points
+from app.mydata_store import store_snapshot
+
+
+def _payload(glucose, pressure, monthly):
+    return {
+        "checkups": {"fastingGlucose": glucose, "bloodPressure": pressure, "bmi": "n/a"},
+        "costSummary": {"monthly": [{"month": month, "outOfPocket": amount} for month, amount in monthly]},
+    }
+
+
+def test_extract_metric_points_reads_checkups_and_monthly_costs():
+    points = extract_metric_points(
+        _payload(101, "128/84", [("2026-05", 30000), ("bad", 1)]),
+        datetime(2026, 6, 3, 14, 30),
+    )
+    fetch_day = datetime(2026, 6, 3)
+    assert sorted(points) == sorted(
+        [
+            ("fasting_glucose", fetch_day, 101.0),
+            ("systolic_bp", fetch_day, 128.0),
+            ("diastolic_bp", fetch_day, 84.0),
+            ("out_of_pocket", datetime(2026, 5, 1), 30000.0),
+        ]
+    )
+
+
+def test_trend_api_returns_monthly_aggregates(monkeypatch, create_user, login, make_app):
+    app = make_app("mydata_metrics.db")
+    clock = {"now": datetime(2026, 9, 2, 9, 0)}
+    monkeypatch.setattr("app.mydata_store.utc_now", lambda: clock["now"])
+
+    with app.app_context():
+        user = create_user("trenduser")
+        other = create_user("othertrend")
+        store_snapshot(user.id, _payload(100, "120/80", [("2026-08", 10000), ("2026-09", 20000)]))
+        clock["now"] = datetime(2026, 9, 20, 9, 0)
+        store_snapshot(user.id, _payload(120, "130/85", [("2026-09", 25000), ("2026-10", 5000)]))
+        clock["now"] = datetime(2026, 10, 5, 9, 0)
+        store_snapshot(user.id, _payload(110, "125/82", []))
+        store_snapshot(other.id, _payload(200, "160/100", []))
+
+        rows = MyDataMetricPoint.query.filter_by(user_id=user.id, metric="out_of_pocket").all()
+        assert {(row.observed_at.month, row.value) for row in rows} == {(8, 10000), (9, 25000), (10, 5000)}
+
+    monkeypatch.setattr("app.routes.utc_now", lambda: clock["now"])
+    client = app.test_client()
+    login(client, "trenduser")
+    glucose = client.get("/profile/mydata/trends?metric=fasting_glucose&months=3").get_json()
+    assert glucose["ok"] is True
+    assert glucose["points"] == [
+        {"period": "2026-09", "avg": 110.0, "min": 100.0, "max": 120.0, "count": 2},
+        {"period": "2026-10", "avg": 110.0, "min": 110.0, "max": 110.0, "count": 1},
+    ]
+
+    daily = client.get("/profile/mydata/trends?metric=systolic_bp&bucket=day&months=3").get_json()
+    assert [point["period"] for point in daily["points"]] == ["2026-09-02", "2026-09-20", "2026-10-05"]
+
+    invalid = client.get("/profile/mydata/trends?metric=password_hash")
+    assert invalid.status_code == 400
+    assert invalid.get_json()["ok"] is False
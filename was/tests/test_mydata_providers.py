@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from app import db, mydata_standin
+from app.models import MyDataFetchJob, MyDataSnapshot
+from app.mydata_mock import generate_mock_medical_mydata
+from app.mydata_providers import HttpMyDataProvider, MyDataProviderError, validate_payload
+from app.mydata_standin import create_standin_server
+
+
+@pytest.fixture
+def standin():
+    server = create_standin_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_http_provider_reuses_connections_and_retries(standin, create_user, make_app):
+    app = make_app("provider.db")
+    with app.app_context():
+        user = create_user("provideruser")
+
+        provider = HttpMyDataProvider(_url(standin), timeout=2.0, retries=2, backoff=0)
+        assert provider.fetch(user) == generate_mock_medical_mydata(user)
+        pooled = provider._idle.queue[0]
+        provider.fetch(user)
+        assert provider._idle.queue == [pooled]
+
+        standin.settings["error_rate"] = 1.0
+        with pytest.raises(MyDataProviderError, match="HTTP 503"):
+            provider.fetch(user)
+
+        standin.settings.update(error_rate=0.0, latency=0.5)
+        slow = HttpMyDataProvider(_url(standin), timeout=0.1, retries=0, backoff=0)
+        started = time.perf_counter()
+        with pytest.raises(MyDataProviderError):
+            slow.fetch(user)
+        assert time.perf_counter() - started < 0.45
+        provider.close()
+        slow.close()
+
+
+def test_http_provider_rejects_malformed_payloads(standin, monkeypatch, create_user, make_app):
+    app = make_app("provider_shape.db")
+    with app.app_context():
+        user = create_user("shapeuser")
+        provider = HttpMyDataProvider(_url(standin), timeout=2.0, retries=2, backoff=0)
+
+        monkeypatch.setattr(mydata_standin, "build_mock_payload", lambda *args: ["not", "an", "object"])
+        with pytest.raises(MyDataProviderError, match="expected an object") as excinfo:
+            provider.fetch(user)
+        assert not excinfo.value.retryable
+
+        monkeypatch.setattr(mydata_standin, "build_mock_payload", lambda *args: {"profile": {}})
+        with pytest.raises(MyDataProviderError, match="insurance"):
+            provider.fetch(user)
+        provider.close()
+
+    assert validate_payload(generate_mock_medical_mydata(user))
+
+
+def test_profile_fetch_runs_as_background_job(standin, create_user, login, make_app):
+    app = make_app(
+        "provider_job.db",
+        MYDATA_PROVIDER="http",
+        MYDATA_PROVIDER_URL=_url(standin),
+        MYDATA_PROVIDER_BACKOFF=0,
+        MYDATA_FETCH_ASYNC=True,
+    )
+    with app.app_context():
+        create_user("jobuser")
+
+    standin.settings["latency"] = 0.2
+    client = app.test_client()
+    login(client, "jobuser")
+    response = client.post("/profile/mydata/fetch", data={"consent_mydata": "on"})
+    assert response.status_code == 302
+
+    with app.app_context():
+        job_id = MyDataFetchJob.query.one().id
+    assert "불러오는 중" in client.get("/profile").get_data(as_text=True)
+
+    deadline = time.monotonic() + 5
+    status = None
+    while time.monotonic() < deadline:
+        status = client.get(f"/profile/mydata/jobs/{job_id}").get_json()["status"]
+        if status in ("done", "failed"):
+            break
+        time.sleep(0.05)
+    assert status == "done"
+
+    with app.app_context():
+        job = db.session.get(MyDataFetchJob, job_id)
+        snapshot = MyDataSnapshot.query.one()
+        assert job.snapshot_id == snapshot.id
+        assert snapshot.source == "HTTP"
+        assert job.duration_ms >= 200
+    assert "기본 의료 프로필" in client.get("/profile").get_data(as_text=True)
+
+    standin.settings.update(latency=0.0, error_rate=1.0)
+    app.config["MYDATA_FETCH_ASYNC"] = False
+    client.post("/profile/mydata/fetch", data={"consent_mydata": "on"})
+    assert "불러오지 못했습니다" in client.get("/profile").get_data(as_text=True)
+    app.extensions["mydata_fetcher"].shutdown()
@@ -0,0 +1,51 @@
+import json
+import zlib
+
+from app.models import MyDataSnapshot
+from app.mydata_mock import generate_mock_medical_mydata
+from app.mydata_store import latest_snapshot, prune_all_snapshots, store_snapshot
+
+
+def test_identical_fetch_reuses_compressed_snapshot(create_user, login, make_app):
+    app = make_app("mydata_store.db")
+    with app.app_context():
+        create_user("snapshotuser")
+
+    client = app.test_client()
+    login(client, "snapshotuser")
+    for _ in range(3):
+        response = client.post("/profile/mydata/fetch", data={"consent_mydata": "on"})
+        assert response.status_code == 302
+
+    with app.app_context():
+        snapshots = MyDataSnapshot.query.all()
+        assert len(snapshots) == 1
+        snapshot = snapshots[0]
+        raw = json.dumps(generate_mock_medical_mydata(snapshot.owner), ensure_ascii=False)
+        assert snapshot.payload_json == raw
+        assert zlib.decompress(snapshot.payload).decode("utf-8") == raw
+        assert len(snapshot.payload) < len(raw.encode("utf-8")) / 2
+
+    assert "의료 마이데이터".encode() in client.get("/profile").data
+
+
+def test_changed_payloads_are_kept_up_to_retention(create_user, make_app):
+    app = make_app("mydata_retention.db")
+    with app.app_context():
+        user = create_user("retentionuser")
+        other = create_user("otheruser")
+        for version in range(5):
+            snapshot, created = store_snapshot(user.id, {"version": version}, keep=3)
+            assert created
+        store_snapshot(other.id, {"version": 0})
+
+        _, created = store_snapshot(user.id, {"version": 4}, keep=3)
+        assert not created
+        remaining = MyDataSnapshot.query.filter_by(user_id=user.id).all()
+        assert sorted(json.loads(item.payload_json)["version"] for item in remaining) == [2, 3, 4]
+        assert json.loads(latest_snapshot(user.id).payload_json) == {"version": 4}
+
+        for version in range(1, 4):
+            store_snapshot(other.id, {"version": version})
+        assert prune_all_snapshots(2) == 3
+        assert MyDataSnapshot.query.count() == 4
@@ -0,0 +1,52 @@
+from app import mydata_view
+from app.mydata_view import MyDataViewCache
+
+
+def test_profile_reuses_rendered_mydata_panel_until_next_fetch(monkeypatch, create_user, login, make_app):
+    app = make_app("mydata_view.db")
+    builds = []
+    original_build = mydata_view.build_mydata_view
+
+    def counting_build(payload):
+        builds.append(payload["profile"]["name"])
+        return original_build(payload)
+
+    monkeypatch.setattr(mydata_view, "build_mydata_view", counting_build)
+
+    with app.app_context():
+        create_user("panelowner")
+
+    client = app.test_client()
+    login(client, "panelowner")
+    client.post("/profile/mydata/fetch", data={"consent_mydata": "on"})
+
+    first = client.get("/profile").get_data(as_text=True)
+    second = client.get("/profile").get_data(as_text=True)
+    assert builds == ["panelowner name"]
+    assert "기본 의료 프로필" in first
+    assert "기본 의료 프로필" in second
+
+    client.post("/profile/mydata/fetch", data={"consent_mydata": "on"})
+    client.get("/profile")
+    assert len(builds) == 2
+
+
+def test_view_cache_evicts_least_recent_user_and_shares_through_directory(tmp_path):
+    cache = MyDataViewCache(max_entries=2)
+    cache.put(1, 10, "one")
+    cache.put(2, 20, "two")
+    assert cache.get(1, 10) == "one"
+    cache.put(3, 30, "three")
+    assert cache.get(2, 20) is None
+    assert cache.get(1, 10) == "one"
+    assert cache.get(1, 11) is None
+
+    shared = tmp_path / "panels"
+    writer = MyDataViewCache(max_entries=4, shared_dir=str(shared))
+    reader = MyDataViewCache(max_entries=4, shared_dir=str(shared))
+    writer.put(5, 50, "<p>panel</p>")
+    assert reader.get(5, 50) == "<p>panel</p>"
+    writer.put(5, 51, "<p>newer</p>")
+    assert sorted(path.name for path in shared.iterdir()) == ["5_51.html"]
+    writer.invalidate(5)
+    assert list(shared.iterdir()) == []
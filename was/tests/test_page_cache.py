@@ -0,0 +1,96 @@
+from app.audit import get_request_counter
+from app.content_registry import REGIONAL_CENTERS_BY_REGION
+from app.models import AuditLog, AuditRequestAggregate
+
+
+def test_public_page_is_cached_with_etag_and_revalidates(monkeypatch, make_app):
+    app = make_app("page_cache.db")
+    renders = []
+    original_render = app.jinja_env.get_template("health/calendar.html").render
+
+    def counting_render(*args, **kwargs):
+        renders.append(1)
+        return original_render(*args, **kwargs)
+
+    monkeypatch.setattr(app.jinja_env.get_template("health/calendar.html"), "render", counting_render)
+    client = app.test_client()
+
+    first = client.get("/health-calendar")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+    assert "public" in first.headers["Cache-Control"]
+    assert "max-age=300" in first.headers["Cache-Control"]
+    assert "Cookie" in first.headers["Vary"]
+
+    second = client.get("/health-calendar")
+    assert second.get_data() == first.get_data()
+    assert second.headers["ETag"] == etag
+    assert len(renders) == 1
+
+    not_modified = client.get("/health-calendar", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.get_data() == b""
+    assert not_modified.headers["ETag"] == etag
+
+    stale = client.get("/health-calendar", headers={"If-None-Match": '"something-else"'})
+    assert stale.status_code == 200
+    assert len(renders) == 1
+
+    get_request_counter(app).flush()
+    with app.app_context():
+        web_rows = AuditLog.query.filter_by(action="web_request", target_id="/health-calendar").count()
+        assert web_rows == 1
+        aggregate = AuditRequestAggregate.query.filter_by(endpoint="health_calendar").all()
+        assert sum(row.request_count for row in aggregate) == 4
+
+
+def test_logged_in_and_flashed_requests_bypass_public_page_cache(create_user, login, make_app):
+    app = make_app("page_cache.db")
+    with app.app_context():
+        create_user("cacheuser")
+
+    client = app.test_client()
+    anonymous = client.get("/complaints/faq")
+    assert "ETag" in anonymous.headers
+
+    login(client, "cacheuser")
+    signed_in = client.get("/complaints/faq")
+    assert signed_in.status_code == 200
+    assert "ETag" not in signed_in.headers
+    assert b"cacheuser" in signed_in.get_data()
+    assert b"cacheuser" not in anonymous.get_data()
+
+    client.get("/logout")
+    with client.session_transaction() as sess:
+        sess["_flashes"] = [("info", "flash-once-message")]
+    flashed = client.get("/complaints/faq")
+    assert "flash-once-message" in flashed.get_data(as_text=True)
+    assert "ETag" not in flashed.headers
+    assert "flash-once-message" not in client.get("/complaints/faq").get_data(as_text=True)
+
+
+def test_public_page_cache_can_be_disabled(make_app):
+    app = make_app("page_cache.db", PUBLIC_PAGE_CACHE=False)
+    response = app.test_client().get("/health-info")
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+    assert "public" not in response.headers.get("Cache-Control", "")
+
+
+def test_unknown_filter_values_are_not_cached(make_app):
+    app = make_app("page_cache.db")
+    cache = app.extensions["page_cache"]
+    client = app.test_client()
+
+    for idx in range(5):
+        response = client.get(f"/health-centers?region=nowhere-{idx}")
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+    assert len(cache._entries) == 0
+
+    region = next(iter(REGIONAL_CENTERS_BY_REGION))
+    padded = client.get("/health-centers", query_string={"region": f" {region} "})
+    exact = client.get("/health-centers", query_string={"region": region})
+    assert padded.headers["ETag"] == exact.headers["ETag"]
+    assert len(cache._entries) == 1
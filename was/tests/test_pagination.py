@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import Post, User
+from app.pagination import decode_cursor, encode_cursor, keyset_paginate
+
+
+def _follow(args):
+    return {"cursor": args["cursor"], "direction": args["dir"], "page": args["page"]}
+
+
+def test_keyset_paginate_walks_forward_and_back(make_app):
+    app = make_app("keyset.db")
+
+    with app.app_context():
+        user = User(
+            username="pager",
+            email="pager@example.com",
+            full_name="pager",
+            phone="010-9999-9999",
+        )
+        user.set_password("pass12345")
+        db.session.add(user)
+        db.session.commit()
+        base = datetime(2026, 1, 1, 9, 0, 0)
+        for idx in range(25):
+            # Pairs of posts share a timestamp so the id tie-breaker is exercised.
+            db.session.add(
+                Post(
+                    title=f"post {idx:02d}",
+                    content="body",
+                    user_id=user.id,
+                    created_at=base + timedelta(minutes=idx // 2),
+                )
+            )
+        db.session.commit()
+
+        expected = [
+            post.title
+            for post in Post.query.order_by(Post.created_at.desc(), Post.id.desc()).all()
+        ]
+
+        first = keyset_paginate(Post.query, Post, per_page=10)
+        assert [post.title for post in first.items] == expected[:10]
+        assert not first.has_prev and first.has_next
+
+        second = keyset_paginate(Post.query, Post, per_page=10, **_follow(first.next_args))
+        assert [post.title for post in second.items] == expected[10:20]
+        assert second.page == 2 and second.has_prev and second.has_next
+
+        third = keyset_paginate(Post.query, Post, per_page=10, **_follow(second.next_args))
+        assert [post.title for post in third.items] == expected[20:]
+        assert not third.has_next
+
+        back = keyset_paginate(Post.query, Post, per_page=10, **_follow(third.prev_args))
+        assert [post.title for post in back.items] == expected[10:20]
+        assert back.page == 2
+
+        back_to_start = keyset_paginate(Post.query, Post, per_page=10, **_follow(back.prev_args))
+        assert [post.title for post in back_to_start.items] == expected[:10]
+        assert not back_to_start.has_prev
+
+
+def test_cursor_roundtrip_and_garbage():
+    created_at = datetime(2026, 2, 10, 0, 0, 0, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    assert decode_cursor("not-a-cursor") is None
+    assert decode_cursor(None) is None
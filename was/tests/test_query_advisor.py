@@ -0,0 +1,25 @@
+from sqlalchemy import text
+
+from app import db
+from app.query_advisor import advise_indexes
+
+
+def test_index_advisor_flags_missing_index(make_app):
+    app = make_app("advisor.db")
+
+    with app.app_context():
+        report = {item["name"]: item for item in advise_indexes()}
+        assert not any(item["suggestion"] for item in report.values())
+        assert not any(item["full_scan"] for item in report.values())
+
+        db.session.execute(text("DROP INDEX ix_complaint_status_created_at"))
+        db.session.commit()
+        # sqlite3 caches prepared EXPLAIN statements per connection.
+        db.session.remove()
+        db.engine.dispose()
+        report = {item["name"]: item for item in advise_indexes()}
+        flagged = report["admin_complaints:status"]
+        assert flagged["full_scan"]
+        assert flagged["suggestion"] == (
+            "CREATE INDEX ix_complaint_status_created_at ON complaint (status, created_at)"
+        )
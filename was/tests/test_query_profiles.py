@@ -0,0 +1,49 @@
+import pytest
+
+from app import db
+from app.models import AuditLog, Complaint, Post, User
+
+
+def _seed_rows(create_user, count):
+    admin = User.query.filter_by(username="nplusadmin").first()
+    for idx in range(count):
+        author = create_user(f"author{idx:02d}")
+        db.session.add(Post(title=f"post {idx}", content="body", user_id=author.id))
+        db.session.add(
+            Complaint(
+                title=f"complaint {idx}",
+                content="body",
+                category="general",
+                user_id=author.id,
+                assigned_admin_id=admin.id,
+            )
+        )
+        db.session.add(AuditLog(actor_id=author.id, action="login", target_type="user"))
+    db.session.commit()
+
+
+@pytest.mark.parametrize("row_count", [1, 10])
+def test_list_pages_stay_within_query_budget(row_count, create_user, login, make_app):
+    app = make_app(f"nplus_{row_count}.db", SQL_QUERY_LIMIT=4)
+
+    with app.app_context():
+        create_user("nplusadmin", role="admin")
+        _seed_rows(create_user, row_count)
+
+    client = app.test_client()
+    login(client, "nplusadmin")
+    for path in ["/", "/posts", "/admin/posts", "/admin/complaints", "/admin/logs", "/complaints", "/profile"]:
+        assert client.get(path).status_code == 200, path
+
+
+def test_query_limit_guard_fails_the_request(create_user, login, make_app):
+    app = make_app("nplus_guard.db")
+
+    with app.app_context():
+        create_user("guarded")
+
+    client = app.test_client()
+    login(client, "guarded")
+    app.config["SQL_QUERY_LIMIT"] = 1
+    with pytest.raises(AssertionError, match="profile issued"):
+        client.get("/profile")
@@ -0,0 +1,67 @@
+import os
+
+from app import db, routes
+from app.models import Complaint
+from app.report_cache import ReportCache
+
+
+def test_report_pdf_is_cached_and_invalidated_on_status_change(tmp_path, monkeypatch, create_user, login, make_app):
+    app = make_app("report_cache.db", REPORT_CACHE_DIR=str(tmp_path / "reports"))
+    renders = []
+    original_build = routes.build_complaint_report_pdf
+
+    def counting_build(complaint):
+        renders.append(complaint.id)
+        return original_build(complaint)
+
+    monkeypatch.setattr(routes, "build_complaint_report_pdf", counting_build)
+
+    with app.app_context():
+        create_user("cacheadmin", role="admin")
+        owner = create_user("cacheowner")
+        complaint = Complaint(title="캐시 민원", content="내용", category="general", user_id=owner.id)
+        db.session.add(complaint)
+        db.session.commit()
+        complaint_id = complaint.id
+
+    client = app.test_client()
+    login(client, "cacheadmin")
+    url = f"/complaints/{complaint_id}/report.pdf"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.data.startswith(b"%PDF")
+    etag = first.headers["ETag"]
+    assert "no-cache" in first.headers["Cache-Control"]
+
+    second = client.get(url)
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert renders == [complaint_id]
+
+    client.post(f"/complaints/{complaint_id}", data={"status": "resolved"})
+    assert os.listdir(tmp_path / "reports") == []
+
+    third = client.get(url, headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert third.headers["ETag"] != etag
+    assert renders == [complaint_id, complaint_id]
+
+
+def test_report_cache_evicts_least_recently_used(tmp_path):
+    cache = ReportCache(str(tmp_path), max_bytes=250)
+    cache.put(1, "a", b"x" * 100)
+    cache.put(2, "b", b"x" * 100)
+    old = os.path.join(str(tmp_path), "complaint_1_a.pdf")
+    os.utime(old, (1, 1))
+    os.utime(os.path.join(str(tmp_path), "complaint_2_b.pdf"), (2, 2))
+    assert cache.get(1, "a") == old
+
+    cache.put(3, "c", b"x" * 100)
+    assert cache.get(1, "a") is not None
+    assert cache.get(2, "b") is None
+    assert cache.get(3, "c") is not None
+
+    cache.put(1, "d", b"x" * 10)
+    assert cache.get(1, "a") is None
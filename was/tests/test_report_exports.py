@@ -0,0 +1,162 @@
+import io
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from app import db, routes
+from app.models import Complaint, ReportExportJob, SearchPosting, utc_now
+from app.report_exports import (
+    STALE_JOB_AFTER,
+    STALE_JOB_ERROR,
+    complaint_export_query,
+    create_export_job,
+    run_export_job,
+)
+from app.search_index import complaint_fields, tokenize
+
+
+def test_admin_export_bundles_filtered_reports(tmp_path, create_user, login, make_app):
+    app = make_app("report_export.db", REPORT_EXPORT_DIR=str(tmp_path / "exports"))
+    with app.app_context():
+        create_user("exportadmin", role="admin")
+        create_user("otheradmin", role="admin")
+        owner = create_user("exportowner")
+        for index in range(5):
+            db.session.add(
+                Complaint(
+                    title=f"내보내기 민원 {index}",
+                    content="처리 결과 확인 요청\n" * 3,
+                    category="general",
+                    status="resolved" if index % 2 == 0 else "received",
+                    user_id=owner.id,
+                )
+            )
+        db.session.commit()
+        resolved_ids = [
+            row.id for row in Complaint.query.filter_by(status="resolved").order_by(Complaint.id)
+        ]
+
+    client = app.test_client()
+    login(client, "exportadmin")
+    response = client.post(
+        "/admin/complaints/export",
+        data={"q": "", "status": "resolved", "category": "all"},
+    )
+    assert response.status_code == 302
+    job_id = response.headers["Location"].rsplit("/", 1)[1]
+
+    status = client.get(f"/admin/complaints/export/{job_id}/status").get_json()
+    assert status["status"] == "done"
+    assert status["total"] == status["completed"] == len(resolved_ids)
+    assert status["download_url"].endswith(f"/{job_id}/download")
+
+    page = client.get(f"/admin/complaints/export/{job_id}")
+    assert "ZIP 다운로드" in page.get_data(as_text=True)
+
+    download = client.get(status["download_url"])
+    assert download.status_code == 200
+    assert download.mimetype == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(download.data)) as archive:
+        names = archive.namelist()
+        assert names == [f"complaint_{complaint_id}_report.pdf" for complaint_id in resolved_ids]
+        assert archive.read(names[0]).startswith(b"%PDF")
+
+    client.get("/logout")
+    login(client, "otheradmin")
+    assert client.get(f"/admin/complaints/export/{job_id}/status").status_code == 404
+
+
+def test_export_job_renders_in_worker_processes_and_records_failures(tmp_path, monkeypatch, create_user, make_app):
+    app = make_app("report_export_pool.db", REPORT_EXPORT_DIR=str(tmp_path / "exports"))
+    with app.app_context():
+        admin = create_user("pooladmin", role="admin")
+        for index in range(6):
+            db.session.add(
+                Complaint(title=f"병렬 민원 {index}", content="내용", category="general", user_id=admin.id)
+            )
+        db.session.commit()
+        job_id = create_export_job(admin.id, {"q": None, "status": None, "category": None}).id
+        broken_id = create_export_job(admin.id, {"q": None, "status": None, "category": None}).id
+
+    pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        assert run_export_job(app, job_id, routes.COMPLAINT_CATEGORY_LABELS, pool=pool) == "done"
+    finally:
+        pool.shutdown()
+
+    def broken_context(complaint, category_labels):
+        raise RuntimeError("render setup failed")
+
+    monkeypatch.setattr("app.report_exports.complaint_report_context", broken_context)
+    assert run_export_job(app, broken_id, routes.COMPLAINT_CATEGORY_LABELS) == "failed"
+
+    with app.app_context():
+        job = db.session.get(ReportExportJob, job_id)
+        assert job.completed == 6
+        with zipfile.ZipFile(tmp_path / "exports" / job.artifact_name) as archive:
+            assert len(archive.namelist()) == 6
+        broken = db.session.get(ReportExportJob, broken_id)
+        assert broken.error == "render setup failed"
+        assert broken.artifact_name is None
+    assert sorted(path.name for path in (tmp_path / "exports").iterdir()) == [f"{job_id}.zip"]
+
+
+def test_export_query_keeps_every_search_match(tmp_path, create_user, make_app):
+    app = make_app("export_search.db", REPORT_EXPORT_DIR=str(tmp_path / "exports"))
+    with app.app_context():
+        requester = create_user("bulkcitizen")
+        # More than a single search page or batch would ever hold.
+        total = 505
+        db.session.execute(
+            Complaint.__table__.insert(),
+            [
+                {"title": f"예방접종 문의 {idx}", "content": "본문", "category": "general", "user_id": requester.id}
+                for idx in range(total)
+            ],
+        )
+        complaints = Complaint.query.all()
+        rows = []
+        for complaint in complaints:
+            for text, weight in complaint_fields(complaint, requester.username):
+                rows.extend(
+                    {"doc_type": "complaint", "doc_id": complaint.id, "term": term, "weight": count * weight}
+                    for term, count in tokenize(text).items()
+                    if term in {"예방", "방접", "접종"}
+                )
+        db.session.execute(SearchPosting.__table__.insert(), rows)
+        db.session.commit()
+
+        assert complaint_export_query({"q": "예방접종"}).count() == total
+
+
+def test_orphaned_export_job_is_marked_failed(tmp_path, create_user, login, make_app):
+    app = make_app("report_export_stale.db", REPORT_EXPORT_DIR=str(tmp_path / "exports"))
+    with app.app_context():
+        admin = create_user("staleadmin", role="admin")
+        orphan = create_export_job(admin.id, {"q": None, "status": None, "category": None})
+        orphan.status = "running"
+        db.session.commit()
+        # The worker that owned it went away without another progress write.
+        ReportExportJob.query.filter_by(id=orphan.id).update(
+            {"updated_at": utc_now() - STALE_JOB_AFTER - timedelta(minutes=1)}
+        )
+        queued = create_export_job(admin.id, {"q": None, "status": None, "category": None})
+        db.session.commit()
+        admin_id, orphan_id, queued_id = admin.id, orphan.id, queued.id
+
+    client = app.test_client()
+    login(client, "staleadmin")
+    status = client.get(f"/admin/complaints/export/{orphan_id}/status").get_json()
+    assert status["status"] == "failed"
+    assert status["message"] == STALE_JOB_ERROR
+    assert client.get(f"/admin/complaints/export/{queued_id}/status").get_json()["status"] == "queued"
+
+    with app.app_context():
+        assert run_export_job(app, orphan_id, routes.COMPLAINT_CATEGORY_LABELS) == "failed"
+        assert db.session.get(ReportExportJob, orphan_id).error == STALE_JOB_ERROR
+
+        db.session.get(ReportExportJob, queued_id).updated_at = utc_now() - STALE_JOB_AFTER - timedelta(minutes=1)
+        db.session.commit()
+        create_export_job(admin_id, {"q": None, "status": None, "category": None})
+        assert db.session.get(ReportExportJob, queued_id).status == "failed"
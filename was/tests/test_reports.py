@@ -0,0 +1,61 @@
+from reportlab.pdfbase import pdfmetrics
+
+from app import reports
+from app.reports import render_complaint_report, report_font, report_template, wrap_text
+
+
+def _context(content):
+    return {
+        "id": 7,
+        "title": "긴 제목 " * 30,
+        "category": "일반 민원",
+        "status": "received",
+        "created_at": "2024-01-01 09:00:00",
+        "updated_at": "-",
+        "assigned_admin": "-",
+        "content": content,
+    }
+
+
+def test_wrap_text_breaks_hangul_by_measured_width():
+    template = report_template()
+    text = "예방접종 일정 변경 안내를 받지 못해 보건소에 다시 방문해야 했습니다. " * 12
+    lines = wrap_text(text, template.font_name, template.body_size, template.body_width)
+
+    assert len(lines) > 1
+    for line in lines:
+        width = pdfmetrics.stringWidth(line, template.font_name, template.body_size)
+        assert width <= template.body_width
+    # Breaks happen at spaces, so no eojeol is split across lines.
+    assert " ".join(lines).split() == text.split()
+
+    unbroken = "가" * 400
+    pieces = wrap_text(unbroken, template.font_name, template.body_size, template.body_width)
+    assert "".join(pieces) == unbroken
+    assert len(pieces) > 1
+
+
+def test_wrap_text_keeps_blank_paragraphs():
+    template = report_template()
+    assert wrap_text("첫 줄\n\n셋째 줄", template.font_name, template.body_size, 500) == ["첫 줄", "", "셋째 줄"]
+
+
+def test_report_font_is_registered_once(monkeypatch):
+    calls = []
+    original = pdfmetrics.registerFont
+
+    def counting_register(font):
+        calls.append(font.fontName)
+        return original(font)
+
+    report_font.cache_clear()
+    report_template.cache_clear()
+    monkeypatch.setattr(reports.pdfmetrics, "registerFont", counting_register)
+
+    first = render_complaint_report(_context("민원 내용 " * 2000))
+    second = render_complaint_report(_context("짧은 내용"))
+
+    # ReportLab registers its own standard fonts lazily; only count ours.
+    assert calls.count(reports.REPORT_FONT) == 1
+    assert first.startswith(b"%PDF") and second.startswith(b"%PDF")
+    assert first.count(b"/Type /Page\n") > 1
@@ -0,0 +1,147 @@
+import html
+import re
+
+from sqlalchemy import select
+
+from app import db
+from app.models import Post, SearchPosting
+from app.search_index import index_document, post_fields, rebuild_search_index, search_ranking, tokenize
+
+
+def _scores(doc_type, q):
+    ranking = search_ranking(doc_type, q)
+    return dict(db.session.execute(select(ranking.c.doc_id, ranking.c.score)).all())
+
+
+def _listed_post_ids(response):
+    return [int(post_id) for post_id in re.findall(r'href="/posts/(\d+)"', response.get_data(as_text=True))]
+
+
+def _page_link(response, label):
+    match = re.search(rf'href="([^"]+)" aria-label="{label}"', response.get_data(as_text=True))
+    return html.unescape(match.group(1)) if match else None
+
+
+def test_tokenize_uses_bigrams_for_hangul_and_latin():
+    assert tokenize("예방접종 QA") == {
+        "예방": 1,
+        "방접": 1,
+        "접종": 1,
+        "qa": 1,
+    }
+    assert tokenize("a 가") == {"a": 1, "가": 1}
+
+
+def test_post_search_uses_index_and_tracks_updates(create_user, login, make_app):
+    app = make_app("search.db")
+
+    with app.app_context():
+        create_user("searcher")
+
+    client = app.test_client()
+    login(client, "searcher")
+    client.post(
+        "/posts/new",
+        data={"title": "독감 예방접종 일정 문의", "content": "보건소 접수 시간", "category": "vaccination"},
+    )
+    client.post(
+        "/posts/new",
+        data={"title": "진료비 영수증", "content": "예방접종 비용 환급", "category": "insurance_billing"},
+    )
+
+    with app.app_context():
+        first = Post.query.filter_by(title="독감 예방접종 일정 문의").first()
+        second = Post.query.filter_by(title="진료비 영수증").first()
+        # Title hits outrank content hits.
+        scores = _scores("post", "예방접종")
+        assert scores[first.id] > scores[second.id]
+        first_id, second_id = first.id, second.id
+
+    assert _listed_post_ids(client.get("/posts?q=예방접종")) == [first_id, second_id]
+
+    listing = client.get("/posts?q=접종")
+    assert "독감 예방접종 일정 문의".encode() in listing.data
+    assert "진료비 영수증".encode() in listing.data
+
+    by_author = client.get("/posts?q=searcher")
+    assert "진료비 영수증".encode() in by_author.data
+
+    client.post(
+        f"/posts/{first_id}",
+        data={"title": "독감 일정 문의", "content": "보건소 접수 시간", "category": "vaccination"},
+    )
+    listing = client.get("/posts?q=예방접종")
+    assert "독감 일정 문의".encode() not in listing.data
+
+    client.post(f"/posts/{first_id}/delete")
+    with app.app_context():
+        assert SearchPosting.query.filter_by(doc_type="post", doc_id=first_id).count() == 0
+
+
+def test_rebuild_search_index_covers_existing_rows(create_user, make_app):
+    app = make_app("search_rebuild.db")
+
+    with app.app_context():
+        user = create_user("legacy")
+        db.session.add(Post(title="기존 게시물", content="마이그레이션 전 데이터", user_id=user.id))
+        db.session.commit()
+        assert _scores("post", "마이그레이션") == {}
+
+        counts = rebuild_search_index()
+        assert counts == {"post": 1, "complaint": 0, "notice": 0}
+        assert set(_scores("post", "마이그레이션")) == {Post.query.one().id}
+
+
+def test_single_character_query_matches_end_of_word(create_user, make_app):
+    app = make_app("search_unigram.db")
+
+    with app.app_context():
+        user = create_user("citizen")
+        end = Post(title="시민 참여", content="본문", user_id=user.id)
+        start = Post(title="민원 안내", content="본문", user_id=user.id)
+        other = Post(title="예방접종", content="본문", user_id=user.id)
+        db.session.add_all([end, start, other])
+        db.session.flush()
+        for post in (end, start, other):
+            index_document("post", post.id, post_fields(post, user.username))
+        db.session.commit()
+
+        assert set(_scores("post", "민")) == {end.id, start.id}
+
+
+def test_search_pages_walk_every_match_in_rank_order(create_user, make_app):
+    app = make_app("search_rank.db")
+
+    with app.app_context():
+        user = create_user("ranker")
+        posts = []
+        for idx in range(25):
+            # Every third post repeats the term in its title and ranks higher.
+            title = "검진 검진 안내" if idx % 3 == 0 else f"안내 {idx}"
+            posts.append(Post(title=title, content="건강 검진 일정", user_id=user.id))
+        db.session.add_all(posts)
+        db.session.flush()
+        for post in posts:
+            index_document("post", post.id, post_fields(post, user.username))
+        db.session.commit()
+
+        scores = _scores("post", "검진")
+        expected = sorted(scores, key=lambda post_id: (-scores[post_id], -post_id))
+        titled = {post.id for post in posts if post.title.startswith("검진")}
+    assert len(expected) == 25
+    assert set(expected[:9]) == titled
+
+    client = app.test_client()
+    seen, pages = [], []
+    url = "/posts?q=검진"
+    while url:
+        response = client.get(url)
+        pages.append(response)
+        seen.extend(_listed_post_ids(response))
+        url = _page_link(response, "다음 페이지")
+    assert seen == expected
+    assert len(pages) == 3
+
+    back = client.get(_page_link(pages[-1], "이전 페이지"))
+    assert _listed_post_ids(back) == expected[10:20]
+    assert _listed_post_ids(client.get(_page_link(back, "이전 페이지"))) == expected[:10]
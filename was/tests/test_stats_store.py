@@ -0,0 +1,74 @@
+from app import db
+from app.models import Complaint, Post, StatCounter
+from app.stats_store import read_dashboard_stats, reconcile_stats
+
+
+def _counter(name):
+    row = StatCounter.query.filter_by(name=name).first()
+    return row.value if row else 0
+
+
+def test_counters_follow_create_delete_and_status_change(create_user, login, make_app):
+    app = make_app("stats.db")
+
+    with app.app_context():
+        create_user("statsadmin", role="admin")
+        create_user("statsuser")
+        reconcile_stats()
+
+    user_client = app.test_client()
+    assert login(user_client, "statsuser").status_code == 302
+    user_client.post("/posts/new", data={"title": "첫 글", "content": "본문", "category": "general"})
+    user_client.post("/posts/new", data={"title": "둘째 글", "content": "본문", "category": "general"})
+    user_client.post(
+        "/complaints/new",
+        data={"title": "민원", "content": "민원 본문", "category": "facility_access"},
+    )
+
+    with app.app_context():
+        assert _counter("posts") == 2
+        assert _counter("complaints") == 1
+        assert _counter("complaints:status:received") == 1
+        assert _counter("complaints:category:facility_access") == 1
+        post_id = Post.query.order_by(Post.id).first().id
+        complaint_id = Complaint.query.first().id
+
+    user_client.post(f"/posts/{post_id}/delete")
+
+    admin_client = app.test_client()
+    assert login(admin_client, "statsadmin").status_code == 302
+    admin_client.post(f"/complaints/{complaint_id}", data={"status": "resolved"})
+
+    with app.app_context():
+        stats, category_stats = read_dashboard_stats()
+        assert stats == {
+            "users": 2,
+            "posts": 1,
+            "notices": 0,
+            "complaints": 1,
+            "complaints_pending": 0,
+        }
+        assert category_stats == [("facility_access", 1)]
+        assert reconcile_stats() == {}
+
+    response = admin_client.get("/admin")
+    assert response.status_code == 200
+
+
+def test_reconcile_bootstraps_and_corrects_drift(create_user, make_app):
+    app = make_app("stats_reconcile.db")
+
+    with app.app_context():
+        user = create_user("driftuser")
+        db.session.add(Post(title="seeded", content="body", user_id=user.id))
+        db.session.commit()
+
+        stats, _ = read_dashboard_stats()
+        assert stats["users"] == 1
+        assert stats["posts"] == 1
+
+        StatCounter.query.filter_by(name="posts").first().value = 40
+        db.session.commit()
+
+        assert reconcile_stats() == {"posts": -39}
+        assert _counter("posts") == 1
@@ -0,0 +1,106 @@
+import hashlib
+import os
+
+from app.blob_store import blob_path
+from app.models import PostAttachment, User
+from app.upload_ingest import IngestFile, sniff_matches
+
+
+def _temp_files(tmp_path):
+    temp_dir = tmp_path / "posts" / ".tmp"
+    return os.listdir(temp_dir) if temp_dir.exists() else []
+
+
+def test_streamed_upload_is_hashed_and_renamed_into_place(
+    tmp_path, create_user, login, make_app, post_with_attachment
+):
+    app = make_app("ingest.db", UPLOAD_MAX_FILE_BYTES=1024)
+    with app.app_context():
+        create_user("ingestuser")
+    client = app.test_client()
+    login(client, "ingestuser")
+    body = b"%PDF-1.7\n" + b"x" * 900
+
+    response = post_with_attachment(client, "guide.pdf", body, follow_redirects=True)
+    assert response.status_code == 200
+
+    with app.app_context():
+        attachment = PostAttachment.query.one()
+        assert attachment.content_hash == hashlib.sha256(body).hexdigest()
+        assert attachment.file_size == len(body)
+    with open(blob_path(str(tmp_path / "posts"), attachment.content_hash), "rb") as handle:
+        assert handle.read() == body
+    assert _temp_files(tmp_path) == []
+
+
+def test_oversized_and_mismatched_uploads_are_rejected(
+    tmp_path, create_user, login, make_app, post_with_attachment
+):
+    app = make_app("ingest.db", UPLOAD_MAX_FILE_BYTES=1024)
+    with app.app_context():
+        create_user("ingestuser")
+    client = app.test_client()
+    login(client, "ingestuser")
+
+    too_big = post_with_attachment(client, "big.pdf", b"%PDF-1.7\n" + b"x" * 2048, follow_redirects=True)
+    assert "첨부파일은 1KB 이하만 업로드할 수 있습니다".encode() in too_big.data
+
+    disguised = post_with_attachment(client, "fake.pdf", b"MZ\x90\x00 not a pdf", follow_redirects=True)
+    assert "확장자와 일치하지 않습니다".encode() in disguised.data
+
+    with app.app_context():
+        assert PostAttachment.query.count() == 0
+    assert _temp_files(tmp_path) == []
+
+
+def test_oversized_profile_image_is_rejected_not_saved_empty(
+    tmp_path, create_user, login, make_app, update_profile_image
+):
+    app = make_app("ingest.db", UPLOAD_MAX_FILE_BYTES=1024)
+    with app.app_context():
+        create_user("ingestuser")
+    client = app.test_client()
+    login(client, "ingestuser")
+
+    response = update_profile_image(client, "avatar.jpg", b"\xff\xd8\xff\xe0" + b"x" * 4096, follow_redirects=True)
+    assert "프로필 이미지는 1KB 이하만 업로드할 수 있습니다".encode() in response.data
+    assert "프로필이 수정되었습니다".encode() not in response.data
+
+    with app.app_context():
+        assert User.query.filter_by(username="ingestuser").first().profile_image_name is None
+    assert not os.listdir(tmp_path / "profiles")
+
+
+def test_profile_image_must_match_its_extension(tmp_path, create_user, login, make_app, update_profile_image):
+    app = make_app("ingest.db", UPLOAD_MAX_FILE_BYTES=1024)
+    with app.app_context():
+        create_user("ingestuser")
+    client = app.test_client()
+    login(client, "ingestuser")
+
+    response = update_profile_image(client, "avatar.webp", b"<?php echo 'not an image'; ?>", follow_redirects=True)
+    assert "프로필 이미지 파일 내용이 확장자와 일치하지 않습니다".encode() in response.data
+    with app.app_context():
+        assert User.query.filter_by(username="ingestuser").first().profile_image_name is None
+    assert not os.listdir(tmp_path / "profiles")
+
+    webp = b"RIFF\x24\x00\x00\x00WEBPVP8 " + b"\x00" * 32
+    response = update_profile_image(client, "avatar.webp", webp, follow_redirects=True)
+    assert "프로필이 수정되었습니다".encode() in response.data
+    with app.app_context():
+        assert User.query.filter_by(username="ingestuser").first().profile_image_name.endswith(".webp")
+
+
+def test_ingest_file_stops_storing_past_limit(tmp_path):
+    ingest = IngestFile(str(tmp_path), max_bytes=10)
+    ingest.write(b"12345")
+    ingest.write(b"678901")
+    assert ingest.oversize
+    assert os.path.getsize(ingest.path) == 0
+    ingest.close()
+    assert not os.path.exists(ingest.path)
+
+    assert sniff_matches("png", b"\x89PNG\r\n\x1a\n0000")
+    assert sniff_matches("hwpx", b"PK\x03\x04rest")
+    assert not sniff_matches("hwp", b"PK\x03\x04rest")
+    assert not sniff_matches("txt", b"bin\x00ary")
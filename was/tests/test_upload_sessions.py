@@ -0,0 +1,157 @@
+import os
+from datetime import timedelta
+
+import pytest
+
+from app import db
+from app.models import Post, PostAttachment, UploadSession, User, utc_now
+from app.upload_sessions import UploadConflict, complete_upload_session, gc_upload_sessions, part_path
+
+
+@pytest.fixture
+def app(make_app, create_user):
+    app = make_app("uploads.db", UPLOAD_CHUNK_BYTES=8)
+    with app.app_context():
+        create_user("chunkowner")
+        create_user("chunkother")
+    return app
+
+
+@pytest.fixture
+def post_id(app):
+    with app.app_context():
+        owner = User.query.filter_by(username="chunkowner").one()
+        post = Post(title="스캔 첨부", content="본문", user_id=owner.id)
+        db.session.add(post)
+        db.session.commit()
+        return post.id
+
+
+def test_chunked_upload_resumes_and_attaches_to_post(app, post_id, login):
+    body = b"%PDF-1.4 scanned page"
+    client = app.test_client()
+    login(client, "chunkowner")
+
+    created = client.post(
+        "/uploads",
+        json={"post_id": post_id, "filename": "민원_scan.pdf", "size": len(body), "mime_type": "application/pdf"},
+    )
+    assert created.status_code == 201
+    session_id = created.get_json()["id"]
+    assert created.headers["Location"].endswith(f"/uploads/{session_id}")
+
+    assert client.put(f"/uploads/{session_id}?offset=0", data=body[:8]).status_code == 200
+    assert client.put(f"/uploads/{session_id}?offset=8", data=body[8:20]).status_code == 400
+
+    # The client lost the response and retries from the wrong place.
+    conflict = client.put(f"/uploads/{session_id}?offset=0", data=body[:8])
+    assert conflict.status_code == 409
+    assert conflict.get_json()["offset"] == 8
+
+    status = client.get(f"/uploads/{session_id}").get_json()
+    assert status["offset"] == 8
+    assert status["complete"] is False
+    assert client.post(f"/uploads/{session_id}/complete").status_code == 409
+
+    offset = status["offset"]
+    while offset < len(body):
+        response = client.put(
+            f"/uploads/{session_id}",
+            data=body[offset : offset + 8],
+            headers={"Upload-Offset": str(offset)},
+        )
+        assert response.status_code == 200
+        offset = response.get_json()["offset"]
+
+    other = app.test_client()
+    login(other, "chunkother")
+    assert other.post(f"/uploads/{session_id}/complete").status_code == 404
+
+    completed = client.post(f"/uploads/{session_id}/complete")
+    assert completed.status_code == 201
+    download = client.get(completed.get_json()["download_url"])
+    assert download.data == body
+
+    with app.app_context():
+        attachment = PostAttachment.query.filter_by(post_id=post_id).one()
+        assert attachment.original_name == "민원_scan.pdf"
+        assert attachment.file_size == len(body)
+        assert db.session.get(UploadSession, session_id) is None
+        assert not os.path.exists(part_path(session_id))
+
+
+def test_upload_session_rejects_other_users_and_bad_content(app, post_id, login):
+    other = app.test_client()
+    login(other, "chunkother")
+    denied = other.post("/uploads", json={"post_id": post_id, "filename": "a.pdf", "size": 10})
+    assert denied.status_code == 403
+
+    client = app.test_client()
+    login(client, "chunkowner")
+    bad_type = client.post("/uploads", json={"post_id": post_id, "filename": "a.exe", "size": 10})
+    assert bad_type.status_code == 400
+
+    session_id = client.post(
+        "/uploads", json={"post_id": post_id, "filename": "a.pdf", "size": 4}
+    ).get_json()["id"]
+    sniffed = client.put(f"/uploads/{session_id}?offset=0", data=b"MZ\x90\x00")
+    assert sniffed.status_code == 400
+
+
+def test_gc_removes_stale_sessions_and_orphan_parts(app, post_id, login):
+    client = app.test_client()
+    login(client, "chunkowner")
+    stale_id = client.post(
+        "/uploads", json={"post_id": post_id, "filename": "old.pdf", "size": 100}
+    ).get_json()["id"]
+    fresh_id = client.post(
+        "/uploads", json={"post_id": post_id, "filename": "new.pdf", "size": 100}
+    ).get_json()["id"]
+
+    with app.test_request_context():
+        stale = db.session.get(UploadSession, stale_id)
+        stale.updated_at = utc_now() - timedelta(days=2)
+        db.session.commit()
+
+        assert gc_upload_sessions(timedelta(hours=24)) == (1, 1)
+        assert db.session.get(UploadSession, stale_id) is None
+        assert db.session.get(UploadSession, fresh_id) is not None
+        assert not os.path.exists(part_path(stale_id))
+        assert os.path.exists(part_path(fresh_id))
+
+
+def test_complete_rechecks_part_file_under_lock(app, post_id, login):
+    body = b"%PDF-1.4 page"
+    client = app.test_client()
+    login(client, "chunkowner")
+
+    session_id = client.post(
+        "/uploads",
+        json={"post_id": post_id, "filename": "scan.pdf", "size": len(body), "mime_type": "application/pdf"},
+    ).get_json()["id"]
+    client.put(f"/uploads/{session_id}?offset=0", data=body[:8])
+    client.put(f"/uploads/{session_id}?offset=8", data=body[8:])
+
+    with app.app_context():
+        path = part_path(session_id)
+        # Racing retries of the last chunk left the file short of received_size.
+        with open(path, "r+b") as handle:
+            handle.truncate(10)
+    short = client.post(f"/uploads/{session_id}/complete")
+    assert short.status_code == 409
+    assert short.get_json()["offset"] == 10
+    assert client.put(f"/uploads/{session_id}?offset=10", data=body[10:]).status_code == 200
+
+    with app.app_context():
+        upload_session = db.session.get(UploadSession, session_id)
+        # Another complete already claimed the part file.
+        claimed = f"{path}.other.complete"
+        os.rename(path, claimed)
+        with pytest.raises(UploadConflict):
+            complete_upload_session(upload_session)
+        os.rename(claimed, path)
+
+    assert client.post(f"/uploads/{session_id}/complete").status_code == 201
+    assert client.post(f"/uploads/{session_id}/complete").status_code == 404
+    with app.app_context():
+        assert PostAttachment.query.filter_by(post_id=post_id).count() == 1